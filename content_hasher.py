@@ -0,0 +1,770 @@
+"""
+Content Hasher Module
+Aşamalı içerik karşılaştırması: boyut kovası -> baş/orta/son örnek parmak izi -> tam hash,
+tüm modüllerin paylaştığı, disk başına eşzamanlılığı sınırlı paralel hash havuzu
+ve seçilebilir hash algoritması (blake2b, md5, kuruluysa xxhash)
+"""
+
+import os
+import sys
+import time
+import mmap
+import hashlib
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from hash_cache import get_hash_cache
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Örnek parmak izinde dosyanın başından, ortasından ve sonundan okunan blok boyutu
+SAMPLE_SIZE = 64 * 1024
+
+# Tam hash okuma tamponu (thread başına bir kez ayrılır, readinto ile yeniden kullanılır;
+# hashlib büyük bloklarda GIL'i bırakır)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# mmap açıldığında (varsayılan kapalı, set_use_mmap) bu boyuttan büyük dosyalar eşlenerek hash'lenir
+# (okuma kopyası yok, çekirdek ileri okur). Eşlenen dosya okunurken başka bir süreç tarafından
+# kısaltılırsa süreç SIGBUS ile düşer - bu yüzden varsayılan yol readinto'dur; yakın zamanda
+# değişen (yazılıyor olabilecek) dosyalar mmap açıkken de normal okumayla hash'lenir.
+MMAP_THRESHOLD = 64 * 1024 * 1024
+MMAP_MIN_AGE = 60
+
+# Disk başına eşzamanlı okuyucu: dönen diskte arama (seek) maliyeti paralelliği öldürür
+HDD_READERS = 2
+SSD_READERS = 8
+DEFAULT_READERS = 4
+
+# Küçük dosyalar tek işte toplanır (iş başına havuz maliyeti dosya okumasından büyük olmasın)
+BATCH_BYTES = 1024 * 1024
+BATCH_FILES = 64
+
+# Kilitli adım karşılaştırma (fdupes gibi): küçük kovada dosyalar blok blok birlikte okunur, ilk
+# farklı blokta ayrılır. İlk blok örnek boyutunda, sonra her turda iki katına çıkar (en fazla 1 MB).
+LOCKSTEP_MAX_FILES = 4
+LOCKSTEP_MAX_BLOCK = 1024 * 1024
+
+# Maliyet modeli sabitleri (okunan bayt cinsinden): kilitli adımda bir dosyadan diğerine geçişin
+# bedeli (dönen diskte arama) ve aynı boyuttaki dosyaların yarı yarıya duplikat çıktığı boyut
+LOCKSTEP_SWITCH_COST = 64 * 1024
+MATCH_HALF_SIZE = 1024 * 1024
+
+# Algoritma adı -> hash nesnesi üreticisi (hepsi update/hexdigest destekler)
+HASH_ALGORITHMS = {
+    'blake2b': lambda: hashlib.blake2b(digest_size=16),
+    'md5': hashlib.md5,
+}
+if xxhash is not None:
+    HASH_ALGORITHMS['xxh3_128'] = xxhash.xxh3_128
+    HASH_ALGORITHMS['xxh64'] = xxhash.xxh64
+
+# Uyumluluk algoritması: md5 hash'leri eskisi gibi öneksiz saklanır (tarama indeksi, planlar)
+COMPAT_ALGORITHM = 'md5'
+DEFAULT_ALGORITHM = 'xxh3_128' if xxhash is not None else 'blake2b'
+
+_active_algorithm = DEFAULT_ALGORITHM
+_mmap_threshold = None  # None = mmap kapalı
+_buffers = threading.local()
+
+
+def available_algorithms():
+    """Kullanılabilir algoritma adları (varsayılan ilk sırada)"""
+    return [DEFAULT_ALGORITHM] + [name for name in HASH_ALGORITHMS if name != DEFAULT_ALGORITHM]
+
+
+def get_hash_algorithm():
+    return _active_algorithm
+
+
+def set_hash_algorithm(name):
+    """Tüm modüllerin kullandığı algoritmayı seç (bilinmeyen ad varsayılana düşer)"""
+    global _active_algorithm
+    if name not in HASH_ALGORITHMS:
+        print(f"⚠️ Hash algoritması kullanılamıyor: {name} - {DEFAULT_ALGORITHM} kullanılacak")
+        name = DEFAULT_ALGORITHM
+    _active_algorithm = name
+    return name
+
+
+def get_use_mmap():
+    return _mmap_threshold is not None
+
+
+def set_use_mmap(enabled):
+    """Büyük dosyalarda mmap ile hash'lemeyi aç/kapat (isteğe bağlı - kısalan dosyada SIGBUS riski)"""
+    global _mmap_threshold
+    _mmap_threshold = MMAP_THRESHOLD if enabled else None
+    return bool(enabled)
+
+
+def new_hasher(algorithm=None):
+    return HASH_ALGORITHMS[algorithm or _active_algorithm]()
+
+
+def format_digest(algorithm, hex_digest):
+    """Hash metni algoritmasını taşır ('blake2b:...'); md5 eski biçimde öneksizdir"""
+    return hex_digest if algorithm == COMPAT_ALGORITHM else f"{algorithm}:{hex_digest}"
+
+
+def hash_algorithm_of(file_hash):
+    """Hash metninin algoritması (format_digest'in tersi)"""
+    return file_hash.split(':', 1)[0] if ':' in file_hash else COMPAT_ALGORITHM
+
+
+def is_current_hash(file_hash, algorithm=None):
+    """Kayıtlı hash seçili algoritmayla mı üretilmiş (farklı algoritmalar karşılaştırılamaz)"""
+    return bool(file_hash) and hash_algorithm_of(file_hash) == (algorithm or _active_algorithm)
+
+
+def _read_buffer(size):
+    """Thread'e ait yeniden kullanılan okuma tamponu - her blokta yeni bytes nesnesi oluşmaz"""
+    buffer = getattr(_buffers, 'buffer', None)
+    if buffer is None or len(buffer) != size:
+        buffer = _buffers.buffer = bytearray(size)
+        _buffers.view = memoryview(buffer)
+    return buffer, _buffers.view
+
+
+def full_hash(file_path, should_stop=None, chunk_size=HASH_CHUNK_SIZE, algorithm=None,
+              mmap_threshold=None):
+    """Dosyanın tam hash'i (okunamazsa veya iptal edilirse None)
+
+    Okuma thread'in tamponuna readinto ile yapılır (blok başına bytes nesnesi oluşmaz).
+    mmap_threshold verilirse ondan büyük, MMAP_MIN_AGE saniyedir değişmemiş dosyalar eşlenip
+    doğrudan hash'lenir (None - varsayılan: mmap kullanılmaz).
+    """
+    algorithm = algorithm or _active_algorithm
+    try:
+        hasher = HASH_ALGORITHMS[algorithm]()
+        with open(file_path, "rb", buffering=0) as f:
+            st = os.fstat(f.fileno())
+            if (mmap_threshold is not None and st.st_size >= max(mmap_threshold, 1)
+                    and time.time() - st.st_mtime >= MMAP_MIN_AGE):
+                if not _hash_mapped(f, hasher, chunk_size, should_stop):
+                    return None
+            else:
+                buffer, view = _read_buffer(chunk_size)
+                while True:
+                    count = f.readinto(buffer)
+                    if not count:
+                        break
+                    if should_stop and should_stop():
+                        return None
+                    hasher.update(view[:count])
+        return format_digest(algorithm, hasher.hexdigest())
+    except (OSError, ValueError):
+        # ValueError: eşleme sırasında dosya kısaldı / eşlenemeyen dosya türü
+        return None
+
+
+def _hash_mapped(f, hasher, chunk_size, should_stop):
+    """Eşlenmiş dosyayı chunk_size dilimlerle hash'le (iptalde False)"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mapped) as view:
+            for offset in range(0, len(mapped), chunk_size):
+                if should_stop and should_stop():
+                    return False
+                hasher.update(view[offset:offset + chunk_size])
+    return True
+
+
+def sample_fingerprint(file_path, size, sample_size=SAMPLE_SIZE, algorithm=None):
+    """Baş + orta + son bloklarının hash'i (okunamazsa None)
+
+    Aynı boyuttaki iki dosyanın örnekleri farklıysa içerikleri de farklıdır; örnekler
+    aynıysa karar tam hash'e kalır.
+    """
+    try:
+        hasher = new_hasher(algorithm)
+        with open(file_path, "rb") as f:
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                f.seek(offset)
+                hasher.update(f.read(sample_size))
+        return hasher.hexdigest()
+    except OSError:
+        return None
+
+
+def _lockstep_blocks(size, first_block, max_block=LOCKSTEP_MAX_BLOCK):
+    """Kilitli adımda okunan blok boyutları (ilk blok küçük, sonra iki katına çıkar)"""
+    offset, block = 0, max(1, first_block)
+    while offset < size:
+        yield min(block, size - offset)
+        offset += block
+        block = min(block * 2, max_block)
+
+
+def lockstep_compare(paths, size, should_stop=None, first_block=SAMPLE_SIZE):
+    """Aynı boyuttaki dosyaları blok blok birlikte okuyup içeriğe göre ayır (hash yok)
+
+    Döner: paths ile aynı sırada küme numarası - aynı numara aynı içerik demektir; açılamayan /
+    okunamayan dosyada ve iptalde None. Bir alt grup tek dosyaya düşünce o dosya kapatılır,
+    tüm dosyalar ayrışınca okuma biter; sadece duplikatlar sonuna kadar okunur.
+    """
+    labels = [None] * len(paths)
+    files = {}
+    try:
+        for index, path in enumerate(paths):
+            try:
+                files[index] = open(path, 'rb')
+                labels[index] = index
+            except OSError:
+                continue
+        groups = [list(files)] if len(files) > 1 else []
+        for block in _lockstep_blocks(size, first_block):
+            if not groups:
+                break
+            if should_stop and should_stop():
+                return [None] * len(paths)
+            next_groups = []
+            for group in groups:
+                # Grup en fazla birkaç dosya - temsilcilerle doğrudan bayt karşılaştırma
+                parts = []
+                for index in group:
+                    try:
+                        data = files[index].read(block)
+                    except OSError:
+                        labels[index] = None
+                        continue
+                    for representative, members in parts:
+                        if representative == data:
+                            members.append(index)
+                            break
+                    else:
+                        parts.append((data, [index]))
+                for _, members in parts:
+                    if len(members) > 1:
+                        next_groups.append(members)
+                    else:
+                        files.pop(members[0]).close()
+            groups = next_groups
+        for group in groups:
+            for index in group:
+                labels[index] = group[0]
+        return labels
+    finally:
+        for f in files.values():
+            f.close()
+
+
+def lockstep_costs(count, size, sample_size=SAMPLE_SIZE):
+    """Kovanın beklenen okuma maliyeti (bayt) - (kilitli adım, aşamalı hash)
+
+    Aynı boyuttaki iki dosyanın aynı içerikte olma olasılığı boyutla artar (küçük dosyada
+    rastlantı, büyükte çoğunlukla kopya); dosya sayısı arttıkça bir dosyanın en az bir eşi
+    olma olasılığı da artar: 1 - (1 - p) ^ (dosya sayısı - 1).
+    Hash: her dosyanın örnekleri (büyük dosyada) ve eşi olanların tamamı - küçük dosyada
+    örnek yok, her dosya baştan sona okunur.
+    Kilitli adım: okuma ilk farklı blokta biter - eşi olmayan dosya ilk bloğu okur; eşi olan
+    dosya sonuna kadar okunur ve her blok turunda bir dosya değişimi (arama) öder. Açık dosya
+    ve tur başına arama sayısı eşli dosya sayısıyla büyür.
+    """
+    match = size / (size + MATCH_HALF_SIZE)
+    paired = count * (1 - (1 - match) ** (count - 1))
+    single = count - paired
+    sampled = 3 * sample_size if size > 3 * sample_size else 0
+    blocks = sum(1 for _ in _lockstep_blocks(size, sample_size))
+    hash_cost = count * sampled + (paired * size if sampled else count * size)
+    lockstep_cost = single * min(size, sample_size) + paired * (size + (blocks - 1) * LOCKSTEP_SWITCH_COST)
+    return lockstep_cost, hash_cost
+
+
+def lockstep_preferred(count, size, sample_size=SAMPLE_SIZE):
+    """Maliyet modeli: kova kilitli adım karşılaştırmayla mı (True), aşamalı hash'le mi ayrılmalı
+
+    Beklenen okumalar lockstep_costs ile karşılaştırılır; eşitlikte hash seçilir (sonucu önbelleğe
+    yazılır). LOCKSTEP_MAX_FILES üstünde eşzamanlı açık dosya sınırı nedeniyle her zaman hash.
+    """
+    if not 2 <= count <= LOCKSTEP_MAX_FILES or size <= 0:
+        return False
+    lockstep_cost, hash_cost = lockstep_costs(count, size, sample_size)
+    return lockstep_cost < hash_cost
+
+
+def lockstep_decisions(sizes=(16 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 64 * 1024 * 1024)):
+    """Maliyet modelinin boyut x dosya sayısı kararları - sayının kararı değiştirdiği boyutları döner"""
+    counts = range(2, LOCKSTEP_MAX_FILES + 1)
+    print("📐 Kilitli adım (L) / hash (H) kararı: " + " ".join(f"{count:>3}" for count in counts) + " dosya")
+    changing = []
+    for size in sizes:
+        decisions = [lockstep_preferred(count, size) for count in counts]
+        if len(set(decisions)) > 1:
+            changing.append(size)
+        print(f"   {size / 1024:>8.0f} KB: " + " ".join(f"{'L' if decision else 'H':>3}" for decision in decisions))
+    print(f"{'✅' if changing else '❌'} Dosya sayısı kararı değiştiriyor: "
+          f"{', '.join(f'{size // 1024} KB' for size in changing) or 'hiçbir boyutta'}")
+    return changing
+
+
+def device_readers(device):
+    """Blok aygıtı için eşzamanlı okuyucu sınırı (Linux'ta sysfs rotational bilgisinden)"""
+    if device is None or not hasattr(os, 'major'):
+        return DEFAULT_READERS
+    base = f"/sys/dev/block/{os.major(device)}:{os.minor(device)}"
+    # Bölümlerde queue/ üst aygıttadır
+    for path in (f"{base}/queue/rotational", f"{base}/../queue/rotational"):
+        try:
+            with open(path) as f:
+                return HDD_READERS if f.read().strip() == '1' else SSD_READERS
+        except OSError:
+            continue
+    return DEFAULT_READERS
+
+
+class HashingService:
+    """Paylaşılan hash havuzu - iş parçacıkları, aygıt (st_dev) başına sınırlı eşzamanlılık
+
+    Her aygıtın kendi kuyruğu vardır; bir aygıtta iş bitince sıradaki işi yine o aygıttan
+    gönderilir, böylece yavaş bir HDD'yi bekleyen işler SSD'deki işleri tıkamaz.
+    """
+
+    def __init__(self, max_workers=None, cache=None):
+        self.cache = cache
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 4) * 2)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hash')
+        self._device_limits = {}
+        self._lock = threading.Lock()
+
+    def device_limit(self, device):
+        with self._lock:
+            limit = self._device_limits.get(device)
+            if limit is None:
+                limit = self._device_limits[device] = min(device_readers(device), self.max_workers)
+            return limit
+
+    def hash_file(self, file_path, should_stop=None, algorithm=None):
+        """Tek dosyanın tam hash'i (çağıran thread'de, önce önbelleğe bakılır)"""
+        algorithm = algorithm or _active_algorithm
+        return self.cached_hash(file_path, algorithm) or self.hash_and_cache(file_path, should_stop, algorithm)
+
+    def hash_files(self, paths, sizes=None, should_stop=None, on_progress=None, algorithm=None):
+        """Dosyaların tam hash'leri paralel - {yol: hash} (okunamayan None)"""
+        algorithm = algorithm or _active_algorithm
+        return dict(self.map(lambda path, stop: self.hash_file(path, stop, algorithm),
+                             paths, sizes, should_stop, on_progress))
+
+    def cached_hash(self, file_path, algorithm=None):
+        """Önbellekteki hash (dosya değiştiyse veya kayıt yoksa None)"""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.lookup(os.stat(file_path), algorithm or _active_algorithm)
+        except OSError:
+            return None
+
+    def hash_and_cache(self, file_path, should_stop=None, algorithm=None):
+        """Dosyayı oku, hash'i önbelleğe yaz (okuma sırasında dosya değiştiyse yazma)"""
+        algorithm = algorithm or _active_algorithm
+        if self.cache is None:
+            return full_hash(file_path, should_stop, algorithm=algorithm, mmap_threshold=_mmap_threshold)
+        try:
+            before = os.stat(file_path)
+        except OSError:
+            return None
+        file_hash = full_hash(file_path, should_stop, algorithm=algorithm, mmap_threshold=_mmap_threshold)
+        if file_hash:
+            try:
+                after = os.stat(file_path)
+                if (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns):
+                    self.cache.store(before, file_hash, algorithm)
+            except OSError:
+                pass
+        return file_hash
+
+    def map(self, func, paths, sizes=None, should_stop=None, on_progress=None):
+        """func(yol, durdur_mu) havuzda çalışır; (yol, sonuç) tamamlanma sırasıyla üretilir
+
+        sizes: yol başına okunacak bayt (verilmezse dosya boyutu) - MB/s hesabı için
+        should_stop: True dönerse bekleyen işler iptal edilir, süren okumalar yarıda kesilir
+        on_progress(biten, toplam, okunan_bayt, mb_s): her iş bitiminde çağıran thread'de çağrılır
+        """
+        paths = list(paths)
+        queues = defaultdict(deque)
+        open_batches = {}
+        dir_devices = {}
+        for index, path in enumerate(paths):
+            if sizes is not None:
+                # Boyut biliniyor - aygıt klasör başına bir kez sorulur
+                size = sizes[index]
+                folder = os.path.dirname(path)
+                if folder not in dir_devices:
+                    dir_devices[folder] = _device_of(folder)
+                device = dir_devices[folder]
+            else:
+                try:
+                    st = os.stat(path)
+                    device, size = st.st_dev, st.st_size
+                except OSError:
+                    device, size = None, 0
+
+            batch = open_batches.get(device)
+            if batch is None:
+                batch = open_batches[device] = [[], 0]
+                queues[device].append(batch)
+            batch[0].append(path)
+            batch[1] += size
+            if batch[1] >= BATCH_BYTES or len(batch[0]) >= BATCH_FILES:
+                del open_batches[device]
+
+        cancelled = threading.Event()
+        running = {}
+        active = defaultdict(int)
+
+        def fill(device):
+            queue = queues[device]
+            limit = self.device_limit(device)
+            while queue and active[device] < limit:
+                batch = queue.popleft()
+                running[self.executor.submit(_run_batch, func, batch[0], cancelled.is_set)] = (device, batch)
+                active[device] += 1
+
+        for device in list(queues):
+            fill(device)
+
+        start = time.perf_counter()
+        done_count = 0
+        done_bytes = 0
+        try:
+            while running:
+                if should_stop and should_stop():
+                    cancelled.set()
+                    return
+                finished, _ = wait(running, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    device, (batch_paths, batch_bytes) = running.pop(future)
+                    active[device] -= 1
+                    try:
+                        results = future.result()
+                    except Exception:
+                        results = [(path, None) for path in batch_paths]
+                    done_count += len(batch_paths)
+                    done_bytes += batch_bytes
+                    fill(device)
+                    if on_progress:
+                        elapsed = max(time.perf_counter() - start, 1e-6)
+                        on_progress(done_count, len(paths), done_bytes, done_bytes / elapsed / (1024 * 1024))
+                    yield from results
+        finally:
+            # Erken çıkışta (iptal / tüketici bıraktı) kuyruktakiler başlamasın
+            cancelled.set()
+            for future in running:
+                future.cancel()
+
+
+def _device_of(path):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def _run_batch(func, paths, should_stop):
+    """Havuz işi: bir grup dosyaya func uygula (iptalde kalanlar None)"""
+    results = []
+    for path in paths:
+        if should_stop():
+            results.append((path, None))
+            continue
+        try:
+            results.append((path, func(path, should_stop)))
+        except Exception:
+            results.append((path, None))
+    return results
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_hashing_service():
+    """Tüm modüllerin paylaştığı hash havuzu"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = HashingService(cache=get_hash_cache())
+        return _shared_service
+
+
+class StagedHasher:
+    """Aynı boyuttaki dosyalar için en ucuz ayırt edici içerik parçasını bulur
+
+    Aşama 1: kovada tek dosya varsa hiç okunmaz (boyutu benzersiz, duplikat olamaz)
+    Aşama 2: büyük dosyaların baş/orta/son örnekleri karşılaştırılır
+    Aşama 3: sadece örneği çakışan (veya örnek kadar küçük) dosyaların tam hash'i alınır
+    Maliyet modeli (lockstep_preferred) uygun bulursa küçük kova 2. ve 3. aşama yerine kilitli
+    adım karşılaştırmayla ayrılır. Hepsi tüm kovalar için toplu olarak paylaşılan havuzda çalışır.
+    """
+
+    def __init__(self, service=None, sample_size=SAMPLE_SIZE, should_stop=None, on_progress=None,
+                 algorithm=None, lockstep=True):
+        self.service = service or get_hashing_service()
+        self.algorithm = algorithm or _active_algorithm
+        self.sample_size = sample_size
+        self.should_stop = should_stop
+        self.on_progress = on_progress
+        self.lockstep = lockstep
+        self.stats = {'skipped': 0, 'sampled': 0, 'hashed': 0, 'cached': 0, 'compared': 0,
+                      'skipped_bytes': 0, 'hashed_bytes': 0, 'seconds': 0.0}
+
+    def content_parts(self, paths, size):
+        """Aynı boyuttaki dosyalar için anahtar parçaları (paths ile aynı sırada)
+
+        'hash:<hash>' tam hash, 'sample:<hash>' sadece örnekle ayrışan dosya, 'same:<n>' kilitli
+        adım karşılaştırmanın küme numarası (sadece aynı kovada anlamlı),
+        None ise okunmadı (tek dosya), okunamadı veya iptal edildi.
+        """
+        return self.resolve([(size, paths)])[0]
+
+    def resolve(self, buckets):
+        """[(boyut, yollar)] kovaları için content_parts sonuçları (aynı sırada)"""
+        start = time.perf_counter()
+        results = [[None] * len(paths) for _, paths in buckets]
+        sample_jobs = []
+        full_jobs = []
+        lockstep_jobs = []
+        for bucket, (size, paths) in enumerate(buckets):
+            if len(paths) < 2:
+                self.stats['skipped'] += len(paths)
+                self.stats['skipped_bytes'] += size * len(paths)
+                continue
+
+            cached = [self.service.cached_hash(path, self.algorithm) for path in paths]
+            if any(cached):
+                # Önbellekte olanlar okunmaz; kalanlar onlarla karşılaştırılabilsin diye tam hash'lenir
+                for index, file_hash in enumerate(cached):
+                    if file_hash:
+                        results[bucket][index] = f"hash:{file_hash}"
+                        self.stats['cached'] += 1
+                    else:
+                        full_jobs.append((bucket, index))
+            elif self.lockstep and lockstep_preferred(len(paths), size, self.sample_size):
+                lockstep_jobs.append(bucket)
+            elif size <= 3 * self.sample_size:
+                # Örnek tüm dosyayı kapsar - doğrudan tam hash
+                full_jobs.extend((bucket, index) for index in range(len(paths)))
+            else:
+                sample_jobs.extend((bucket, index) for index in range(len(paths)))
+
+        if lockstep_jobs:
+            # Havuza kova başına tek iş: ilk dosyanın yolu kovayı temsil eder
+            leaders = {buckets[bucket][1][0]: bucket for bucket in lockstep_jobs}
+            labels = dict(self.service.map(
+                lambda path, should_stop: lockstep_compare(buckets[leaders[path]][1], buckets[leaders[path]][0],
+                                                           should_stop, self.sample_size),
+                list(leaders), [buckets[bucket][0] * len(buckets[bucket][1]) for bucket in leaders.values()],
+                self.should_stop, self.on_progress))
+            for leader, bucket in leaders.items():
+                for index, label in enumerate(labels.get(leader) or ()):
+                    if label is not None:
+                        results[bucket][index] = f"same:{label}"
+                self.stats['compared'] += len(buckets[bucket][1])
+
+        if sample_jobs:
+            sizes = {buckets[bucket][1][index]: buckets[bucket][0] for bucket, index in sample_jobs}
+            fingerprints = self._run(lambda path, should_stop: sample_fingerprint(path, sizes[path], self.sample_size,
+                                                                                self.algorithm),
+                                     buckets, sample_jobs, lambda size: 3 * self.sample_size)
+            self.stats['sampled'] += len(sample_jobs)
+
+            samples = defaultdict(list)
+            for bucket, index in sample_jobs:
+                fingerprint = fingerprints.get(buckets[bucket][1][index])
+                if fingerprint is not None:
+                    samples[(bucket, fingerprint)].append(index)
+            for (bucket, fingerprint), indexes in samples.items():
+                if len(indexes) == 1:
+                    results[bucket][indexes[0]] = f"sample:{fingerprint}"
+                    self.stats['skipped_bytes'] += buckets[bucket][0]
+                else:
+                    full_jobs.extend((bucket, index) for index in indexes)
+
+        if full_jobs:
+            hashes = self._run(lambda path, should_stop: self.service.hash_and_cache(path, should_stop, self.algorithm),
+                               buckets, full_jobs, lambda size: size)
+            for bucket, index in full_jobs:
+                file_hash = hashes.get(buckets[bucket][1][index])
+                if file_hash:
+                    results[bucket][index] = f"hash:{file_hash}"
+                self.stats['hashed'] += 1
+                self.stats['hashed_bytes'] += buckets[bucket][0]
+
+        self.stats['seconds'] += time.perf_counter() - start
+        return results
+
+    def _run(self, func, buckets, jobs, read_bytes):
+        paths = [buckets[bucket][1][index] for bucket, index in jobs]
+        sizes = [read_bytes(buckets[bucket][0]) for bucket, _ in jobs]
+        return dict(self.service.map(func, paths, sizes, self.should_stop, self.on_progress))
+
+    def get_stats_text(self):
+        stats = self.stats
+        speed = stats['hashed_bytes'] / max(stats['seconds'], 1e-6) / (1024 * 1024)
+        return (f"⚡ Hash: {stats['skipped']} dosya okunmadı (benzersiz boyut), {stats['cached']} önbellekten, "
+                f"{stats['sampled']} örneklendi, {stats['compared']} kilitli adımla karşılaştırıldı, "
+                f"{stats['hashed']} tam hash ({stats['hashed_bytes'] / (1024 * 1024):.1f} MB okundu, "
+                f"{stats['skipped_bytes'] / (1024 * 1024):.1f} MB atlandı, {speed:.1f} MB/s)")
+
+
+def benchmark(root_path):
+    """Klasördeki tüm dosyalar: sıralı tam hash vs paralel tam hash vs aşamalı hash vs önbellek"""
+    import shutil
+    import tempfile
+    from dir_walker import DirWalker
+    from hash_cache import HashCache
+
+    entries = [entry for entry in DirWalker().walk(root_path)]
+    paths = [entry.path for entry in entries]
+    total_mb = sum(entry.size for entry in entries) / (1024 * 1024)
+    # Karşılaştırma önbelleksiz havuzla (önbellek ayrıca, geçici veritabanıyla ölçülür)
+    service = HashingService()
+
+    start = time.perf_counter()
+    sequential = {path: full_hash(path) for path in paths}
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = service.hash_files(paths, [entry.size for entry in entries])
+    parallel_time = time.perf_counter() - start
+
+    buckets = defaultdict(list)
+    for entry in entries:
+        buckets[entry.size].append(entry.path)
+    bucket_items = list(buckets.items())
+
+    def run_staged(lockstep):
+        # Gruplar kova içinde içerik parçasına göre (örnekle ayrışanlar zaten tek kalır)
+        staged_hasher = StagedHasher(service, lockstep=lockstep)
+        start = time.perf_counter()
+        grouped = defaultdict(list)
+        for (size, bucket_paths), parts in zip(bucket_items, staged_hasher.resolve(bucket_items)):
+            for path, part in zip(bucket_paths, parts):
+                if part and not part.startswith('sample:'):
+                    grouped[(size, part)].append(path)
+        return (staged_hasher, time.perf_counter() - start,
+                sorted(sorted(group) for group in grouped.values() if len(group) > 1))
+
+    hash_only, hash_only_time, hash_only_groups = run_staged(False)
+    hasher, staged_time, staged_groups = run_staged(True)
+
+    def groups_of(hashes):
+        grouped = defaultdict(list)
+        for path, file_hash in hashes.items():
+            if file_hash:
+                grouped[file_hash].append(path)
+        return sorted(sorted(group) for group in grouped.values() if len(group) > 1)
+
+    expected = groups_of(sequential)
+
+    cache_dir = tempfile.mkdtemp(prefix='hash_cache_bench_')
+    try:
+        cache = HashCache(os.path.join(cache_dir, HashCache.DB_FILENAME))
+        cache.open()
+        cached_service = HashingService(cache=cache)
+        start = time.perf_counter()
+        cached_service.hash_files(paths)
+        cold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = cached_service.hash_files(paths)
+        warm_time = time.perf_counter() - start
+        cache_text = cache.get_stats_text()
+        cache.close()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"📂 {len(entries)} dosya, {total_mb:.1f} MB, {service.max_workers} worker")
+    print(f"🐢 Sıralı tam hash  : {sequential_time:.2f} sn ({total_mb / max(sequential_time, 1e-6):.1f} MB/s)")
+    print(f"🚀 Paralel tam hash : {parallel_time:.2f} sn ({total_mb / max(parallel_time, 1e-6):.1f} MB/s)")
+    print(f"⚡ Aşamalı hash     : {hash_only_time:.2f} sn (sadece hash)")
+    print(hash_only.get_stats_text())
+    print(f"⚡ Aşamalı + kilitli adım: {staged_time:.2f} sn (maliyet modeli)")
+    print(hasher.get_stats_text())
+    print(f"🗄️ Önbellek ilk/ikinci geçiş: {cold_time:.2f} sn / {warm_time:.2f} sn")
+    print(cache_text)
+    same = (groups_of(parallel) == expected and staged_groups == expected and hash_only_groups == expected
+            and groups_of(cached) == expected)
+    print(f"{'✅' if same else '❌'} {len(expected)} duplikat grubu")
+    return sequential_time, parallel_time, staged_time
+
+
+def benchmark_algorithms(file_path=None, size_mb=256, buffer_sizes=(64 * 1024, 1024 * 1024, 4 * 1024 * 1024)):
+    """Algoritma x okuma yolu başına tam hash hızı (MB/s)
+
+    Okuma yolları: eski yardımcıların f.read(8192) döngüsü, tampon boyutu başına readinto
+    ve mmap. Dosya verilmezse çalışma klasöründe (yerel disk) geçici rastgele dosya
+    oluşturulur. İlk okuma dosyayı işletim sistemi önbelleğine alır; sonraki ölçümler
+    ağırlıklı olarak okuma + hash maliyetini gösterir (RAM'den büyük dosyada disk hızını).
+    """
+    import tempfile
+
+    def legacy_hash(path, algorithm):
+        # Eski yardımcılardaki döngü: her 8 KB için yeni bytes nesnesi
+        hasher = new_hasher(algorithm)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(8192), b""):
+                hasher.update(chunk)
+        return format_digest(algorithm, hasher.hexdigest())
+
+    def measure(func):
+        start = time.perf_counter()
+        result = func()
+        return result, total_mb / max(time.perf_counter() - start, 1e-6)
+
+    temp_path = None
+    if file_path is None:
+        fd, temp_path = tempfile.mkstemp(prefix='hash_bench_', dir='.')
+        with os.fdopen(fd, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                f.write(block)
+        # mmap yolu yeni yazılmış dosyaları atlar
+        old = time.time() - 2 * MMAP_MIN_AGE
+        os.utime(temp_path, (old, old))
+        file_path = temp_path
+    try:
+        total_mb = os.path.getsize(file_path) / (1024 * 1024)
+        full_hash(file_path, algorithm=COMPAT_ALGORITHM)
+        print(f"📄 {file_path}: {total_mb:.1f} MB")
+        results = {}
+        same = True
+        for algorithm in available_algorithms():
+            expected, speed = measure(lambda: legacy_hash(file_path, algorithm))
+            results[(algorithm, 'read 8 KB')] = speed
+            line = [f"read 8 KB: {speed:6.1f}"]
+            for buffer_size in buffer_sizes:
+                file_hash, speed = measure(lambda: full_hash(file_path, chunk_size=buffer_size, algorithm=algorithm,
+                                                             mmap_threshold=None))
+                same = same and file_hash == expected
+                results[(algorithm, f'readinto {buffer_size // 1024} KB')] = speed
+                line.append(f"readinto {buffer_size // 1024} KB: {speed:6.1f}")
+            file_hash, speed = measure(lambda: full_hash(file_path, algorithm=algorithm, mmap_threshold=0))
+            same = same and file_hash == expected
+            results[(algorithm, 'mmap')] = speed
+            line.append(f"mmap: {speed:6.1f}")
+            print(f"🔑 {algorithm:<9} " + " | ".join(line) + " MB/s")
+        print(f"{'✅' if same else '❌'} Tüm okuma yolları aynı hash'i üretti")
+        return results
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    # Kullanım: python content_hasher.py <klasör>
+    #           python content_hasher.py --algorithms [dosya]
+    #           python content_hasher.py --lockstep
+    if len(sys.argv) >= 2 and sys.argv[1] == '--lockstep':
+        sys.exit(0 if lockstep_decisions() else 1)
+    if len(sys.argv) >= 2 and sys.argv[1] == '--algorithms':
+        benchmark_algorithms(sys.argv[2] if len(sys.argv) > 2 else None)
+        sys.exit(0)
+    if len(sys.argv) < 2 or not os.path.isdir(sys.argv[1]):
+        print("Kullanım: python content_hasher.py <klasör> | --algorithms [dosya] | --lockstep")
+        sys.exit(1)
+    benchmark(sys.argv[1])
@@ -0,0 +1,335 @@
+"""
+Directory Walker Module
+os.scandir tabanlı tek geçişli klasör gezici - tüm tarayıcılar tarafından ortak kullanılır
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import namedtuple, deque
+
+# Kompakt dosya kaydı - DirEntry verisinden doğrudan üretilir (ikinci os.stat yok)
+WalkEntry = namedtuple('WalkEntry', ['path', 'name', 'is_dir', 'size', 'mtime', 'mtime_ns', 'inode', 'device'])
+
+
+class DirWalker:
+    """os.scandir ile klasör ağacını gezen ortak motor
+
+    dir_filter(name) False dönerse klasör gezinti sırasında budanır (içine girilmez).
+    file_filter(name) False dönerse dosya için stat bile yapılmaz.
+    Gezinti sırası os.walk ile aynıdır (top-down, listeleme sırası).
+    """
+
+    def __init__(self, dir_filter=None, file_filter=None, should_stop=None):
+        self.dir_filter = dir_filter
+        self.file_filter = file_filter
+        self.should_stop = should_stop
+
+        # Benchmark / istatistik sayaçları
+        self.dirs_listed = 0
+        self.stat_calls = 0
+
+    def walk(self, root_path, recursive=True, include_dirs=False):
+        """Dosya kayıtlarını (WalkEntry) üret
+
+        recursive=False: sadece ana klasör listelenir.
+        include_dirs=True: budanmayan alt klasörler de is_dir=True kayıt olarak üretilir.
+        """
+        stack = [root_path]
+
+        while stack:
+            if self.should_stop and self.should_stop():
+                return
+
+            dir_path = stack.pop()
+            records, subdirs = self.list_directory(dir_path, recursive, include_dirs)
+            for record in records:
+                yield record
+
+            # os.walk ile aynı sıra için ters ekle
+            stack.extend(reversed(subdirs))
+
+    def walk_parallel(self, root_path, workers=4, include_dirs=False):
+        """Çok iş parçacıklı (work-stealing) gezinti - NFS/SMB gibi gecikmeli kaynaklar için
+
+        Her worker kendi kuyruğunun sonundan iş alır, boşalınca diğerlerinin başından çalar.
+        Listelenen klasörlerin kayıtları klasör başına tamponlanır ve walk() ile aynı sırada
+        (top-down, listeleme sırası) üretilir - duplikat grubunun orijinali değişmez.
+        Tüketicinin sıradaki klasörü henüz alınmamışsa tüketici onu kendisi listeler;
+        worker'da oluşan hata o klasöre gelindiğinde çağırana iletilir.
+        workers <= 1 ise sıralı walk() kullanılır.
+        """
+        if workers <= 1:
+            yield from self.walk(root_path, include_dirs=include_dirs)
+            return
+
+        work_queues = [deque() for _ in range(workers)]
+        work_queues[0].append(root_path)
+        # klasör -> (kayıtlar, alt klasörler) veya worker'da oluşan hata
+        listed = {}
+        claimed = set()
+        max_buffered = workers * 64
+        done = threading.Event()
+        condition = threading.Condition()
+
+        def stopped():
+            return done.is_set() or (self.should_stop and self.should_stop())
+
+        def claim(dir_path):
+            # Her klasör tek kez listelenir (worker veya tüketici)
+            with condition:
+                if dir_path in claimed:
+                    return False
+                claimed.add(dir_path)
+                return True
+
+        def steal(index):
+            for offset in range(1, workers):
+                try:
+                    return work_queues[(index + offset) % workers].popleft()
+                except IndexError:
+                    continue
+            return None
+
+        def worker(index):
+            own_queue = work_queues[index]
+            while not stopped():
+                with condition:
+                    # Tampon doluysa tüketiciyi bekle (bellek sınırlı kalır)
+                    while len(listed) >= max_buffered and not stopped():
+                        condition.wait(0.1)
+                try:
+                    dir_path = own_queue.pop()
+                except IndexError:
+                    dir_path = steal(index)
+                    if dir_path is None:
+                        time.sleep(0.002)
+                        continue
+                if not claim(dir_path):
+                    continue
+
+                try:
+                    result = self.list_directory(dir_path, True, include_dirs)
+                except Exception as e:
+                    result = e
+                else:
+                    # Sahibi ilk alt klasörü önce alsın (DFS sırası)
+                    own_queue.extend(reversed(result[1]))
+                with condition:
+                    listed[dir_path] = result
+                    condition.notify_all()
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            stack = [root_path]
+            while stack:
+                if self.should_stop and self.should_stop():
+                    return
+                dir_path = stack.pop()
+                with condition:
+                    while dir_path in claimed and dir_path not in listed:
+                        condition.wait(0.1)
+                    result = listed.pop(dir_path, None)
+                    if result is None:
+                        claimed.add(dir_path)
+                    condition.notify_all()
+                if result is None:
+                    result = self.list_directory(dir_path, True, include_dirs)
+                    work_queues[0].extend(reversed(result[1]))
+                if isinstance(result, Exception):
+                    raise result
+
+                records, subdirs = result
+                for record in records:
+                    yield record
+                # os.walk ile aynı sıra için ters ekle
+                stack.extend(reversed(subdirs))
+        finally:
+            done.set()
+            with condition:
+                condition.notify_all()
+            for thread in threads:
+                thread.join(timeout=1)
+
+    def list_directory(self, dir_path, recursive=True, include_dirs=False, links=None):
+        """Tek klasörü os.scandir ile listele - (kayıtlar, alt klasörler) döndür
+
+        links listesi verilirse kayıt üretilmeyen sembolik bağlantılar (kırık bağlantılar,
+        klasöre işaret eden bağlantılar) bu listeye eklenir - boşluk kontrolü için.
+        """
+        records = []
+        subdirs = []
+
+        try:
+            with os.scandir(dir_path) as entries:
+                self.dirs_listed += 1
+                for entry in entries:
+                    if self.should_stop and self.should_stop():
+                        break
+
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+
+                    if is_dir:
+                        if self.dir_filter and not self.dir_filter(entry.name):
+                            continue
+                        if include_dirs:
+                            record = self._make_entry(entry, True)
+                            if record:
+                                records.append(record)
+                        # os.walk gibi sembolik bağlantılı klasörlere girme
+                        if not entry.is_symlink():
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif links is not None and not include_dirs:
+                            links.append(entry.path)
+                        continue
+
+                    if self.file_filter and not self.file_filter(entry.name):
+                        continue
+
+                    record = self._make_entry(entry, False)
+                    if record:
+                        records.append(record)
+                    elif links is not None and entry.is_symlink():
+                        # Kırık bağlantı: stat başarısız ama klasör yine de boş değil
+                        links.append(entry.path)
+        except OSError:
+            # Erişim hatası - os.walk gibi sessizce atla
+            pass
+
+        return records, subdirs
+
+    def _make_entry(self, entry, is_dir):
+        """DirEntry'den kompakt kayıt üret (Windows'ta stat ücretsiz, Linux'ta tek syscall)"""
+        try:
+            self.stat_calls += 1
+            st = entry.stat()
+        except OSError:
+            return None
+        return WalkEntry(entry.path, entry.name, is_dir, st.st_size, st.st_mtime,
+                         st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def total_size(self, root_path, workers=1):
+        """Klasör altındaki (filtrelenmiş) dosyaların toplam boyutu"""
+        return sum(entry.size for entry in self.walk_parallel(root_path, workers))
+
+
+def _create_benchmark_tree(root_path, file_count, files_per_dir=1000):
+    """Benchmark için sentetik klasör ağacı oluştur"""
+    created = 0
+    dir_index = 0
+    while created < file_count:
+        dir_path = os.path.join(root_path, f"d{dir_index // 100:04d}", f"s{dir_index:06d}")
+        os.makedirs(dir_path, exist_ok=True)
+        for i in range(min(files_per_dir, file_count - created)):
+            with open(os.path.join(dir_path, f"f{i:05d}.dat"), 'wb') as f:
+                f.write(b'x' * (i % 7))
+            created += 1
+        dir_index += 1
+
+
+def benchmark(root_path, workers=1):
+    """Eski (os.walk + os.stat) yaklaşım ile DirWalker'ı karşılaştır, syscall sayılarını raporla"""
+    counts = {'scandir': 0, 'listdir': 0, 'stat': 0}
+    real_scandir, real_listdir, real_stat = os.scandir, os.listdir, os.stat
+
+    def counting_scandir(*args, **kwargs):
+        counts['scandir'] += 1
+        return real_scandir(*args, **kwargs)
+
+    def counting_listdir(*args, **kwargs):
+        counts['listdir'] += 1
+        return real_listdir(*args, **kwargs)
+
+    def counting_stat(*args, **kwargs):
+        counts['stat'] += 1
+        return real_stat(*args, **kwargs)
+
+    def reset_counts():
+        for key in counts:
+            counts[key] = 0
+
+    os.scandir, os.listdir, os.stat = counting_scandir, counting_listdir, counting_stat
+    try:
+        # Eski "all" modu: os.walk (scandir) + dosya başına os.stat (_get_file_info)
+        start = time.perf_counter()
+        legacy_files = 0
+        legacy_dirs = []
+        for root, dirs, files in os.walk(root_path):
+            legacy_dirs.append(root)
+            for name in files:
+                os.stat(os.path.join(root, name))
+                legacy_files += 1
+        walk_time = time.perf_counter() - start
+        walk_calls = counts['scandir'] + counts['stat']
+
+        # Eski "none"/"files_only" ve duplikat bulucu modeli: listdir + isfile/isdir + getmtime/getsize
+        reset_counts()
+        start = time.perf_counter()
+        for dir_path in legacy_dirs:
+            for name in os.listdir(dir_path):
+                item_path = os.path.join(dir_path, name)
+                if os.path.isfile(item_path):
+                    os.stat(item_path)
+                elif os.path.isdir(item_path):
+                    os.path.getmtime(item_path)
+        listdir_time = time.perf_counter() - start
+        listdir_calls = counts['listdir'] + counts['stat']
+    finally:
+        os.scandir, os.listdir, os.stat = real_scandir, real_listdir, real_stat
+
+    # Yeni yöntem: DirWalker (DirEntry.stat yeniden kullanımı)
+    walker = DirWalker()
+    start = time.perf_counter()
+    for _ in walker.walk(root_path):
+        pass
+    walker_time = time.perf_counter() - start
+    # Windows'ta DirEntry.stat() ek syscall yapmaz (FindNextFile verisi kullanılır)
+    entry_stat_syscalls = 0 if sys.platform == 'win32' else walker.stat_calls
+    walker_calls = walker.dirs_listed + entry_stat_syscalls
+
+    print(f"📂 Ağaç: {root_path} ({legacy_files} dosya, {len(legacy_dirs)} klasör)")
+    print(f"🐢 os.walk + os.stat        : {walk_time:.2f} sn, ~{walk_calls} syscall")
+    print(f"🐢 listdir + isfile/isdir   : {listdir_time:.2f} sn, ~{listdir_calls} syscall")
+    print(f"⚡ DirWalker                 : {walker_time:.2f} sn, ~{walker_calls} syscall "
+          f"({walker.dirs_listed} scandir + {entry_stat_syscalls} DirEntry.stat)")
+    print(f"💾 Tasarruf: os.walk modeline göre {walk_calls - walker_calls}, "
+          f"listdir modeline göre {listdir_calls - walker_calls} syscall")
+
+    if workers > 1:
+        start = time.perf_counter()
+        parallel_files = sum(1 for _ in DirWalker().walk_parallel(root_path, workers))
+        parallel_time = time.perf_counter() - start
+        print(f"🚀 DirWalker x{workers} worker  : {parallel_time:.2f} sn ({parallel_files} dosya)")
+    return walk_calls, listdir_calls, walker_calls
+
+
+if __name__ == "__main__":
+    # Kullanım: python dir_walker.py [klasör] [--files 1000000] [--workers 8]
+    import argparse
+    import tempfile
+    import shutil
+
+    parser = argparse.ArgumentParser(description="DirWalker syscall benchmark")
+    parser.add_argument('path', nargs='?', help="Var olan klasör (verilmezse sentetik ağaç oluşturulur)")
+    parser.add_argument('--files', type=int, default=1000000, help="Sentetik ağaçtaki dosya sayısı")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel gezinti worker sayısı")
+    args = parser.parse_args()
+
+    if args.path:
+        benchmark(args.path, args.workers)
+    else:
+        temp_root = tempfile.mkdtemp(prefix="dirwalker_bench_")
+        try:
+            print(f"🔧 {args.files} dosyalık sentetik ağaç oluşturuluyor...")
+            _create_benchmark_tree(temp_root, args.files)
+            benchmark(temp_root, args.workers)
+        finally:
+            shutil.rmtree(temp_root, ignore_errors=True)
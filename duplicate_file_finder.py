@@ -10,10 +10,14 @@ import shutil
 import threading
 import time
 from collections import defaultdict
-import hashlib
 
 # Multi-language support
 from lang_manager import lang_manager
+from dir_walker import DirWalker
+from ignore_rules import get_ignore_rules
+from content_hasher import StagedHasher, get_hashing_service
+from hash_cache import get_hash_cache
+from space_reclaimer import SpaceReclaimer, supports_reflink
 
 class DuplicateFileFinder:
     """Duplicate dosya bulucu sınıfı"""
@@ -37,6 +41,7 @@ class DuplicateFileFinder:
         self.total_files = 0
         self.duplicate_files = 0
         self.space_saved = 0
+        self.hash_cache_stats = None  # Son taramanın hash önbelleği isabet/kaçırma sayıları
     
     def open_window(self):
         """Duplicate finder penceresini aç"""
@@ -124,6 +129,10 @@ class DuplicateFileFinder:
                                   command=self.move_duplicates, state="disabled")
         self.move_btn.pack(side=tk.LEFT, padx=5)
         
+        self.reclaim_btn = ttk.Button(button_frame, text=lang_manager.get_text('duplicate_finder.reclaim_space'), 
+                                     command=self.reclaim_space, state="disabled")
+        self.reclaim_btn.pack(side=tk.LEFT, padx=5)
+        
         self.clear_btn = ttk.Button(button_frame, text=lang_manager.get_text('duplicate_finder.clear_results'), 
                                    command=self.clear_results)
         self.clear_btn.pack(side=tk.LEFT, padx=5)
@@ -211,6 +220,7 @@ class DuplicateFileFinder:
         self.scan_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
         
         # Progress sıfırla
         self.progress_var.set(0)
@@ -251,43 +261,14 @@ class DuplicateFileFinder:
             # Dosyaları listele
             all_files = []
             
-            if include_subfolders:
-                # Alt klasörlerle birlikte tara
-                for root, dirs, files in os.walk(folder_path):
-                    if self.stop_scanning:
-                        break
-                    for file in files:
-                        if self.stop_scanning:
-                            break
-                        file_path = os.path.join(root, file)
-                        try:
-                            file_size = os.path.getsize(file_path)
-                            all_files.append({
-                                'path': file_path,
-                                'name': file,
-                                'size': file_size
-                            })
-                        except (OSError, IOError):
-                            continue
-            else:
-                # Sadece ana klasörü tara
-                try:
-                    for item in os.listdir(folder_path):
-                        if self.stop_scanning:
-                            break
-                        item_path = os.path.join(folder_path, item)
-                        if os.path.isfile(item_path):
-                            try:
-                                file_size = os.path.getsize(item_path)
-                                all_files.append({
-                                    'path': item_path,
-                                    'name': item,
-                                    'size': file_size
-                                })
-                            except (OSError, IOError):
-                                continue
-                except (OSError, IOError):
-                    pass
+            # Tek geçişli tarama - boyut DirEntry'den gelir (ayrıca getsize yok), sistem klasörleri budanır
+            walker = DirWalker(dir_filter=get_ignore_rules().dir_filter, should_stop=lambda: self.stop_scanning)
+            for entry in walker.walk(folder_path, recursive=include_subfolders):
+                all_files.append({
+                    'path': entry.path,
+                    'name': entry.name,
+                    'size': entry.size
+                })
             
             if self.stop_scanning:
                 self.window.after(0, lambda: update_status(lang_manager.get_text('duplicate_finder.scan_stopped')))
@@ -321,9 +302,33 @@ class DuplicateFileFinder:
             # Duplikat grupları bul
             self.window.after(0, lambda: update_status(lang_manager.get_text('duplicate_finder.finding_duplicates')))
             
+            # Aynı boyuttaki PDF olmayan dosyalar aşamalı ayrılır: örnek -> tam hash, küçük gruplarda
+            # maliyet modeline göre kilitli adım karşılaştırma (ilk farklı blokta durur)
+            hash_buckets = []
+            for size, files in size_groups.items():
+                non_pdf_files = [f for f in files if not f['name'].lower().endswith('.pdf')]
+                if len(non_pdf_files) > 1:
+                    hash_buckets.append((size, [f['path'] for f in non_pdf_files]))
+            
+            finding_text = lang_manager.get_text('duplicate_finder.finding_duplicates')
+            def on_progress(done, total, done_bytes, speed):
+                progress = (done / max(1, total)) * 100
+                self.window.after(0, lambda: self.progress_var.set(progress))
+                self.window.after(0, lambda: update_status(f"{finding_text} ({speed:.1f} MB/s)"))
+            
+            cache_snapshot = get_hash_cache().snapshot()
+            hasher = StagedHasher(should_stop=lambda: self.stop_scanning, on_progress=on_progress)
+            file_hashes = {}
+            for (size, paths), parts in zip(hash_buckets, hasher.resolve(hash_buckets)):
+                for path, part in zip(paths, parts):
+                    # Örnekle ayrışan dosya tek kalır; aynı boyut kovası içinde parça = içerik
+                    if part and not part.startswith('sample:'):
+                        file_hashes[path] = part
+            self.hash_cache_stats = get_hash_cache().since(cache_snapshot)
+            print(hasher.get_stats_text())
+            
             self.duplicate_groups = {}
             group_counter = 1
-            processed_files = 0
             
             for size, files in size_groups.items():
                 if self.stop_scanning:
@@ -349,18 +354,11 @@ class DuplicateFileFinder:
                         hash_groups = {}
                         
                         for file_info in non_pdf_files:
-                            if self.stop_scanning:
-                                break
-                            
-                            file_hash = self._calculate_file_hash(file_info['path'])
+                            file_hash = file_hashes.get(file_info['path'])
                             if file_hash:
                                 if file_hash not in hash_groups:
                                     hash_groups[file_hash] = []
                                 hash_groups[file_hash].append(file_info)
-                            
-                            processed_files += 1
-                            progress = (processed_files / len(all_files)) * 100
-                            self.window.after(0, lambda p=progress: self.progress_var.set(p))
                         
                         # Hash gruplarından duplikatları al
                         for hash_value, hash_files in hash_groups.items():
@@ -440,6 +438,7 @@ class DuplicateFileFinder:
         # Move butonu aktif et (duplikat varsa)
         if self.duplicate_files > 0:
             self.move_btn.configure(state="normal")
+            self.reclaim_btn.configure(state="normal")
     
     def _update_statistics(self):
         """İstatistikleri güncelle"""
@@ -447,6 +446,8 @@ class DuplicateFileFinder:
         stats_text += f"{lang_manager.get_text('duplicate_finder.duplicate_groups_count').format(count=len(self.duplicate_groups))}\n"
         stats_text += f"{lang_manager.get_text('duplicate_finder.duplicate_files_count').format(count=self.duplicate_files)}\n"
         stats_text += f"{lang_manager.get_text('duplicate_finder.space_to_save').format(space=self._format_file_size(self.space_saved))}"
+        if self.hash_cache_stats:
+            stats_text += "\n" + lang_manager.get_text('duplicate_finder.hash_cache_stats').format(**self.hash_cache_stats)
         
         self.stats_label.configure(text=stats_text)
     
@@ -470,6 +471,7 @@ class DuplicateFileFinder:
         # UI durumunu güncelle
         self.is_moving = True
         self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
         self.scan_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         
@@ -580,6 +582,65 @@ class DuplicateFileFinder:
         finally:
             self._reset_ui_after_move()
     
+    def reclaim_space(self):
+        """Duplikatları yerinde orijinale bağlantıyla (reflink/hardlink) değiştir"""
+        if not self.duplicate_groups:
+            messagebox.showwarning(lang_manager.get_text('duplicate_finder.warning'), 
+                                 lang_manager.get_text('duplicate_finder.no_duplicates_to_move'))
+            return
+        
+        # Reflink desteklenmiyorsa hardlink kullanılacağı kullanıcıya söylenir
+        method_key = 'reclaim_method_reflink' if supports_reflink(self.selected_folder.get()) else 'reclaim_method_hardlink'
+        message = lang_manager.get_text('duplicate_finder.reclaim_confirmation').format(
+            count=self.duplicate_files, method=lang_manager.get_text(f'duplicate_finder.{method_key}'),
+            space=self._format_file_size(self.space_saved))
+        
+        if not messagebox.askyesno(lang_manager.get_text('duplicate_finder.confirm_reclaim'), message):
+            return
+        
+        # UI durumunu güncelle
+        self.is_moving = True
+        self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
+        self.scan_btn.configure(state="disabled")
+        self.stop_btn.configure(state="normal")
+        self.stop_scanning = False
+        
+        reclaim_thread = threading.Thread(target=self._reclaim_thread, daemon=True)
+        reclaim_thread.start()
+    
+    def _reclaim_thread(self):
+        """Alan kazanma thread'i - her duplikat değiştirilmeden önce yeniden doğrulanır"""
+        try:
+            def on_progress(done, total):
+                def update():
+                    self.status_var.set(f"{lang_manager.get_text('duplicate_finder.reclaiming')} ({done}/{total})")
+                    self.progress_var.set((done / total) * 100 if total > 0 else 0)
+                self.window.after(0, update)
+            
+            # İlk dosya orijinal kalır; PDF gruplarında içeriği farklı olanlar doğrulamada elenir
+            groups = [[file_info['path'] for file_info in group_data['files']]
+                      for group_data in self.duplicate_groups.values()]
+            reclaimer = SpaceReclaimer(should_stop=lambda: self.stop_scanning, on_progress=on_progress)
+            stats = reclaimer.reclaim_groups(groups)
+            print(reclaimer.get_stats_text())
+            
+            message = lang_manager.get_text('duplicate_finder.reclaim_result').format(
+                space=self._format_file_size(stats['reclaimed_bytes']), **stats)
+            self.window.after(0, lambda: self.status_var.set(message.splitlines()[0]))
+            self.window.after(0, lambda: messagebox.showinfo(lang_manager.get_text('duplicate_finder.reclaim_complete'), message))
+            
+            # Bağlanan dosyalar artık yer kaplamıyor - sonuçlar geçersiz
+            if stats['reflinked'] or stats['hardlinked']:
+                self.window.after(0, self.clear_results)
+            
+        except Exception as e:
+            error_msg = lang_manager.get_text('duplicate_finder.reclaim_error').format(error=str(e))
+            self.window.after(0, lambda: messagebox.showerror(lang_manager.get_text('duplicate_finder.error'), error_msg))
+        
+        finally:
+            self._reset_ui_after_move()
+    
     def clear_results(self):
         """Sonuçları temizle"""
         # TreeView'ı temizle
@@ -594,6 +655,7 @@ class DuplicateFileFinder:
         
         # UI güncelle
         self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
         self.stats_label.configure(text=lang_manager.get_text('duplicate_finder.no_scan_performed'))
         self.progress_var.set(0)
         self.status_var.set(lang_manager.get_text('duplicate_finder.ready_to_scan'))
@@ -610,16 +672,9 @@ class DuplicateFileFinder:
         s = round(size_bytes / p, 2)
         return f"{s} {size_names[i]}"
     
-    def _calculate_file_hash(self, file_path, chunk_size=8192):
-        """Dosya hash'ini hesapla"""
-        try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except Exception as e:
-            return None
+    def _calculate_file_hash(self, file_path):
+        """Dosya hash'ini hesapla (paylaşılan hash servisi)"""
+        return get_hashing_service().hash_file(file_path)
     
     def _reset_ui_after_scan(self):
         """Tarama sonrası UI durumunu sıfırla"""
@@ -635,6 +690,7 @@ class DuplicateFileFinder:
         def reset():
             self.is_moving = False
             self.move_btn.configure(state="normal")
+            self.reclaim_btn.configure(state="normal")
             self.scan_btn.configure(state="normal")
             self.stop_btn.configure(state="disabled")
         
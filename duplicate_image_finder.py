@@ -6,11 +6,16 @@ Sadece tek bir klasör içindeki duplikat resimleri bulur ve organize eder
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import hashlib
 import shutil
 from collections import defaultdict
 import threading
 from lang_manager import lang_manager
+from dir_walker import DirWalker
+from ignore_rules import get_ignore_rules
+from content_hasher import get_hashing_service
+from hash_cache import get_hash_cache
+from space_reclaimer import SpaceReclaimer, supports_reflink
+from image_hasher import PerceptualHasher, group_similar, load_or_build_index, DEFAULT_MAX_DISTANCE
 
 class DuplicateImageFinder:
     """Tek klasör içindeki duplikat resimleri bulan araç"""
@@ -26,6 +31,10 @@ class DuplicateImageFinder:
         self.stop_scanning = False
         self.is_moving = False
         
+        # Algısal mod: byte-byte aynı değil, görsel olarak benzer resimler (yeniden boyutlanmış / kaydedilmiş)
+        self.perceptual_mode = tk.BooleanVar(value=False)
+        self.max_distance = tk.IntVar(value=DEFAULT_MAX_DISTANCE)
+        
         # Desteklenen resim formatları
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
         
@@ -34,6 +43,7 @@ class DuplicateImageFinder:
         self.total_files = 0
         self.duplicate_files = 0
         self.space_saved = 0
+        self.hash_cache_stats = None  # Son taramanın hash önbelleği isabet/kaçırma sayıları
         
     def open_window(self):
         """Duplikat resim bulucu penceresini aç"""
@@ -111,10 +121,20 @@ class DuplicateImageFinder:
                                   command=self.move_duplicates, state="disabled")
         self.move_btn.pack(side=tk.LEFT, padx=5)
         
+        self.reclaim_btn = ttk.Button(button_frame, text=lang_manager.get_text('duplicate_finder.reclaim_space'), 
+                                     command=self.reclaim_space, state="disabled")
+        self.reclaim_btn.pack(side=tk.LEFT, padx=5)
+        
         self.clear_btn = ttk.Button(button_frame, text=lang_manager.get_text('duplicate_finder.clear_results'), 
                                    command=self.clear_results)
         self.clear_btn.pack(side=tk.LEFT, padx=5)
         
+        ttk.Checkbutton(button_frame, text=lang_manager.get_text('duplicate_finder.perceptual_mode'),
+                       variable=self.perceptual_mode).pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Label(button_frame, text=lang_manager.get_text('duplicate_finder.max_distance')).pack(side=tk.LEFT)
+        ttk.Spinbox(button_frame, from_=0, to=32, width=4,
+                   textvariable=self.max_distance).pack(side=tk.LEFT, padx=5)
+        
         # Progress bar
         progress_frame = ttk.Frame(main_frame)
         progress_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
@@ -198,6 +218,7 @@ class DuplicateImageFinder:
         self.scan_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
         
         # Progress sıfırla
         self.progress_var.set(0)
@@ -270,24 +291,18 @@ class DuplicateImageFinder:
         """Klasördeki resim dosyalarını bul"""
         image_files = []
         
+        # Uzantı filtresi stat'tan önce uygulanır, boyut DirEntry'den gelir, sistem klasörleri budanır
+        walker = DirWalker(dir_filter=get_ignore_rules().dir_filter,
+                           file_filter=lambda name: os.path.splitext(name)[1].lower() in self.image_extensions,
+                           should_stop=lambda: self.stop_scanning)
+        
         try:
-            for root, dirs, files in os.walk(self.selected_folder.get()):
-                if self.stop_scanning:
-                    break
-                for file in files:
-                    if self.stop_scanning:
-                        break
-                    if os.path.splitext(file)[1].lower() in self.image_extensions:
-                        file_path = os.path.join(root, file)
-                        try:
-                            file_size = os.path.getsize(file_path)
-                            image_files.append({
-                                'path': file_path,
-                                'name': file,
-                                'size': file_size
-                            })
-                        except (OSError, IOError):
-                            continue
+            for entry in walker.walk(self.selected_folder.get()):
+                image_files.append({
+                    'path': entry.path,
+                    'name': entry.name,
+                    'size': entry.size
+                })
         except Exception as e:
             print(f"Error finding image files: {e}")
             
@@ -295,6 +310,9 @@ class DuplicateImageFinder:
     
     def _find_duplicates(self, image_files):
         """Duplikat resimleri bul"""
+        if self.perceptual_mode.get():
+            return self._find_similar(image_files)
+        
         duplicates = []
         
         # Boyuta göre grupla
@@ -307,9 +325,23 @@ class DuplicateImageFinder:
                 size_groups[size] = []
             size_groups[size].append(file_info)
         
+        # Aynı boyuttaki resimlerin hash'leri paylaşılan havuzda paralel hesaplanır
+        hash_candidates = [f for files in size_groups.values() if len(files) > 1 for f in files]
+        images_text = f"{lang_manager.get_text('duplicate_finder.images_found')}: {len(image_files)}"
+        
+        def on_progress(done, total, done_bytes, speed):
+            self._update_progress((done / len(image_files)) * 100)
+            self._update_status(f"{images_text} ({speed:.1f} MB/s)")
+        
+        cache_snapshot = get_hash_cache().snapshot()
+        file_hashes = get_hashing_service().hash_files([f['path'] for f in hash_candidates],
+                                                       [f['size'] for f in hash_candidates],
+                                                       should_stop=lambda: self.stop_scanning,
+                                                       on_progress=on_progress)
+        self.hash_cache_stats = get_hash_cache().since(cache_snapshot)
+        
         # Hash ile gerçek duplikatları bul
         group_counter = 1
-        processed = 0
         
         for size, files in size_groups.items():
             if self.stop_scanning:
@@ -319,18 +351,11 @@ class DuplicateImageFinder:
                 hash_groups = {}
                 
                 for file_info in files:
-                    if self.stop_scanning:
-                        break
-                    
-                    file_hash = self._calculate_file_hash(file_info['path'])
+                    file_hash = file_hashes.get(file_info['path'])
                     if file_hash:
                         if file_hash not in hash_groups:
                             hash_groups[file_hash] = []
                         hash_groups[file_hash].append(file_info)
-                    
-                    processed += 1
-                    progress = (processed / len(image_files)) * 100
-                    self._update_progress(progress)
                 
                 # Hash gruplarından duplikatları al
                 for hash_value, hash_files in hash_groups.items():
@@ -345,6 +370,43 @@ class DuplicateImageFinder:
         
         return duplicates
     
+    def _find_similar(self, image_files):
+        """Algısal hash (dHash + aHash) ile görsel olarak benzer resimleri bul"""
+        def on_progress(done, total):
+            self._update_progress((done / max(1, total)) * 100)
+            self._update_status(lang_manager.get_text('duplicate_finder.hashing_images').format(done=done, total=total))
+        
+        try:
+            max_distance = int(self.max_distance.get())
+        except (tk.TclError, ValueError):
+            max_distance = DEFAULT_MAX_DISTANCE
+        
+        cache_snapshot = get_hash_cache().snapshot()
+        hasher = PerceptualHasher(should_stop=lambda: self.stop_scanning, on_progress=on_progress)
+        image_hashes = hasher.hash_files([f['path'] for f in image_files])
+        self.hash_cache_stats = get_hash_cache().since(cache_snapshot)
+        print(hasher.get_stats_text())
+        
+        if self.stop_scanning:
+            return []
+        
+        # Parmak izi indeksi hash önbelleğinin yanında saklanır - aynı klasörde tekrar kurulmaz
+        index = load_or_build_index(image_hashes, self.selected_folder.get())
+        
+        files_by_path = {f['path']: f for f in image_files}
+        duplicates = []
+        for group_counter, paths in enumerate(group_similar(image_hashes, max_distance, index), 1):
+            # En büyük dosya (genellikle en yüksek çözünürlük) orijinal kalır
+            files = sorted((files_by_path[path] for path in paths), key=lambda f: f['size'], reverse=True)
+            duplicates.append({
+                'group_id': group_counter,
+                'files': files,
+                'count': len(files),
+                'method': 'perceptual'
+            })
+        
+        return duplicates
+    
     def _show_results(self):
         """Tarama sonuçlarını göster"""
         def update_tree():
@@ -383,6 +445,8 @@ class DuplicateImageFinder:
         stats_text += f"{lang_manager.get_text('duplicate_finder.duplicate_groups_count').format(count=len(self.duplicate_groups))}\n"
         stats_text += f"{lang_manager.get_text('duplicate_finder.duplicate_files_count').format(count=self.duplicate_files)}\n"
         stats_text += f"{lang_manager.get_text('duplicate_finder.space_to_save').format(space=self._format_file_size(self.space_saved))}"
+        if self.hash_cache_stats:
+            stats_text += "\n" + lang_manager.get_text('duplicate_finder.hash_cache_stats').format(**self.hash_cache_stats)
         
         self.stats_label.configure(text=stats_text)
     
@@ -406,6 +470,7 @@ class DuplicateImageFinder:
         # UI durumunu güncelle
         self.is_moving = True
         self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
         self.scan_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         
@@ -513,16 +578,67 @@ class DuplicateImageFinder:
         finally:
             self._reset_ui_after_move()
     
-    def _calculate_file_hash(self, file_path, chunk_size=8192):
-        """Dosya hash'ini hesapla"""
+    def reclaim_space(self):
+        """Duplikatları yerinde orijinale bağlantıyla (reflink/hardlink) değiştir"""
+        if not self.duplicate_groups:
+            messagebox.showwarning(lang_manager.get_text('duplicate_finder.warning'), 
+                                 lang_manager.get_text('duplicate_finder.no_duplicates_to_move'))
+            return
+        
+        # Reflink desteklenmiyorsa hardlink kullanılacağı kullanıcıya söylenir
+        method_key = 'reclaim_method_reflink' if supports_reflink(self.selected_folder.get()) else 'reclaim_method_hardlink'
+        message = lang_manager.get_text('duplicate_finder.reclaim_confirmation').format(
+            count=self.duplicate_files, method=lang_manager.get_text(f'duplicate_finder.{method_key}'),
+            space=self._format_file_size(self.space_saved))
+        
+        if not messagebox.askyesno(lang_manager.get_text('duplicate_finder.confirm_reclaim'), message):
+            return
+        
+        # UI durumunu güncelle
+        self.is_moving = True
+        self.move_btn.configure(state="disabled")
+        self.reclaim_btn.configure(state="disabled")
+        self.scan_btn.configure(state="disabled")
+        self.stop_btn.configure(state="normal")
+        self.stop_scanning = False
+        
+        reclaim_thread = threading.Thread(target=self._reclaim_thread, daemon=True)
+        reclaim_thread.start()
+    
+    def _reclaim_thread(self):
+        """Alan kazanma thread'i - her duplikat değiştirilmeden önce yeniden doğrulanır"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            def on_progress(done, total):
+                def update():
+                    self.status_var.set(f"{lang_manager.get_text('duplicate_finder.reclaiming')} ({done}/{total})")
+                    self.progress_var.set((done / total) * 100 if total > 0 else 0)
+                self.window.after(0, update)
+            
+            # İlk dosya orijinal kalır; algısal gruplarda sadece bayt bayt aynı olanlar bağlanır
+            groups = [[file_info['path'] for file_info in group['files']] for group in self.duplicate_groups]
+            reclaimer = SpaceReclaimer(should_stop=lambda: self.stop_scanning, on_progress=on_progress)
+            stats = reclaimer.reclaim_groups(groups)
+            print(reclaimer.get_stats_text())
+            
+            message = lang_manager.get_text('duplicate_finder.reclaim_result').format(
+                space=self._format_file_size(stats['reclaimed_bytes']), **stats)
+            self.window.after(0, lambda: self.status_var.set(message.splitlines()[0]))
+            self.window.after(0, lambda: messagebox.showinfo(lang_manager.get_text('duplicate_finder.reclaim_complete'), message))
+            
+            # Bağlanan dosyalar artık yer kaplamıyor - sonuçlar geçersiz
+            if stats['reflinked'] or stats['hardlinked']:
+                self.window.after(0, self.clear_results)
+            
         except Exception as e:
-            return None
+            error_msg = lang_manager.get_text('duplicate_finder.reclaim_error').format(error=str(e))
+            self.window.after(0, lambda: messagebox.showerror(lang_manager.get_text('duplicate_finder.error'), error_msg))
+        
+        finally:
+            self._reset_ui_after_move()
+    
+    def _calculate_file_hash(self, file_path):
+        """Dosya hash'ini hesapla (paylaşılan hash servisi)"""
+        return get_hashing_service().hash_file(file_path)
     
     def _reset_ui_after_scan(self):
         """Tarama sonrası UI durumunu sıfırla"""
@@ -532,6 +648,7 @@ class DuplicateImageFinder:
             self.stop_btn.configure(state="disabled")
             if self.duplicate_groups:
                 self.move_btn.configure(state="normal")
+                self.reclaim_btn.configure(state="normal")
         
         self.window.after(0, reset)
     
@@ -540,6 +657,7 @@ class DuplicateImageFinder:
         def reset():
             self.is_moving = False
             self.move_btn.configure(state="normal")
+            self.reclaim_btn.configure(state="normal")
             self.scan_btn.configure(state="normal")
             self.stop_btn.configure(state="disabled")
         
@@ -555,6 +673,7 @@ class DuplicateImageFinder:
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
         self.move_btn.configure(state='disabled')
+        self.reclaim_btn.configure(state='disabled')
         self.stats_label.configure(text=lang_manager.get_text('duplicate_finder.no_scan_performed'))
         self.status_var.set(lang_manager.get_text('duplicate_finder.ready_to_scan'))
         self.progress_var.set(0)
@@ -9,7 +9,6 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, simpledialog, ttk
 from pathlib import Path
 import json
-import hashlib
 import time
 import stat
 from collections import defaultdict
@@ -19,6 +18,9 @@ import traceback
 # Multi-language support
 from lang_manager import t
 from lang_manager import lang_manager
+from folder_aggregates import FolderAggregates
+from ignore_rules import get_ignore_rules
+from content_hasher import get_hashing_service, get_hash_algorithm, set_hash_algorithm, get_use_mmap, set_use_mmap
 
 class FileOperations:
     def __init__(self, gui_manager):
@@ -41,6 +43,12 @@ class FileOperations:
         # Clipboard işlemleri için
         self.clipboard_operation = None  # 'copy' veya 'cut'
         
+        # Klasör boyut/sayı toplamları - özellikler, yapıştırma ve boş klasör temizliği paylaşır
+        self.folder_aggregates = FolderAggregates()
+        
+        # Gizli/sistem dosya kuralları - tüm tarayıcılarla paylaşılan derlenmiş motor
+        self.ignore_rules = get_ignore_rules()
+        
         # Dinamik kategori öğrenme sistemi
         self.learned_categories = {}  # {extension: category_name}
         self.load_learned_categories()
@@ -360,6 +368,9 @@ class FileOperations:
     
     def refresh_target(self, add_to_history=True):
         """Hedef klasörü yenile"""
+        # Dosya işlemlerinden sonra klasör toplamları eskimiş olabilir
+        self.folder_aggregates.invalidate()
+        
         # Geçerli yol kontrolü
         if not os.path.exists(self.current_path):
             self.current_path = self.target_path
@@ -436,25 +447,8 @@ class FileOperations:
             return t('properties.unknown')
     
     def is_hidden_file(self, filename, file_path=None):
-        """Gizli dosya kontrolü - Ana programdan alındı"""
-        # Windows gizli dosyaları
-        if filename.startswith('.'):
-            return True
-        
-        # Sistem dosyaları
-        system_files = [
-            'thumbs.db', 'desktop.ini', 'folder.jpg', 'folder.png',
-            'albumartsmall.jpg', 'albumart_{', '.ds_store',
-            'system volume information', '$recycle.bin', 'recycler',
-            'pagefile.sys', 'hiberfil.sys', 'swapfile.sys'
-        ]
-        
-        if filename.lower() in system_files:
-            return True
-        
-        # Geçici dosyalar
-        temp_extensions = ['.tmp', '.temp', '.bak', '.old', '.cache', '.log']
-        if any(filename.lower().endswith(ext) for ext in temp_extensions):
+        """Gizli dosya kontrolü - tarayıcılarla aynı derlenmiş kurallar"""
+        if self.ignore_rules.is_hidden_file(filename):
             return True
         
         # Windows gizli dosya attribute kontrolü
@@ -708,13 +702,8 @@ class FileOperations:
             source_path = item_data['path']
             
             if os.path.isdir(source_path):
-                # Klasör ise içindeki tüm öğeleri say
-                try:
-                    for root, dirs, files in os.walk(source_path):
-                        total_count += len(dirs) + len(files)  # Alt klasörler + dosyalar
-                except (PermissionError, OSError):
-                    # Erişim hatası durumunda sadece ana klasörü say
-                    total_count += 1
+                # Klasör ise içindeki tüm öğeleri say (alt klasörler + dosyalar, önbellekli)
+                total_count += self.folder_aggregates.get(source_path).total_items
             else:
                 # Dosya ise direkt say
                 total_count += 1
@@ -990,15 +979,12 @@ class FileOperations:
             messagebox.showerror(t('dialogs.error.title'), t('messages.properties_error', error=str(e)))
     
     def get_file_hash(self, file_path):
-        """Dosya hash'ini hesapla - Ana programdan alındı"""
+        """Dosyanın MD5 hash'i (MD5 penceresi için - seçili algoritmadan bağımsız)"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            os.stat(file_path)
         except Exception as e:
             return f"Hata: {e}"
+        return get_hashing_service().hash_file(file_path, algorithm='md5') or f"Hata: {file_path} okunamadı"
     
     def is_file_locked(self, file_path):
         """Dosya kilitli mi kontrol et"""
@@ -1353,6 +1339,13 @@ class FileOperations:
                         self.current_path = ""
                         self.gui.target_var.set("")
                         self.gui.current_path_var.set("")
+                
+                # Seçili hash algoritması (kurulu değilse varsayılana düşer)
+                if settings.get('hash_algorithm') and hasattr(self.gui, 'hash_algorithm'):
+                    self.gui.hash_algorithm.set(set_hash_algorithm(settings['hash_algorithm']))
+                # mmap ile hash (isteğe bağlı, varsayılan kapalı)
+                if hasattr(self.gui, 'use_mmap'):
+                    self.gui.use_mmap.set(set_use_mmap(settings.get('use_mmap', False)))
                     
         except Exception as e:
             print(f"Ayarlar yüklenirken hata: {e}")
@@ -1362,7 +1355,9 @@ class FileOperations:
         try:
             settings = {
                 'target_path': self.target_path,
-                'current_path': self.current_path
+                'current_path': self.current_path,
+                'hash_algorithm': get_hash_algorithm(),
+                'use_mmap': get_use_mmap()
             }
             
             with open('file_manager_settings.json', 'w', encoding='utf-8') as f:
@@ -2654,21 +2649,11 @@ class FileOperations:
     def show_folder_properties(self):
         """Klasör özelliklerini göster"""
         try:
-            # Klasördeki dosya sayısını hesapla
-            total_files = 0
-            total_folders = 0
-            total_size = 0
-            
-            for root, dirs, files in os.walk(self.current_path):
-                total_folders += len(dirs)
-                total_files += len(files)
-                
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        total_size += os.path.getsize(file_path)
-                    except:
-                        continue
+            # Klasördeki dosya sayısını hesapla (tek geçiş, önbellekli)
+            aggregate = self.folder_aggregates.get(self.current_path)
+            total_files = aggregate.file_count
+            total_folders = aggregate.dir_count
+            total_size = aggregate.size
             
             folder_name = os.path.basename(self.current_path)
             if not folder_name:
@@ -3463,15 +3448,9 @@ class FileOperations:
             print(f"⚠️ User learned check error: {e}")
             return True  # Şüphe durumunda kullanıcı öğretmesi say, silme
 
-    def _calculate_file_hash(self, file_path, chunk_size=8192):
-        """Dosya hash'ini hesapla"""
-        try:
-            import hashlib
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except Exception as e:
-            print(f"❌ Hash hesaplama hatası: {file_path} - {e}")
-            return None
\ No newline at end of file
+    def _calculate_file_hash(self, file_path):
+        """Dosya hash'ini hesapla (paylaşılan hash servisi)"""
+        file_hash = get_hashing_service().hash_file(file_path)
+        if file_hash is None:
+            print(f"❌ Hash hesaplama hatası: {file_path}")
+        return file_hash
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+File Records Module
+Tarama sonuçları için kompakt dosya kayıtları (__slots__) ve paylaşılan klasör/uzantı havuzu
+"""
+
+import os
+import sys
+import time
+
+
+class FileRecord:
+    """Tek dosya kaydı - dict yerine __slots__ kullanır
+
+    Yol saklanmaz; klasör (havuzdan paylaşılan) + isim olarak tutulur.
+    Eski kodla uyum için dict benzeri erişim desteklenir: record['path'], record.get('hash').
+    Nadir kullanılan anahtarlar (is_duplicate, original_path, pair_info...) 'extra' sözlüğüne yazılır.
+    normalized_name: benzerlik gruplamasının normalize isim anahtarı - ilk kullanımda bir kez
+    hesaplanır (dimensions gibi hesaplanana kadar anahtar yokmuş gibi davranır, keys()'de yer almaz).
+    """
+
+    __slots__ = ('directory', 'name', 'size', 'mtime_ns', 'extension', 'hash',
+                 'is_folder', 'inode', 'dimensions', 'normalized_name', 'extra')
+
+    # Slot olarak saklanan (veya slotlardan türetilen) anahtarlar
+    _SLOT_KEYS = frozenset(('name', 'size', 'mtime_ns', 'extension', 'hash',
+                            'is_folder', 'inode', 'dimensions', 'normalized_name'))
+    _KEYS = ('path', 'name', 'size', 'modified', 'extension', 'hash', 'is_folder',
+             'mtime_ns', 'inode', 'dimensions')
+
+    def __init__(self, directory, name, size, mtime_ns, extension, file_hash=None,
+                 is_folder=False, inode=0, dimensions=None):
+        self.directory = directory
+        self.name = name
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.extension = extension
+        self.hash = file_hash
+        self.is_folder = is_folder
+        self.inode = inode
+        self.dimensions = dimensions
+        self.normalized_name = None
+        self.extra = None
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, self.name)
+
+    @property
+    def modified(self):
+        return self.mtime_ns / 1e9
+
+    def __getitem__(self, key):
+        if key in self._SLOT_KEYS:
+            return getattr(self, key)
+        if key == 'path':
+            return self.path
+        if key == 'modified':
+            return self.modified
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'name':
+            # İsim değişince normalize anahtar yeniden hesaplanmalı
+            self.name, self.normalized_name = value, None
+        elif key in self._SLOT_KEYS:
+            setattr(self, key, value)
+        elif key == 'path':
+            self.directory, self.name = os.path.split(value)
+            self.normalized_name = None
+        elif key == 'modified':
+            self.mtime_ns = int(value * 1e9)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in ('dimensions', 'normalized_name'):
+            # Media boyutu / normalize isim hesaplanana kadar anahtar yokmuş gibi davran
+            return getattr(self, key) is not None
+        if key in self._SLOT_KEYS or key in ('path', 'modified'):
+            return True
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def keys(self):
+        keys = [key for key in self._KEYS if key in self]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def to_dict(self):
+        """Eski dict formatında kopya (rapor/JSON çıktıları için)"""
+        return {key: self[key] for key in self.keys()}
+
+    def copy(self):
+        record = FileRecord(self.directory, self.name, self.size, self.mtime_ns, self.extension,
+                            self.hash, self.is_folder, self.inode, self.dimensions)
+        record.normalized_name = self.normalized_name
+        if self.extra:
+            record.extra = dict(self.extra)
+        return record
+
+    def __repr__(self):
+        return f"FileRecord({self.path!r}, size={self.size})"
+
+
+class FileRecordStore:
+    """Kayıt fabrikası - klasör yolları ve uzantılar tek kopya olarak paylaşılır"""
+
+    def __init__(self):
+        self._directories = {}
+        self._extensions = {}
+
+    def clear(self):
+        """Yeni tarama öncesi havuzları boşalt"""
+        self._directories = {}
+        self._extensions = {}
+
+    def _intern_directory(self, directory):
+        return self._directories.setdefault(directory, directory)
+
+    def _intern_extension(self, extension):
+        return self._extensions.setdefault(extension, extension)
+
+    def create(self, path, size, mtime_ns, inode=0, file_hash=None, dimensions=None, is_folder=False):
+        """Yol ve stat bilgisinden kayıt oluştur"""
+        directory, name = os.path.split(path)
+        extension = 'folder' if is_folder else os.path.splitext(name)[1].lower()
+        return FileRecord(self._intern_directory(directory), name, size, mtime_ns,
+                          self._intern_extension(extension), file_hash, is_folder, inode, dimensions)
+
+    def from_entry(self, entry):
+        """DirWalker kaydından (WalkEntry) dosya kaydı oluştur"""
+        return self.create(entry.path, entry.size, entry.mtime_ns, entry.inode)
+
+    def get_stats_text(self):
+        return f"🗂️ Kayıt havuzu: {len(self._directories)} klasör, {len(self._extensions)} uzantı paylaşılıyor"
+
+
+def _legacy_record(path, size, mtime_ns, inode):
+    """Eski ScanEngine._get_file_info formatı (benchmark karşılaştırması için)"""
+    from pathlib import Path
+    return {
+        'path': path,
+        'name': os.path.basename(path),
+        'size': size,
+        'modified': mtime_ns / 1e9,
+        'extension': Path(path).suffix.lower(),
+        'hash': None,
+        'is_folder': False,
+        'mtime_ns': mtime_ns,
+        'inode': inode
+    }
+
+
+def benchmark(file_count=200000, files_per_dir=200):
+    """Dosya başına bellek kullanımı: dict kayıtlar vs FileRecord"""
+    import tracemalloc
+
+    extensions = ['.jpg', '.png', '.mp4', '.pdf', '.docx', '.txt', '.zip', '.mp3']
+    base = os.path.join(os.sep, 'data', 'archive', 'photos')
+
+    def paths():
+        for i in range(file_count):
+            directory = os.path.join(base, f"album_{i // files_per_dir:05d}", "raw")
+            # Gerçek taramada olduğu gibi her yol yeni bir string
+            yield directory + os.sep + f"IMG_{i:07d}{extensions[i % len(extensions)]}"
+
+    results = {}
+    for label, build in (('dict', lambda: [_legacy_record(p, 123456, 1700000000123456789, 42) for p in paths()]),
+                         ('FileRecord', lambda: [store.create(p, 123456, 1700000000123456789, 42) for p in paths()])):
+        store = FileRecordStore()
+        tracemalloc.start()
+        start = time.perf_counter()
+        records = build()
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = current / file_count
+        print(f"{'🐢' if label == 'dict' else '⚡'} {label:<11}: {current / file_count:7.1f} bayt/dosya, "
+              f"{elapsed:.2f} sn ({len(records)} kayıt)")
+        del records
+
+    saving = (1 - results['FileRecord'] / results['dict']) * 100
+    print(f"💾 Tasarruf: %{saving:.0f} - 5M dosyada ~{(results['dict'] - results['FileRecord']) * 5e6 / 1024 ** 3:.2f} GB")
+    return results
+
+
+if __name__ == "__main__":
+    # Kullanım: python file_records.py [dosya_sayısı]
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,183 @@
+"""
+Folder Aggregates Module
+Klasör boyutu, dosya/klasör sayısı ve boşluk bilgisini tek post-order geçişte hesaplar
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dir_walker import DirWalker
+
+
+class DirAggregate:
+    """Bir klasörün (alt ağacı dahil) toplam bilgileri"""
+
+    __slots__ = ('size', 'file_count', 'dir_count', 'children', 'mtime_ns', 'link_count')
+
+    def __init__(self, size=0, file_count=0, dir_count=0, children=(), mtime_ns=None, link_count=0):
+        self.size = size
+        self.file_count = file_count
+        self.dir_count = dir_count
+        self.children = children
+        self.mtime_ns = mtime_ns  # Listeleme anındaki klasör mtime'ı (önbellek doğrulaması)
+        self.link_count = link_count  # Boyuta/dosya sayısına girmeyen sembolik bağlantılar
+
+    @property
+    def is_empty(self):
+        """Alt ağaçta hiç dosya ve sembolik bağlantı (kırık veya klasöre işaret eden) yoksa boş"""
+        return self.file_count == 0 and self.link_count == 0
+
+    @property
+    def total_items(self):
+        return self.file_count + self.dir_count
+
+
+class FolderAggregates:
+    """Klasör ağacı toplamlarını hesaplayan ve önbellekte tutan motor
+
+    compute(root) kökün altındaki her klasör için sonucu tek geçişte üretir;
+    sonraki get() çağrıları aynı sonuçları paylaşır. Kök altındaki üst seviye
+    klasörler thread havuzunda paralel hesaplanır. get() önbellekteki alt ağacın
+    klasör mtime'larını kontrol eder; dosya eklenen/silinen/taşınan klasör varsa
+    yeniden hesaplar. Yerinde değişen dosya boyutları klasör mtime'ını değiştirmez -
+    bu tür işlemlerden sonra invalidate() çağrılmalıdır.
+    """
+
+    def __init__(self, dir_filter=None, file_filter=None, workers=None):
+        self.walker = DirWalker(dir_filter=dir_filter, file_filter=file_filter)
+        self.workers = workers or min(8, os.cpu_count() or 4)
+        self.lock = threading.Lock()
+        self._cache = {}
+
+    def get(self, folder_path):
+        """Klasörün toplamlarını döndür (önbellekte yoksa veya eskimişse hesapla)"""
+        key = os.path.normpath(folder_path)
+        with self.lock:
+            cached = self._cache.get(key)
+        if cached is not None and self._is_current(key, cached):
+            return cached
+        self.invalidate(key)
+        return self.compute(folder_path)
+
+    def _is_current(self, root_path, root):
+        """Önbellekteki alt ağacın tüm klasörleri hâlâ aynı mtime'a sahip mi (klasör başına tek stat)"""
+        with self.lock:
+            cache = dict(self._cache)
+        stack = [(root_path, root)]
+        while stack:
+            path, aggregate = stack.pop()
+            try:
+                if os.stat(path).st_mtime_ns != aggregate.mtime_ns:
+                    return False
+            except OSError:
+                return False
+            for child in aggregate.children:
+                child_aggregate = cache.get(child)
+                if child_aggregate is None:
+                    return False
+                stack.append((child, child_aggregate))
+        return True
+
+    def compute(self, root_path):
+        """Kök ve altındaki tüm klasörleri hesapla - üst seviye alt klasörler paralel"""
+        root_path = os.path.normpath(root_path)
+        mtime_ns = self._mtime_ns(root_path)
+        links = []
+        records, subdirs = self.walker.list_directory(root_path, links=links)
+
+        results = {}
+        if len(subdirs) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(subdirs))) as executor:
+                for subtree in executor.map(self._aggregate_subtree, subdirs):
+                    results.update(subtree)
+        else:
+            for subdir in subdirs:
+                results.update(self._aggregate_subtree(subdir))
+
+        root = self._combine(records, subdirs, results, mtime_ns, len(links))
+        results[root_path] = root
+
+        with self.lock:
+            self._cache.update(results)
+        return root
+
+    def iter_post_order(self, root_path):
+        """Kökün altındaki klasörleri (kök hariç) alt klasörler önce olacak şekilde üret"""
+        root = self.get(root_path)
+        with self.lock:
+            cache = dict(self._cache)
+
+        stack = [(child, False) for child in reversed(root.children)]
+        while stack:
+            path, visited = stack.pop()
+            aggregate = cache.get(path)
+            if aggregate is None:
+                continue
+            if visited:
+                yield path, aggregate
+                continue
+            stack.append((path, True))
+            stack.extend((child, False) for child in reversed(aggregate.children))
+
+    def invalidate(self, folder_path=None):
+        """Önbelleği temizle - klasör verilirse o klasör, alt ağacı ve üst klasörleri"""
+        with self.lock:
+            if folder_path is None:
+                self._cache = {}
+                return
+
+            key = os.path.normpath(folder_path)
+            prefix = key.rstrip(os.sep) + os.sep
+            for path in list(self._cache):
+                if path == key or path.startswith(prefix):
+                    del self._cache[path]
+
+            # Üst klasörlerin toplamları da geçersiz
+            parent = os.path.dirname(key)
+            while parent and parent != key:
+                self._cache.pop(parent, None)
+                key, parent = parent, os.path.dirname(parent)
+
+    def _aggregate_subtree(self, top_path):
+        """Alt ağacı iteratif post-order ile hesapla (her klasör bir kez listelenir)"""
+        results = {}
+        listings = {}
+        stack = [(top_path, False)]
+
+        while stack:
+            path, visited = stack.pop()
+            if visited:
+                mtime_ns, records, subdirs, link_count = listings.pop(path)
+                results[path] = self._combine(records, subdirs, results, mtime_ns, link_count)
+                continue
+
+            # mtime listelemeden önce alınır - listeleme sırasındaki değişiklik sonraki get()'te yakalanır
+            mtime_ns = self._mtime_ns(path)
+            links = []
+            records, subdirs = self.walker.list_directory(path, links=links)
+            listings[path] = (mtime_ns, records, subdirs, len(links))
+            stack.append((path, True))
+            stack.extend((subdir, False) for subdir in subdirs)
+
+        return results
+
+    @staticmethod
+    def _mtime_ns(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _combine(self, records, subdirs, results, mtime_ns=None, link_count=0):
+        """Klasörün kendi dosyaları + alt klasör toplamları"""
+        aggregate = DirAggregate(sum(record.size for record in records), len(records),
+                                 len(subdirs), tuple(subdirs), mtime_ns, link_count)
+        for subdir in subdirs:
+            child = results.get(subdir)
+            if child:
+                aggregate.size += child.size
+                aggregate.file_count += child.file_count
+                aggregate.dir_count += child.dir_count
+                aggregate.link_count += child.link_count
+        return aggregate
@@ -11,6 +11,8 @@ from pathlib import Path
 # Multi-language support
 from lang_manager import t, set_language, get_languages, lang_manager
 from language_switcher import LanguageSwitcher
+from progress_bus import ProgressBus
+from content_hasher import available_algorithms, get_hash_algorithm, set_hash_algorithm, get_use_mmap, set_use_mmap
 
 class GUIManager:
     def __init__(self, root):
@@ -19,6 +21,11 @@ class GUIManager:
         self.setup_variables()
         self.setup_ui()
         
+        # Worker thread'lerin ilerleme bilgisi 20 Hz ile UI'ye yansıtılır
+        self.progress_bus = ProgressBus(self.root, self.progress_var, self.status_var,
+                                        self.update_time_estimation, fps=20)
+        self.progress_bus.start()
+        
     def setup_main_window(self):
         """Ana pencere ayarları"""
         self.root.title(t('app.title'))
@@ -44,6 +51,16 @@ class GUIManager:
         # Yeni tarama modu değişkeni: "all", "none", "files_only"
         self.scan_mode = tk.StringVar(value="all")
         
+        # Artımlı tarama indeksi (hedef klasörde saklanır)
+        self.use_scan_index = tk.BooleanVar(value=True)
+        self.scan_workers = tk.IntVar(value=1)  # 1 = sıralı tarama
+        self.watch_changes = tk.BooleanVar(value=False)  # Tarama sonrası canlı izleme
+        self.memory_budget = tk.IntVar(value=0)  # MB, 0 = sınırsız (aşılınca kayıtlar diske taşar)
+        self.hash_algorithm = tk.StringVar(value=get_hash_algorithm())  # Tüm hash çağrılarında kullanılır
+        self.hash_algorithm.trace_add('write', lambda *args: set_hash_algorithm(self.hash_algorithm.get()))
+        self.use_mmap = tk.BooleanVar(value=get_use_mmap())  # Büyük dosyalarda mmap (isteğe bağlı)
+        self.use_mmap.trace_add('write', lambda *args: set_use_mmap(self.use_mmap.get()))
+        
         # Duplikat kontrol seçenekleri - Kullanıcı seçimi
         self.duplicate_check_name = tk.BooleanVar(value=True)
         self.duplicate_check_size = tk.BooleanVar(value=True)
@@ -54,6 +71,7 @@ class GUIManager:
         
         # Organizasyon modu seçenekleri - Yeni eklendi
         self.operation_mode = tk.StringVar(value="copy")  # "copy" veya "move"
+        self.skip_existing_content = tk.BooleanVar(value=True)  # İçeriği hedefte olan dosya kopyalanmaz
         
         # Progress ve status
         self.progress_var = tk.DoubleVar()
@@ -144,7 +162,31 @@ class GUIManager:
         # Seçenek 3: Sadece dosyaları tara (YENİ)
         self.ui_widgets['scan_files_radio'] = ttk.Radiobutton(scan_frame, text=t('scan_options.files_only'), 
                        variable=self.scan_mode, value="files_only")
-        self.ui_widgets['scan_files_radio'].pack(side=tk.LEFT)
+        self.ui_widgets['scan_files_radio'].pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Artımlı tarama indeksi seçeneği
+        self.ui_widgets['scan_index_check'] = ttk.Checkbutton(scan_frame, text=t('scan_options.use_index'), 
+                       variable=self.use_scan_index)
+        self.ui_widgets['scan_index_check'].pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Paralel tarama worker sayısı (ağ sürücüleri ve geniş ağaçlar için)
+        self.ui_widgets['scan_workers_label'] = ttk.Label(scan_frame, text=t('scan_options.workers'))
+        self.ui_widgets['scan_workers_label'].pack(side=tk.LEFT, padx=(0, 5))
+        self.ui_widgets['scan_workers_spin'] = ttk.Spinbox(scan_frame, from_=1, to=32, width=4, 
+                       textvariable=self.scan_workers)
+        self.ui_widgets['scan_workers_spin'].pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Bellek bütçesi (çok büyük ağaçlar için - aşılınca kayıtlar geçici diske taşar)
+        self.ui_widgets['memory_budget_label'] = ttk.Label(scan_frame, text=t('scan_options.memory_budget'))
+        self.ui_widgets['memory_budget_label'].pack(side=tk.LEFT, padx=(0, 5))
+        self.ui_widgets['memory_budget_spin'] = ttk.Spinbox(scan_frame, from_=0, to=65536, increment=256, 
+                       width=6, textvariable=self.memory_budget)
+        self.ui_widgets['memory_budget_spin'].pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Tarama sonrası kaynak/hedef değişikliklerini canlı uygula
+        self.ui_widgets['watch_check'] = ttk.Checkbutton(scan_frame, text=t('scan_options.watch'), 
+                       variable=self.watch_changes)
+        self.ui_widgets['watch_check'].pack(side=tk.LEFT)
         
         # Organizasyon modu seçeneği - Yeni eklendi
         operation_frame = ttk.Frame(parent)
@@ -161,6 +203,10 @@ class GUIManager:
                        variable=self.operation_mode, value="move")
         self.ui_widgets['move_mode_radio'].pack(side=tk.LEFT)
         
+        self.ui_widgets['skip_existing_check'] = ttk.Checkbutton(operation_frame, text=t('operation_mode.skip_existing'),
+                                                                variable=self.skip_existing_content)
+        self.ui_widgets['skip_existing_check'].pack(side=tk.LEFT, padx=(15, 0))
+        
         # Duplikat kontrol seçenekleri
         duplicate_frame = ttk.Frame(parent)
         duplicate_frame.grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
@@ -178,7 +224,13 @@ class GUIManager:
         
         self.ui_widgets['dup_hash_check'] = ttk.Checkbutton(duplicate_frame, text=t('duplicates.hash') + " ⚠️", 
                                                            variable=self.duplicate_check_hash)
-        self.ui_widgets['dup_hash_check'].pack(side=tk.LEFT, padx=(0, 10))
+        self.ui_widgets['dup_hash_check'].pack(side=tk.LEFT, padx=(0, 2))
+        self.ui_widgets['hash_algorithm_combo'] = ttk.Combobox(duplicate_frame, textvariable=self.hash_algorithm,
+                                                              values=available_algorithms(), state='readonly', width=9)
+        self.ui_widgets['hash_algorithm_combo'].pack(side=tk.LEFT, padx=(0, 2))
+        self.ui_widgets['use_mmap_check'] = ttk.Checkbutton(duplicate_frame, text=t('duplicates.use_mmap'),
+                                                           variable=self.use_mmap)
+        self.ui_widgets['use_mmap_check'].pack(side=tk.LEFT, padx=(0, 10))
         
         # Yeni seçenek: Media duplikat kontrolü
         self.duplicate_check_media = tk.BooleanVar(value=False)
@@ -376,6 +428,14 @@ class GUIManager:
             self.ui_widgets['scan_none_radio'].config(text=t('scan_options.copy_folders'))
         if 'scan_files_radio' in self.ui_widgets:
             self.ui_widgets['scan_files_radio'].config(text=t('scan_options.files_only'))
+        if 'scan_index_check' in self.ui_widgets:
+            self.ui_widgets['scan_index_check'].config(text=t('scan_options.use_index'))
+        if 'scan_workers_label' in self.ui_widgets:
+            self.ui_widgets['scan_workers_label'].config(text=t('scan_options.workers'))
+        if 'memory_budget_label' in self.ui_widgets:
+            self.ui_widgets['memory_budget_label'].config(text=t('scan_options.memory_budget'))
+        if 'watch_check' in self.ui_widgets:
+            self.ui_widgets['watch_check'].config(text=t('scan_options.watch'))
         if 'reminder_label' in self.ui_widgets:
             self.ui_widgets['reminder_label'].config(text=t('scan_options.reminder'))
         
@@ -386,6 +446,8 @@ class GUIManager:
             self.ui_widgets['copy_mode_radio'].config(text=t('operation_mode.copy'))
         if 'move_mode_radio' in self.ui_widgets:
             self.ui_widgets['move_mode_radio'].config(text=t('operation_mode.move'))
+        if 'skip_existing_check' in self.ui_widgets:
+            self.ui_widgets['skip_existing_check'].config(text=t('operation_mode.skip_existing'))
         
         # Bottom panel butonları güncelle
         if 'scan_btn' in self.ui_widgets:
@@ -394,6 +456,10 @@ class GUIManager:
             self.ui_widgets['analyze_btn'].config(text=t('buttons.analyze'))
         if 'organize_btn' in self.ui_widgets:
             self.ui_widgets['organize_btn'].config(text=t('buttons.organize'))
+        if 'save_plan_btn' in self.ui_widgets:
+            self.ui_widgets['save_plan_btn'].config(text=t('buttons.save_plan'))
+        if 'load_plan_btn' in self.ui_widgets:
+            self.ui_widgets['load_plan_btn'].config(text=t('buttons.load_plan'))
         
         if 'stop_btn' in self.ui_widgets:
             self.ui_widgets['stop_btn'].config(text=t('buttons.stop'))
@@ -414,6 +480,8 @@ class GUIManager:
             self.ui_widgets['dup_size_check'].config(text=t('duplicates.size'))
         if 'dup_hash_check' in self.ui_widgets:
             self.ui_widgets['dup_hash_check'].config(text=t('duplicates.hash'))
+        if 'use_mmap_check' in self.ui_widgets:
+            self.ui_widgets['use_mmap_check'].config(text=t('duplicates.use_mmap'))
         if 'dup_action_label' in self.ui_widgets:
             self.ui_widgets['dup_action_label'].config(text=t('duplicates.action_label'))
         if 'dup_ask_radio' in self.ui_widgets:
@@ -593,6 +661,10 @@ class GUIManager:
         self.ui_widgets['organize_btn'].pack(side=tk.LEFT, padx=(0, 5))
         self.ui_widgets['stop_btn'] = ttk.Button(button_frame, text=t('buttons.stop'), command=self.stop_operation, state='disabled')
         self.ui_widgets['stop_btn'].pack(side=tk.LEFT, padx=(0, 5))
+        self.ui_widgets['save_plan_btn'] = ttk.Button(button_frame, text=t('buttons.save_plan'), command=self.save_scan_plan)
+        self.ui_widgets['save_plan_btn'].pack(side=tk.LEFT, padx=(10, 5))
+        self.ui_widgets['load_plan_btn'] = ttk.Button(button_frame, text=t('buttons.load_plan'), command=self.load_scan_plan)
+        self.ui_widgets['load_plan_btn'].pack(side=tk.LEFT, padx=(0, 5))
         
         # Duplicate finder butonları
         duplicate_finder_btn = ttk.Button(button_frame, text=lang_manager.get_text('buttons.duplicate_image_finder'),
@@ -706,6 +778,14 @@ class GUIManager:
     def stop_operation(self):
         """İşlemi durdur - main_modular.py'den çağrılacak"""
         pass
+    
+    def save_scan_plan(self):
+        """Tarama planını kaydet - scan_plan modülünden çağrılacak"""
+        pass
+    
+    def load_scan_plan(self):
+        """Tarama planı yükle - scan_plan modülünden çağrılacak"""
+        pass
         
 
         
@@ -0,0 +1,183 @@
+"""
+Hash Cache Module
+Dosya içerik hash'leri için kalıcı önbellek - (aygıt, inode, boyut, mtime_ns) değişmedikçe
+dosya tekrar okunmaz
+"""
+
+import os
+import sys
+import atexit
+import sqlite3
+import threading
+
+
+def default_cache_dir():
+    """Kullanıcı ayar klasörü (Windows: %APPDATA%, diğerleri: $XDG_CONFIG_HOME veya ~/.config)"""
+    if sys.platform.startswith('win'):
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(base, 'python_file_manager')
+
+
+def _signed(value):
+    # SQLite INTEGER işaretli 64 bit - Windows'ta st_ino/st_dev 2^63 üstünde olabilir
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class HashCache:
+    """SQLite tabanlı kalıcı hash önbelleği
+
+    Anahtar (st_dev, st_ino, st_size, st_mtime_ns): dosya taşınsa bile (aynı disk) kayıt
+    geçerli kalır, içerik değişince mtime/boyut değiştiği için kayıt kendiliğinden geçersizleşir.
+    Her algoritmanın hash'i ayrı satırdadır; algoritma değiştirmek eski kayıtları silmez.
+    Kalıcı inode vermeyen dosya sistemlerinde (FAT/SMB/FUSE, st_ino == 0) önbellek kullanılmaz -
+    aynı boyut ve mtime'lı farklı dosyalar aynı anahtara düşerdi.
+    Yazmalar tamponlanır ve toplu commit edilir; havuz thread'lerinden güvenle çağrılabilir.
+    """
+
+    DB_FILENAME = 'hash_cache.db'
+    SCHEMA_VERSION = 2
+    FLUSH_EVERY = 500
+    MAX_ENTRIES = 2000000
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(default_cache_dir(), self.DB_FILENAME)
+        self.conn = None
+        self.lock = threading.Lock()
+        self._pending = {}
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    def open(self):
+        """Önbelleği aç (yoksa oluştur) - açılamazsa önbellek devre dışı kalır"""
+        if self.conn:
+            return True
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self.conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+            if row is None or int(row[0]) != self.SCHEMA_VERSION:
+                # Yeni veya uyumsuz şema - önbelleği sıfırla
+                self.conn.execute("DROP TABLE IF EXISTS hashes")
+                self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema_version', ?)",
+                                  (str(self.SCHEMA_VERSION),))
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS hashes (
+                    dev INTEGER,
+                    inode INTEGER,
+                    algo TEXT,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    hash TEXT,
+                    PRIMARY KEY (dev, inode, algo)
+                );
+            """)
+            self.conn.commit()
+            self._trim()
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Hash önbelleği açılamadı, önbelleksiz devam ediliyor: {e}")
+            self.conn = None
+            return False
+
+    def _trim(self):
+        """Çok büyüyen önbellekte en eski kayıtları sil"""
+        count = self.conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        if count > self.MAX_ENTRIES:
+            self.conn.execute("DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes ORDER BY rowid LIMIT ?)",
+                              (count - self.MAX_ENTRIES,))
+            self.conn.commit()
+
+    def close(self):
+        """Bekleyen kayıtları yaz ve kapat"""
+        with self.lock:
+            if self.conn:
+                try:
+                    self._flush_locked()
+                    self.conn.close()
+                finally:
+                    self.conn = None
+
+    @staticmethod
+    def is_cacheable(st):
+        """Dosya kimliği güvenilir mi (inode 0 ise anahtar dosyayı ayırt etmez)"""
+        return bool(st.st_ino)
+
+    @staticmethod
+    def _key(st, algorithm):
+        return (_signed(st.st_dev), _signed(st.st_ino), algorithm, st.st_size, st.st_mtime_ns)
+
+    def lookup(self, st, algorithm):
+        """os.stat sonucuna ait, algoritmayla üretilmiş hash (yoksa veya dosya değiştiyse None)"""
+        if not self.conn or not self.is_cacheable(st):
+            return None
+        key = self._key(st, algorithm)
+        with self.lock:
+            file_hash = self._pending.get(key)
+            if file_hash is None and self.conn:
+                row = self.conn.execute("SELECT hash FROM hashes WHERE dev=? AND inode=? AND algo=? AND size=? AND mtime_ns=?",
+                                        key).fetchone()
+                file_hash = row[0] if row else None
+            self.stats['hits' if file_hash else 'misses'] += 1
+        return file_hash
+
+    def store(self, st, file_hash, algorithm):
+        """Hash'i kaydet (toplu yazılır)"""
+        if not self.conn or not file_hash or not self.is_cacheable(st):
+            return
+        with self.lock:
+            self._pending[self._key(st, algorithm)] = file_hash
+            self.stats['stored'] += 1
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending or not self.conn:
+            return
+        try:
+            self.conn.executemany("INSERT OR REPLACE INTO hashes(dev, inode, algo, size, mtime_ns, hash) VALUES(?, ?, ?, ?, ?, ?)",
+                                  [key + (file_hash,) for key, file_hash in self._pending.items()])
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Hash önbelleği yazılamadı: {e}")
+        self._pending = {}
+
+    def snapshot(self):
+        """İstatistiklerin kopyası (bir işlemin payını hesaplamak için)"""
+        with self.lock:
+            return dict(self.stats)
+
+    def since(self, snapshot):
+        """snapshot alındığından beri biriken istatistikler"""
+        return {key: value - snapshot.get(key, 0) for key, value in self.snapshot().items()}
+
+    def get_stats_text(self, since=None):
+        stats = self.since(since) if since else self.snapshot()
+        return f"🗄️ Hash önbelleği: {stats['hits']} isabet, {stats['misses']} kaçırma, {stats['stored']} yeni kayıt"
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_hash_cache():
+    """Tüm hash çağrılarının paylaştığı önbellek (ilk çağrıda açılır)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HashCache()
+            _shared_cache.open()
+        return _shared_cache
+
+
+@atexit.register
+def _close_shared_cache():
+    if _shared_cache is not None:
+        _shared_cache.close()
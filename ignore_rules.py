@@ -0,0 +1,191 @@
+"""
+Ignore Rules Module
+Gizli/sistem dosya ve klasörleri için derlenmiş, tüm tarayıcıların paylaştığı yok sayma kuralları
+"""
+
+import os
+import re
+import sys
+import time
+import fnmatch
+import hashlib
+import threading
+
+# Kullanıcı kuralları dosyası (file_manager_settings.json yanında, .gitignore söz dizimi)
+IGNORE_FILE = 'file_manager_ignore.txt'
+
+
+class IgnoreRules:
+    """Derlenmiş yok sayma motoru
+
+    Yerleşik kurallar sabit frozenset / tuple olarak tutulur; her çağrıda liste
+    kurulmaz, tek 'in' ve tek str.endswith(tuple) kontrolü yapılır.
+    Kullanıcı kuralları .gitignore benzeri glob desenleridir ve tek bir regex'e derlenir:
+      *.iso          -> dosya ve klasör adlarıyla eşleşir
+      build/         -> sadece klasörler (gezinti sırasında tüm alt ağaç budanır)
+      !onemli.iso    -> kullanıcı desenlerini geri alır (yerleşik kuralları değil)
+      # yorum        -> yok sayılır
+    Desenler sadece isimle eşleşir; '/' içeren (yol) desenleri desteklenmez.
+    """
+
+    HIDDEN_FILE_NAMES = frozenset((
+        'thumbs.db', 'desktop.ini', 'folder.jpg', 'folder.png', 'albumartsmall.jpg',
+        '.ds_store', 'system volume information', '$recycle.bin', 'recycler',
+        'pagefile.sys', 'hiberfil.sys', 'swapfile.sys'
+    ))
+    HIDDEN_FOLDER_NAMES = frozenset((
+        'system volume information', '$recycle.bin', 'recycler',
+        '__pycache__', '.git', '.svn', 'node_modules'
+    ))
+    # AlbumArt_{GUID}_Large.jpg gibi Windows Media Player dosyaları
+    HIDDEN_FILE_PREFIXES = ('albumart_{',)
+    TEMP_SUFFIXES = ('.tmp', '.temp', '.bak', '.old', '.cache', '.log')
+
+    def __init__(self, patterns=None):
+        self.patterns = []
+        self._file_regex = None
+        self._dir_regex = None
+        self._keep_regex = None
+        if patterns:
+            self.set_patterns(patterns)
+
+    def set_patterns(self, patterns):
+        """Kullanıcı desenlerini derle (önceki desenlerin yerine geçer)"""
+        file_parts = []
+        dir_parts = []
+        keep_parts = []
+        accepted = []
+
+        for line in patterns:
+            pattern = line.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+
+            negate = pattern.startswith('!')
+            body = pattern[1:] if negate else pattern
+            dir_only = body.endswith('/')
+            body = body.strip('/')
+            if not body or '/' in body:
+                print(f"⚠️ Desteklenmeyen yok sayma deseni atlandı: {pattern}")
+                continue
+
+            regex = fnmatch.translate(body.lower())
+            if negate:
+                keep_parts.append(regex)
+            else:
+                dir_parts.append(regex)
+                if not dir_only:
+                    file_parts.append(regex)
+            accepted.append(pattern)
+
+        self.patterns = accepted
+        self._file_regex = self._compile(file_parts)
+        self._dir_regex = self._compile(dir_parts)
+        self._keep_regex = self._compile(keep_parts)
+
+    @staticmethod
+    def _compile(parts):
+        if not parts:
+            return None
+        return re.compile('|'.join(f'(?:{part})' for part in parts))
+
+    def load(self, path=IGNORE_FILE):
+        """Kullanıcı kurallarını dosyadan yükle (dosya yoksa sadece yerleşik kurallar)"""
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.set_patterns(f.read().splitlines())
+                print(f"🙈 {len(self.patterns)} kullanıcı yok sayma kuralı yüklendi: {path}")
+        except Exception as e:
+            print(f"Yok sayma kuralları yüklenirken hata: {e}")
+        return self
+
+    def _user_match(self, regex, lowered):
+        if regex is None or not regex.match(lowered):
+            return False
+        return not (self._keep_regex and self._keep_regex.match(lowered))
+
+    def is_hidden_file(self, filename):
+        """Dosya yok sayılmalı mı"""
+        if filename.startswith('.'):
+            return True
+        lowered = filename.lower()
+        if (lowered in self.HIDDEN_FILE_NAMES or lowered.startswith(self.HIDDEN_FILE_PREFIXES)
+                or lowered.endswith(self.TEMP_SUFFIXES)):
+            return True
+        return self._user_match(self._file_regex, lowered)
+
+    def is_hidden_folder(self, foldername):
+        """Klasör (ve tüm alt ağacı) yok sayılmalı mı"""
+        if foldername.startswith('.'):
+            return True
+        lowered = foldername.lower()
+        if lowered in self.HIDDEN_FOLDER_NAMES:
+            return True
+        return self._user_match(self._dir_regex, lowered)
+
+    def fingerprint(self):
+        """Yerleşik + kullanıcı kurallarının özeti - kurallar değişince kalıcı indeksler geçersiz olur"""
+        parts = [sorted(self.HIDDEN_FILE_NAMES), sorted(self.HIDDEN_FOLDER_NAMES),
+                 self.HIDDEN_FILE_PREFIXES, self.TEMP_SUFFIXES, self.patterns]
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    # DirWalker filtreleri (True = tut)
+    def dir_filter(self, name):
+        return not self.is_hidden_folder(name)
+
+    def file_filter(self, name):
+        return not self.is_hidden_file(name)
+
+
+_shared_rules = None
+_shared_lock = threading.Lock()
+
+
+def get_ignore_rules():
+    """Tüm tarayıcıların paylaştığı kural nesnesi (ilk çağrıda kullanıcı dosyası yüklenir)"""
+    global _shared_rules
+    with _shared_lock:
+        if _shared_rules is None:
+            _shared_rules = IgnoreRules().load()
+        return _shared_rules
+
+
+def _legacy_is_hidden_file(filename):
+    """Eski ScanEngine._is_hidden_file (benchmark karşılaştırması için)"""
+    if filename.startswith('.'):
+        return True
+    system_files = [
+        'thumbs.db', 'desktop.ini', 'folder.jpg', 'folder.png',
+        'albumartsmall.jpg', 'albumart_{', '.ds_store',
+        'system volume information', '$recycle.bin', 'recycler'
+    ]
+    if filename.lower() in system_files:
+        return True
+    temp_extensions = ['.tmp', '.temp', '.bak', '.old', '.cache', '.log']
+    return any(filename.lower().endswith(ext) for ext in temp_extensions)
+
+
+def benchmark(count=1000000):
+    """İsim başına kontrol süresi: eski liste tabanlı kontrol vs derlenmiş kurallar"""
+    extensions = ['.jpg', '.png', '.mp4', '.pdf', '.docx', '.txt', '.tmp', '.log']
+    names = [f"IMG_{i:07d}{extensions[i % len(extensions)]}" for i in range(count)]
+    rules = IgnoreRules(['*.iso', 'build/', '~$*'])
+
+    start = time.perf_counter()
+    legacy_hidden = sum(1 for name in names if _legacy_is_hidden_file(name))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_hidden = sum(1 for name in names if rules.is_hidden_file(name))
+    compiled_time = time.perf_counter() - start
+
+    print(f"🐢 Liste + any(endswith): {legacy_time:.2f} sn ({legacy_hidden} gizli)")
+    print(f"⚡ Derlenmiş kurallar    : {compiled_time:.2f} sn ({compiled_hidden} gizli, 3 kullanıcı deseni dahil)")
+    print(f"🚀 Hızlanma: x{legacy_time / compiled_time:.1f}")
+    return legacy_time, compiled_time
+
+
+if __name__ == "__main__":
+    # Kullanım: python ignore_rules.py [isim_sayısı]
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,882 @@
+"""
+Image Hasher Module
+Algısal resim hash'i (dHash + aHash): PNG (zlib), BMP ve GIF sadece standart kütüphaneyle satır
+satır çözülür ve tam bitmap tutulmadan küçültülür. Hash'ler süreç havuzunda hesaplanır ve dosya
+kimliğiyle (hash önbelleği) saklanır; kuruluysa Pillow diğer biçimler (JPEG, WEBP, TIFF) içindir.
+Benzer resim araması çoklu indeksli hash ile yapılır, benzerlik zincirleri union-find ile kümelenir.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from hash_cache import get_hash_cache, default_cache_dir
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Küçültme ızgarası: dHash 9x8 (yatay komşu farkı), aHash 8x8 (ortalamaya göre) - 64 bit
+HASH_SIZE = 8
+
+# Örneklenen sütun / satır sayısı (hücre başına ~8x8 örnek yeterli, geri kalan pikseller okunmaz)
+SAMPLE_COLUMNS = 72
+SAMPLE_ROWS = 64
+
+# Hash önbelleğinde içerik hash'lerinden ayrı satır (algoritma adı)
+CACHE_ALGORITHM = 'phash'
+
+# İki resmin benzer sayıldığı en büyük Hamming mesafesi (64 bitte)
+DEFAULT_MAX_DISTANCE = 10
+
+# Benzerlik indeksi: 64 bit 4 x 16 bitlik parçaya bölünür; dosyası hash önbelleğinin klasöründe
+INDEX_CHUNKS = 4
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+INDEX_FILENAME = 'phash_index.json'
+
+# Süreç havuzuna tek işte gönderilen dosya sayısı
+BATCH_FILES = 8
+
+# PNG: IDAT parçaları bu boyutta okunur, zlib çıktısı tek seferde en fazla bu kadar satır üretir
+# (bellek O(satır uzunluğu) - tek büyük IDAT veya yüksek sıkıştırma oranı tamponu büyütmez)
+PNG_READ_SIZE = 64 * 1024
+PNG_INFLATE_ROWS = 4
+
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class _Downsampler:
+    """Satır satır gelen parlaklık örneklerini 9x8 ve 8x8 ızgaralarda ortalar (bitmap tutulmaz)"""
+
+    def __init__(self, width, height):
+        if width <= 0 or height <= 0:
+            raise ValueError("Geçersiz resim boyutu")
+        self.height = height
+        count = min(width, SAMPLE_COLUMNS)
+        self.xs = [(2 * i + 1) * width // (2 * count) for i in range(count)]
+        cells9 = [x * (HASH_SIZE + 1) // width for x in self.xs]
+        cells8 = [x * HASH_SIZE // width for x in self.xs]
+        self.cells = list(zip(cells9, cells8))
+        self.row_step = max(1, height // SAMPLE_ROWS)
+        self.sums9 = [[0] * (HASH_SIZE + 1) for _ in range(HASH_SIZE)]
+        self.counts9 = [[0] * (HASH_SIZE + 1) for _ in range(HASH_SIZE)]
+        self.sums8 = [[0] * HASH_SIZE for _ in range(HASH_SIZE)]
+        self.counts8 = [[0] * HASH_SIZE for _ in range(HASH_SIZE)]
+
+    def wants(self, y):
+        return y % self.row_step == 0
+
+    def add(self, y, grays):
+        row = y * HASH_SIZE // self.height
+        sums9, counts9 = self.sums9[row], self.counts9[row]
+        sums8, counts8 = self.sums8[row], self.counts8[row]
+        for gray, (cell9, cell8) in zip(grays, self.cells):
+            sums9[cell9] += gray
+            counts9[cell9] += 1
+            sums8[cell8] += gray
+            counts8[cell8] += 1
+
+    def hashes(self):
+        dhash = 0
+        for sums, counts in zip(self.sums9, self.counts9):
+            row = [total / count if count else 0 for total, count in zip(sums, counts)]
+            for left, right in zip(row, row[1:]):
+                dhash = (dhash << 1) | (left > right)
+        values = [total / count if count else 0
+                  for sums, counts in zip(self.sums8, self.counts8) for total, count in zip(sums, counts)]
+        mean = sum(values) / len(values)
+        ahash = 0
+        for value in values:
+            ahash = (ahash << 1) | (value > mean)
+        return dhash, ahash
+
+
+def _luma(red, green, blue):
+    return (red * 299 + green * 587 + blue * 114) // 1000
+
+
+# --- PNG -------------------------------------------------------------------------------------
+
+def _swar_add(a, b, low_mask, high_mask):
+    # Büyük tamsayı içinde bayt bayt mod 256 toplama (baytlar arası elde taşınmaz)
+    return ((a & low_mask) + (b & low_mask)) ^ ((a ^ b) & high_mask)
+
+
+def _unfilter(kind, row, previous, bpp, masks):
+    """PNG satır filtresini yerinde geri al (0 None, 1 Sub, 2 Up, 3 Average, 4 Paeth)"""
+    length = len(row)
+    if kind == 0:
+        return
+    if kind == 2:
+        low_mask, high_mask, _ = masks
+        value = _swar_add(int.from_bytes(row, 'little'), int.from_bytes(previous, 'little'), low_mask, high_mask)
+        row[:] = value.to_bytes(length, 'little')
+    elif kind == 1:
+        # Adımı bpp olan önek toplamı - log2(uzunluk) adımda kaydırıp topla
+        low_mask, high_mask, full_mask = masks
+        value = int.from_bytes(row, 'little')
+        shift = bpp
+        while shift < length:
+            value = _swar_add(value, (value << (8 * shift)) & full_mask, low_mask, high_mask)
+            shift *= 2
+        row[:] = value.to_bytes(length, 'little')
+    elif kind == 3:
+        for i in range(bpp):
+            row[i] = (row[i] + (previous[i] >> 1)) & 255
+        for i in range(bpp, length):
+            row[i] = (row[i] + ((row[i - bpp] + previous[i]) >> 1)) & 255
+    elif kind == 4:
+        for i in range(bpp):
+            row[i] = (row[i] + previous[i]) & 255
+        for i in range(bpp, length):
+            left, up, corner = row[i - bpp], previous[i], previous[i - bpp]
+            estimate = left + up - corner
+            distance_left, distance_up, distance_corner = abs(estimate - left), abs(estimate - up), abs(estimate - corner)
+            if distance_left <= distance_up and distance_left <= distance_corner:
+                row[i] = (row[i] + left) & 255
+            elif distance_up <= distance_corner:
+                row[i] = (row[i] + up) & 255
+            else:
+                row[i] = (row[i] + corner) & 255
+    else:
+        raise ValueError(f"Bilinmeyen PNG filtresi: {kind}")
+
+
+def _png_gray_reader(color_type, depth, xs, palette):
+    """Satırdan örnek sütunların parlaklığını okuyan fonksiyon"""
+    channels = _PNG_CHANNELS[color_type]
+    if depth < 8:
+        mask = (1 << depth) - 1
+        positions = [(x * depth // 8, 8 - depth - (x * depth) % 8) for x in xs]
+        if color_type == 3:
+            return lambda row: [palette[(row[offset] >> shift) & mask] for offset, shift in positions]
+        return lambda row: [((row[offset] >> shift) & mask) * 255 // mask for offset, shift in positions]
+
+    step = depth // 8
+    offsets = [x * channels * step for x in xs]
+    if color_type == 3:
+        return lambda row: [palette[row[offset]] for offset in offsets]
+    if channels <= 2:
+        return lambda row: [row[offset] for offset in offsets]
+    # RGB / RGBA - 16 bitte yüksek bayt yeterli
+    return lambda row: [_luma(row[offset], row[offset + step], row[offset + 2 * step]) for offset in offsets]
+
+
+def _png_hash(f):
+    if f.read(8) != b'\x89PNG\r\n\x1a\n':
+        return None
+    decompressor = zlib.decompressobj()
+    sampler = reader = None
+    palette = [0] * 256
+    pending = bytearray()
+    previous = row_length = bpp = masks = None
+    y = 0
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        length, kind = struct.unpack('>I4s', header)
+        if kind == b'IDAT':
+            if sampler is None:
+                return None
+            max_length = (row_length + 1) * PNG_INFLATE_ROWS
+            remaining = length
+            while remaining and y < height:
+                data = f.read(min(remaining, PNG_READ_SIZE))
+                if not data:
+                    return None
+                remaining -= len(data)
+                # Çıktı sınırlı: kalan girdi unconsumed_tail'de bekler, satırlar işlendikçe açılır
+                while y < height:
+                    chunk = decompressor.decompress(data, max_length)
+                    data = decompressor.unconsumed_tail
+                    pending += chunk
+                    start = 0
+                    while len(pending) - start >= row_length + 1 and y < height:
+                        filter_kind = pending[start]
+                        row = pending[start + 1:start + 1 + row_length]
+                        start += row_length + 1
+                        _unfilter(filter_kind, row, previous, bpp, masks)
+                        if sampler.wants(y):
+                            sampler.add(y, reader(row))
+                        previous = row
+                        y += 1
+                    del pending[:start]
+                    if not data and len(chunk) < max_length:
+                        break
+            if y >= height:
+                return sampler.hashes()
+            f.seek(remaining + 4, 1)
+            continue
+
+        data = f.read(length)
+        f.seek(4, 1)
+        if kind == b'IHDR':
+            width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', data[:13])
+            if interlace or color_type not in _PNG_CHANNELS or depth not in (1, 2, 4, 8, 16):
+                # Adam7 satır sırası akışla küçültmeye uygun değil - Pillow'a bırakılır
+                return None
+            row_length = (width * _PNG_CHANNELS[color_type] * depth + 7) // 8
+            bpp = max(1, _PNG_CHANNELS[color_type] * depth // 8)
+            previous = bytearray(row_length)
+            masks = (int.from_bytes(b'\x7f' * row_length, 'little'), int.from_bytes(b'\x80' * row_length, 'little'),
+                     (1 << (8 * row_length)) - 1)
+            sampler = _Downsampler(width, height)
+        elif kind == b'PLTE':
+            for index in range(min(256, len(data) // 3)):
+                palette[index] = _luma(data[3 * index], data[3 * index + 1], data[3 * index + 2])
+        elif kind == b'IEND':
+            return sampler.hashes() if sampler and y else None
+        if sampler is not None and reader is None:
+            reader = _png_gray_reader(color_type, depth, sampler.xs, palette)
+
+
+# --- BMP -------------------------------------------------------------------------------------
+
+def _bmp_hash(f):
+    header = f.read(14)
+    if len(header) < 14 or header[:2] != b'BM':
+        return None
+    data_offset = struct.unpack('<I', header[10:14])[0]
+    info_size = struct.unpack('<I', f.read(4))[0]
+    if info_size == 12:
+        width, height, _, bits = struct.unpack('<HHHH', f.read(8))
+        compression, colors, entry_size = 0, 0, 3
+    elif info_size >= 40:
+        width, height, _, bits, compression = struct.unpack('<iiHHI', f.read(16))
+        f.seek(12, 1)
+        colors = struct.unpack('<I', f.read(4))[0]
+        entry_size = 4
+    else:
+        return None
+    # Sadece sıkıştırmasız (BI_RGB) ve standart maskeli 32 bit (BI_BITFIELDS)
+    if compression not in (0, 3) or (compression == 3 and bits != 32) or bits not in (1, 4, 8, 16, 24, 32):
+        return None
+    top_down = height < 0
+    height = abs(height)
+    sampler = _Downsampler(width, height)
+
+    palette = []
+    if bits <= 8:
+        f.seek(14 + info_size)
+        count = colors or (1 << bits)
+        table = f.read(count * entry_size)
+        palette = [_luma(table[i + 2], table[i + 1], table[i]) for i in range(0, len(table) - 2, entry_size)]
+        palette += [0] * (256 - len(palette))
+
+    xs = sampler.xs
+    if bits < 8:
+        mask = (1 << bits) - 1
+        positions = [(x * bits // 8, 8 - bits - (x * bits) % 8) for x in xs]
+        read = lambda row: [palette[(row[offset] >> shift) & mask] for offset, shift in positions]
+    elif bits == 8:
+        read = lambda row: [palette[row[x]] for x in xs]
+    elif bits == 16:
+        def read(row):
+            grays = []
+            for x in xs:
+                value = row[2 * x] | row[2 * x + 1] << 8
+                grays.append(_luma((value >> 10 & 31) * 255 // 31, (value >> 5 & 31) * 255 // 31,
+                                   (value & 31) * 255 // 31))
+            return grays
+    else:
+        step = bits // 8
+        read = lambda row: [_luma(row[x * step + 2], row[x * step + 1], row[x * step]) for x in xs]
+
+    row_size = (bits * width + 31) // 32 * 4
+    f.seek(data_offset)
+    for index in range(height):
+        y = index if top_down else height - 1 - index
+        if sampler.wants(y):
+            row = f.read(row_size)
+            if len(row) < row_size:
+                return None
+            sampler.add(y, read(row))
+        else:
+            f.seek(row_size, 1)
+    return sampler.hashes()
+
+
+# --- GIF -------------------------------------------------------------------------------------
+
+def _skip_sub_blocks(f):
+    while True:
+        size = f.read(1)
+        if not size or size[0] == 0:
+            return
+        f.seek(size[0], 1)
+
+
+def _gif_rows(height, interlaced):
+    """Çözülen satırların resimdeki y sırası"""
+    if not interlaced:
+        yield from range(height)
+        return
+    for start, step in ((0, 8), (4, 8), (2, 4), (1, 2)):
+        yield from range(start, height, step)
+
+
+def _gif_hash(f):
+    header = f.read(13)
+    if len(header) < 13 or header[:4] != b'GIF8':
+        return None
+    flags = header[10]
+    palette = [0] * 256
+    if flags & 0x80:
+        table = f.read(3 * (2 << (flags & 7)))
+        for index in range(len(table) // 3):
+            palette[index] = _luma(table[3 * index], table[3 * index + 1], table[3 * index + 2])
+
+    while True:
+        marker = f.read(1)
+        if marker == b'!':
+            f.seek(1, 1)
+            _skip_sub_blocks(f)
+        elif marker == b',':
+            break
+        else:
+            return None
+
+    # Sadece ilk kare
+    _, _, width, height, flags = struct.unpack('<HHHHB', f.read(9))
+    if flags & 0x80:
+        table = f.read(3 * (2 << (flags & 7)))
+        palette = [0] * 256
+        for index in range(len(table) // 3):
+            palette[index] = _luma(table[3 * index], table[3 * index + 1], table[3 * index + 2])
+    sampler = _Downsampler(width, height)
+    xs = sampler.xs
+    rows = _gif_rows(height, flags & 0x40)
+
+    min_size = f.read(1)[0]
+    if not 2 <= min_size <= 11:
+        return None
+    clear, end = 1 << min_size, (1 << min_size) + 1
+    initial = [bytes([index]) for index in range(clear)] + [b'', b'']
+    table = list(initial)
+    code_size = min_size + 1
+    previous = None
+    pixels = bytearray()
+    bits = bit_count = 0
+    done = 0
+
+    while done < height:
+        size = f.read(1)
+        if not size or size[0] == 0:
+            break
+        for byte in f.read(size[0]):
+            bits |= byte << bit_count
+            bit_count += 8
+            while bit_count >= code_size:
+                code = bits & ((1 << code_size) - 1)
+                bits >>= code_size
+                bit_count -= code_size
+                if code == clear:
+                    table = list(initial)
+                    code_size = min_size + 1
+                    previous = None
+                    continue
+                if code == end:
+                    bit_count = 0
+                    break
+                if previous is None:
+                    entry = table[code]
+                elif code < len(table):
+                    entry = table[code]
+                    if len(table) < 4096:
+                        table.append(previous + entry[:1])
+                elif code == len(table):
+                    entry = previous + previous[:1]
+                    table.append(entry)
+                else:
+                    return None
+                pixels += entry
+                previous = entry
+                if len(table) == (1 << code_size) and code_size < 12:
+                    code_size += 1
+        # Tamamlanan satırlar hemen işlenir, piksel tamponu tek satır boyunda kalır
+        start = 0
+        while len(pixels) - start >= width and done < height:
+            y = next(rows)
+            if sampler.wants(y):
+                sampler.add(y, [palette[pixels[start + x]] for x in xs])
+            start += width
+            done += 1
+        del pixels[:start]
+    return sampler.hashes() if done else None
+
+
+_DECODERS = ((b'\x89PNG', _png_hash), (b'BM', _bmp_hash), (b'GIF8', _gif_hash))
+
+
+def _pillow_hash(file_path):
+    """Pillow ile (kuruluysa) - JPEG'de draft modu tam çözünürlükte çözmeyi önler"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(file_path) as image:
+            image.draft('L', (SAMPLE_COLUMNS, SAMPLE_ROWS))
+            gray = image.convert('L')
+            resample = getattr(Image, 'BOX', Image.BILINEAR)
+            wide = list(gray.resize((HASH_SIZE + 1, HASH_SIZE), resample).getdata())
+            square = list(gray.resize((HASH_SIZE, HASH_SIZE), resample).getdata())
+    except Exception:
+        return None
+    dhash = 0
+    for row in range(HASH_SIZE):
+        values = wide[row * (HASH_SIZE + 1):(row + 1) * (HASH_SIZE + 1)]
+        for left, right in zip(values, values[1:]):
+            dhash = (dhash << 1) | (left > right)
+    mean = sum(square) / len(square)
+    ahash = 0
+    for value in square:
+        ahash = (ahash << 1) | (value > mean)
+    return dhash, ahash
+
+
+def perceptual_hash(file_path):
+    """(dHash, aHash) - 64 bitlik iki tamsayı; çözülemeyen dosyada None"""
+    try:
+        with open(file_path, 'rb') as f:
+            magic = f.read(4)
+            f.seek(0)
+            for prefix, decoder in _DECODERS:
+                if magic.startswith(prefix):
+                    result = decoder(f)
+                    if result is not None:
+                        return result
+                    break
+    except (OSError, ValueError, IndexError, StopIteration, struct.error, zlib.error):
+        pass
+    return _pillow_hash(file_path)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _hash_batch(paths):
+    """Süreç havuzu işi"""
+    return [(path, perceptual_hash(path)) for path in paths]
+
+
+class PerceptualHasher:
+    """Dosya listesinin algısal hash'leri - önbellek ana süreçte, hesap süreç havuzunda
+
+    Önbellek anahtarı dosya kimliğidir (aygıt, inode, boyut, mtime); değişmeyen dosya bir
+    sonraki taramada tekrar çözülmez. inode'u 0 olan dosyalar önbelleğe sorulmaz/yazılmaz. Süreç havuzu açılamazsa hesap çağıran thread'de yapılır.
+    """
+
+    def __init__(self, cache=None, max_workers=None, should_stop=None, on_progress=None):
+        self.cache = cache if cache is not None else get_hash_cache()
+        self.max_workers = max_workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+        self.should_stop = should_stop
+        self.on_progress = on_progress
+        self.stats = {'cached': 0, 'computed': 0, 'failed': 0, 'seconds': 0.0}
+
+    def hash_files(self, paths):
+        """{yol: (dhash, ahash) veya None}"""
+        start = time.perf_counter()
+        results = {}
+        identities = {}
+        pending = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                results[path] = None
+                continue
+            cacheable = self.cache and self.cache.is_cacheable(st)
+            cached = self.cache.lookup(st, CACHE_ALGORITHM) if cacheable else None
+            if cached:
+                results[path] = (int(cached[:16], 16), int(cached[16:], 16))
+                self.stats['cached'] += 1
+            else:
+                if cacheable:
+                    identities[path] = st
+                pending.append(path)
+        self._report(len(results), len(paths))
+
+        for path, hashes in self._compute(pending, len(results), len(paths)):
+            results[path] = hashes
+            if hashes is None:
+                self.stats['failed'] += 1
+                continue
+            self.stats['computed'] += 1
+            if path in identities:
+                self.cache.store(identities[path], f"{hashes[0]:016x}{hashes[1]:016x}", CACHE_ALGORITHM)
+        if self.cache:
+            self.cache.flush()
+        self.stats['seconds'] += time.perf_counter() - start
+        return results
+
+    def _compute(self, paths, done, total):
+        if not paths:
+            return
+        batches = [paths[i:i + BATCH_FILES] for i in range(0, len(paths), BATCH_FILES)]
+        try:
+            # spawn: Tk ana thread'iyle çatallanmış (fork) çocuk kilitlenebilir; her platformda aynı davranış
+            executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                           mp_context=multiprocessing.get_context('spawn'))
+        except (OSError, ValueError, NotImplementedError) as e:
+            print(f"⚠️ Süreç havuzu açılamadı, tek süreçte devam: {e}")
+            executor = None
+
+        if executor is None or len(paths) <= BATCH_FILES:
+            if executor:
+                executor.shutdown()
+            for path in paths:
+                if self.should_stop and self.should_stop():
+                    return
+                yield path, perceptual_hash(path)
+                done += 1
+                self._report(done, total)
+            return
+
+        try:
+            queue = iter(batches)
+            running = {}
+            for batch in queue:
+                running[executor.submit(_hash_batch, batch)] = batch
+                if len(running) >= 2 * self.max_workers:
+                    break
+            while running:
+                if self.should_stop and self.should_stop():
+                    return
+                finished, _ = wait(running, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch = running.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # Havuz bozulduysa (çocuk süreç çöktü) bu iş tek süreçte yapılır
+                        print(f"⚠️ Algısal hash işi başarısız, tek süreçte tekrar: {e}")
+                        results = _hash_batch(batch)
+                    yield from results
+                    done += len(batch)
+                    self._report(done, total)
+                    next_batch = next(queue, None)
+                    if next_batch is not None:
+                        try:
+                            running[executor.submit(_hash_batch, next_batch)] = next_batch
+                        except Exception:
+                            yield from _hash_batch(next_batch)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _report(self, done, total):
+        if self.on_progress:
+            self.on_progress(done, total)
+
+    def get_stats_text(self):
+        stats = self.stats
+        return (f"🖼️ Algısal hash: {stats['cached']} önbellekten, {stats['computed']} hesaplandı, "
+                f"{stats['failed']} çözülemedi ({stats['seconds']:.2f} sn)")
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(radius):
+    """CHUNK_BITS bitlik, en fazla radius biti 1 olan maskeler (komşu tablo anahtarları)"""
+    return tuple(mask for mask in range(1 << CHUNK_BITS) if bin(mask).count('1') <= radius)
+
+
+class FingerprintIndex:
+    """64 bitlik parmak izleri için çoklu indeksli hash (multi-index hashing)
+
+    Parmak izi INDEX_CHUNKS parçaya bölünür, her parça kendi tablosunda tutulur. Mesafesi k
+    içindeki bir parmak izinin en az bir parçası (güvercin yuvası) k // INDEX_CHUNKS bit içinde
+    aynıdır; sorguda sadece bu komşu tablo anahtarlarındaki adaylar karşılaştırılır. Tablolar
+    mesafe hesaplamadan kurulduğu için kayıt sadece (anahtar, parmak izi) listesidir.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.tables = [{} for _ in range(INDEX_CHUNKS)]
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, value):
+        node = len(self.keys)
+        self.keys.append(key)
+        self.values.append(value)
+        for index, table in enumerate(self.tables):
+            table.setdefault((value >> (CHUNK_BITS * index)) & CHUNK_MASK, []).append(node)
+
+    def search(self, value, max_distance):
+        """[(anahtar, mesafe)] - value'ya mesafesi max_distance içindeki kayıtlar"""
+        flips = _flip_masks(max_distance // INDEX_CHUNKS)
+        if len(flips) * INDEX_CHUNKS >= len(self.keys):
+            # Büyük mesafede / küçük indekste komşu anahtar sayısı kayıt sayısını geçer - düz tarama
+            candidates = range(len(self.keys))
+        else:
+            candidates = set()
+            for index, table in enumerate(self.tables):
+                chunk = (value >> (CHUNK_BITS * index)) & CHUNK_MASK
+                for flip in flips:
+                    nodes = table.get(chunk ^ flip)
+                    if nodes:
+                        candidates.update(nodes)
+        found = []
+        values = self.values
+        for node in candidates:
+            distance = hamming(value, values[node])
+            if distance <= max_distance:
+                found.append((self.keys[node], distance))
+        self.comparisons += len(candidates)
+        return found
+
+    def save(self, file_path, root_path=None):
+        """İndeksi JSON olarak kaydet (geçici dosyaya yazılıp yerine taşınır)"""
+        data = {
+            'version': self.VERSION,
+            'root': root_path,
+            'fingerprints': [[key, f"{value:016x}"] for key, value in zip(self.keys, self.values)],
+        }
+        temp_path = file_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, file_path)
+            return True
+        except OSError as e:
+            print(f"⚠️ Resim indeksi kaydedilemedi: {e}")
+            return False
+
+    @classmethod
+    def load(cls, file_path):
+        """(indeks, kök klasör) - dosya yoksa veya bozuksa (None, None)"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                return None, None
+            index = cls()
+            for key, value in data['fingerprints']:
+                index.add(key, int(value, 16))
+            return index, data.get('root')
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if os.path.exists(file_path):
+                print(f"⚠️ Resim indeksi okunamadı, yeniden oluşturulacak: {e}")
+            return None, None
+
+
+def index_path():
+    """Kayıtlı parmak izi indeksinin yeri - hash önbelleğinin yanında"""
+    return os.path.join(default_cache_dir(), INDEX_FILENAME)
+
+
+def load_or_build_index(hashes, root_path=None, file_path=None):
+    """{anahtar: (dhash, ahash)} için dHash indeksi
+
+    Aynı klasörün kayıtlı indeksi, içindeki her kayıt hâlâ aynı parmak iziyle duruyorsa
+    kullanılır ve sadece yeni resimler eklenir; değişen veya silinen resim varsa indeks
+    baştan kurulur. Değişen indeks tekrar kaydedilir.
+    """
+    file_path = file_path or index_path()
+    current = {key: value[0] for key, value in hashes.items() if value}
+    index, saved_root = FingerprintIndex.load(file_path)
+    if index is not None and (saved_root != root_path or len(index) > len(current) or
+                              any(current.get(key) != value for key, value in zip(index.keys, index.values))):
+        index = None
+    changed = index is None
+    if index is None:
+        index = FingerprintIndex()
+    known = set(index.keys)
+    for key, value in current.items():
+        if key not in known:
+            index.add(key, value)
+            changed = True
+    if changed:
+        index.save(file_path, root_path)
+    return index
+
+
+class _DisjointSet:
+    """Union-find (yol yarılama + boyuta göre birleştirme)"""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, key):
+        parent = self.parent
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+        if self.size.get(first, 1) < self.size.get(second, 1):
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] = self.size.get(first, 1) + self.size.get(second, 1)
+
+
+def group_similar(hashes, max_distance=DEFAULT_MAX_DISTANCE, index=None):
+    """{anahtar: (dhash, ahash)} -> benzer resim grupları (her biri anahtar listesi)
+
+    İki resim dHash ve aHash mesafelerinin ikisi de max_distance içindeyse benzerdir. Adaylar
+    dHash indeksinden gelir; benzerlik zincirleri (A~B, B~C) union-find ile tek kümede toplanır.
+    Gruplar ve grup içi sıra hashes'teki sırayı izler.
+    """
+    if index is None:
+        index = FingerprintIndex()
+        for key, value in hashes.items():
+            if value:
+                index.add(key, value[0])
+    clusters = _DisjointSet()
+    for key, value in hashes.items():
+        if not value:
+            continue
+        for other, _ in index.search(value[0], max_distance):
+            other_value = hashes.get(other)
+            if other != key and other_value and hamming(value[1], other_value[1]) <= max_distance:
+                clusters.union(key, other)
+
+    groups = {}
+    for key in hashes:
+        if key in clusters.parent:
+            groups.setdefault(clusters.find(key), []).append(key)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _pairwise_groups(hashes, max_distance):
+    """İndeksiz karşılaştırma: tüm çiftler + union-find (benchmark referansı)"""
+    items = [(key, value) for key, value in hashes.items() if value]
+    clusters = _DisjointSet()
+    for index, (key, (dhash, ahash)) in enumerate(items):
+        for other, (other_dhash, other_ahash) in items[index + 1:]:
+            if hamming(dhash, other_dhash) <= max_distance and hamming(ahash, other_ahash) <= max_distance:
+                clusters.union(key, other)
+    groups = {}
+    for key, _ in items:
+        if key in clusters.parent:
+            groups.setdefault(clusters.find(key), []).append(key)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def benchmark_index(count=10000, max_distance=DEFAULT_MAX_DISTANCE, seed=1):
+    """Sentetik parmak izleriyle tüm çiftler vs çoklu indeks (gruplar birebir karşılaştırılır)
+
+    Gerçek fotoğraf arşivleri gibi kümeli dağılım: rastgele merkezlerin etrafında birkaç bit
+    çevrilmiş kopyalar (yeniden boyutlandırma / sıkıştırma farkı) ve bağımsız resimler.
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(seed)
+
+    def flip(value, bits):
+        for bit in rng.sample(range(64), bits):
+            value ^= 1 << bit
+        return value
+
+    hashes = {}
+    while len(hashes) < count:
+        dhash, ahash = rng.getrandbits(64), rng.getrandbits(64)
+        hashes[f"img{len(hashes)}"] = (dhash, ahash)
+        for _ in range(rng.choice((0, 0, 0, 1, 2, 3))):
+            hashes[f"img{len(hashes)}"] = (flip(dhash, rng.randrange(max_distance + 4)), flip(ahash, rng.randrange(6)))
+
+    print(f"🖼️ {len(hashes)} parmak izi, mesafe <= {max_distance}")
+    start = time.perf_counter()
+    expected = _pairwise_groups(hashes, max_distance)
+    pairwise_time = time.perf_counter() - start
+    pairs = len(hashes) * (len(hashes) - 1) // 2
+    print(f"🐢 Tüm çiftler : {pairwise_time:.2f} sn ({pairs:,} karşılaştırma)")
+
+    start = time.perf_counter()
+    index = FingerprintIndex()
+    for key, value in hashes.items():
+        index.add(key, value[0])
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    groups = group_similar(hashes, max_distance, index)
+    search_time = time.perf_counter() - start
+    print(f"🗂️ Çoklu indeks: {build_time:.2f} sn kurulum + {search_time:.2f} sn arama "
+          f"({index.comparisons:,} karşılaştırma, sorgu başına {index.comparisons / len(hashes):.0f})")
+
+    with tempfile.TemporaryDirectory(prefix='phash_index_') as folder:
+        saved_path = os.path.join(folder, INDEX_FILENAME)
+        index.save(saved_path, 'bench')
+        start = time.perf_counter()
+        loaded = load_or_build_index(hashes, 'bench', saved_path)
+        load_time = time.perf_counter() - start
+        reloaded = group_similar(hashes, max_distance, loaded)
+    print(f"💾 Kayıttan yükleme: {load_time:.2f} sn")
+
+    same = sorted(map(sorted, groups)) == sorted(map(sorted, expected)) == sorted(map(sorted, reloaded))
+    print(f"{'✅' if same else '❌'} {len(groups)} küme, sonuçlar {'aynı' if same else 'FARKLI'}")
+    return pairwise_time, build_time + search_time
+
+
+def benchmark(root_path, max_distance=DEFAULT_MAX_DISTANCE):
+    """Klasördeki resimler: tek süreç vs süreç havuzu vs önbellekten ikinci tarama"""
+    import shutil
+    import tempfile
+    from dir_walker import DirWalker
+    from hash_cache import HashCache
+
+    extensions = {'.png', '.bmp', '.gif', '.jpg', '.jpeg', '.webp', '.tiff'}
+    paths = [entry.path for entry in DirWalker().walk(root_path)
+             if os.path.splitext(entry.name)[1].lower() in extensions]
+    print(f"📂 {len(paths)} resim (Pillow {'var' if Image is not None else 'yok - sadece PNG/BMP/GIF'})")
+
+    start = time.perf_counter()
+    sequential = {path: perceptual_hash(path) for path in paths}
+    sequential_time = time.perf_counter() - start
+    print(f"🐢 Tek süreç      : {sequential_time:.2f} sn")
+
+    cache_dir = tempfile.mkdtemp(prefix='phash_bench_')
+    try:
+        cache = HashCache(os.path.join(cache_dir, HashCache.DB_FILENAME))
+        cache.open()
+        hasher = PerceptualHasher(cache)
+        start = time.perf_counter()
+        pooled = hasher.hash_files(paths)
+        pooled_time = time.perf_counter() - start
+        print(f"🚀 Süreç havuzu   : {pooled_time:.2f} sn ({hasher.max_workers} süreç)")
+        start = time.perf_counter()
+        cached = PerceptualHasher(cache).hash_files(paths)
+        cached_time = time.perf_counter() - start
+        print(f"🗄️ Önbellekten    : {cached_time:.2f} sn")
+        cache.close()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    same = sequential == pooled == cached
+    groups = group_similar(sequential, max_distance)
+    print(f"{'✅' if same else '❌'} {sum(1 for value in sequential.values() if value)} resim çözüldü, "
+          f"{len(groups)} benzer grup (mesafe <= {max_distance})")
+    return sequential_time, pooled_time, cached_time
+
+
+if __name__ == "__main__":
+    # Kullanım: python image_hasher.py <klasör> [mesafe]
+    #           python image_hasher.py --index [parmak izi sayısı] [mesafe]
+    if len(sys.argv) >= 2 and sys.argv[1] == '--index':
+        benchmark_index(int(sys.argv[2]) if len(sys.argv) > 2 else 10000,
+                        int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_MAX_DISTANCE)
+        sys.exit(0)
+    if len(sys.argv) < 2 or not os.path.isdir(sys.argv[1]):
+        print("Kullanım: python image_hasher.py <klasör> [mesafe] | --index [sayı] [mesafe]")
+        sys.exit(1)
+    benchmark(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MAX_DISTANCE)
@@ -9,8 +9,8 @@ import sys
 import os
 import shutil
 import traceback
+import multiprocessing
 import time
-import hashlib
 
 # Multi-language support
 from lang_manager import t, set_language, get_languages, lang_manager
@@ -22,6 +22,10 @@ try:
     from file_operations import FileOperations
     from scan_engine import ScanEngine
     from reporting import ReportingManager
+    from scan_plan import ScanPlanManager
+    from content_hasher import get_hashing_service
+    from target_index import TargetIndex
+    from video_probe import video_dimensions
     from duplicate_image_finder import DuplicateImageFinder
     from duplicate_file_finder import DuplicateFileFinder
 except ImportError as e:
@@ -105,6 +109,9 @@ class ModularFileManager:
             # 4. Reporting Manager - Raporlama
             self.reporting = ReportingManager(self.gui_manager, self.file_operations, self.scan_engine)
             
+            # 4b. Scan Plan Manager - Tarama planı kaydet/yükle
+            self.scan_plan = ScanPlanManager(self.gui_manager, self.file_operations, self.scan_engine)
+            
             # 5. Duplicate Image Finder - Tek klasör duplikat bulucu
             self.duplicate_finder = DuplicateImageFinder(self.root)
             
@@ -144,6 +151,10 @@ class ModularFileManager:
         
         # Reporting bağlantıları
         self.gui_manager.analyze_target_disk = self.reporting.analyze_target_disk
+        
+        # Tarama planı bağlantıları
+        self.gui_manager.save_scan_plan = self.scan_plan.save_plan
+        self.gui_manager.load_scan_plan = self.scan_plan.load_plan
 
         # Duplicate Image Finder bağlantısı
         self.gui_manager.open_duplicate_finder = self.duplicate_finder.open_window
@@ -182,6 +193,10 @@ class ModularFileManager:
                 widgets['organize_btn'].configure(command=self.start_organization)
             if 'stop_btn' in widgets:
                 widgets['stop_btn'].configure(command=self.stop_operation)
+            if 'save_plan_btn' in widgets:
+                widgets['save_plan_btn'].configure(command=self.scan_plan.save_plan)
+            if 'load_plan_btn' in widgets:
+                widgets['load_plan_btn'].configure(command=self.scan_plan.load_plan)
                 
             # File manager butonlarını bağla
             if 'back_btn' in widgets:
@@ -372,6 +387,9 @@ class ModularFileManager:
         # Progress bar'ı sıfırla
         self.gui_manager.progress_var.set(0)
         
+        # Organizasyon dosyaları taşırken canlı izleme yapıyı değiştirmesin
+        self.scan_engine.stop_watch()
+        
         # Thread'de organizasyon başlat
         try:
             organization_thread = threading.Thread(target=self._organization_thread, daemon=True)
@@ -424,6 +442,14 @@ class ModularFileManager:
         try:
             target_base = self.gui_manager.target_var.get()
             
+            # Yüklenen tarama planı: dosyalar plandan sonra değişmiş olabilir - stat ile doğrula
+            if self.scan_engine.loaded_plan:
+                self.gui_manager.progress_bus.publish(status=lang_manager.get_text('scan_plan.validating'))
+                _, changed, missing = self.scan_plan.revalidate(workers=max(8, self.scan_engine._get_scan_workers()))
+                if changed or missing:
+                    message = lang_manager.get_text('scan_plan.stale_message').format(changed=changed, missing=missing)
+                    self.root.after(0, lambda: messagebox.showwarning(lang_manager.get_text('scan_plan.stale_title'), message))
+            
             # Time estimation başlat
             self.gui_manager.start_time_estimation()
             
@@ -453,6 +479,30 @@ class ModularFileManager:
             likely_duplicates_folder = os.path.join(target_base, "Likely Duplicates")
             os.makedirs(likely_duplicates_folder, exist_ok=True)
             
+            # Kopyalama modunda içeriği hedefte zaten bulunan dosyalar (isim değişmiş olsa bile) atlanır
+            target_index = None
+            content_matches = {}
+            content_skipped = 0
+            content_skipped_bytes = 0
+            if operation_mode == "copy" and self.gui_manager.skip_existing_content.get():
+                try:
+                    self.gui_manager.progress_bus.publish(status=lang_manager.get_text('messages.checking_target'))
+                    target_index = TargetIndex(target_base, should_stop=lambda: self.operation_cancelled)
+                    target_index.refresh(dir_filter=self.file_operations.ignore_rules.dir_filter,
+                                         file_filter=self.file_operations.ignore_rules.file_filter)
+                    normal_files = [file_info
+                                    for main_folder, subfolders in self.scan_engine.organization_structure.items()
+                                    if main_folder not in ["Duplicate Files", "Likely Duplicates"]
+                                    for files in subfolders.values() for file_info in files]
+                    content_matches = target_index.find_many(normal_files)
+                    print(target_index.get_stats_text())
+                except Exception as e:
+                    print(f"⚠️ Hedef içerik indeksi kullanılamadı: {e}")
+                    if target_index:
+                        target_index.close()
+                    target_index = None
+                    content_matches = {}
+            
             # TARAMA SONUÇLARINI KULLAN: Organizasyon yapısından direkt taşı
             # Artık existing_folder_files ve unique_files ayrımı yok - hepsi organization_structure'da
             
@@ -516,14 +566,7 @@ class ModularFileManager:
                                     
                                     # Progress güncelle
                                     progress = (processed_items / total_items) * 100
-                                    def update_progress():
-                                        self.gui_manager.progress_var.set(progress)
-                                    self.root.after(0, update_progress)
-                                    
-                                    # Time estimation güncelle
-                                    def update_time():
-                                        self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                                    self.root.after(0, update_time)
+                                    self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                                     continue
                                 
                                 # Aynı isimde dosya varsa numara ekle (duplikat klasöründe bile)
@@ -616,14 +659,7 @@ class ModularFileManager:
                                 
                                 # Progress güncelle
                                 progress = (processed_items / total_items) * 100
-                                def update_progress():
-                                    self.gui_manager.progress_var.set(progress)
-                                self.root.after(0, update_progress)
-                                
-                                # Time estimation güncelle
-                                def update_time():
-                                    self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                                self.root.after(0, update_time)
+                                self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                             
                             except Exception as e:
                                 error_files += 1
@@ -632,9 +668,7 @@ class ModularFileManager:
                                 
                                 # Progress güncelle (hata durumunda da)
                                 progress = (processed_items / total_items) * 100
-                                def update_progress():
-                                    self.gui_manager.progress_var.set(progress)
-                                self.root.after(0, update_progress)
+                                self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                     
                     # Bu klasör işlendi, bir sonrakine geç
                     continue
@@ -687,14 +721,21 @@ class ModularFileManager:
                                 
                                 # Progress güncelle
                                 progress = (processed_items / total_items) * 100
-                                def update_progress():
-                                    self.gui_manager.progress_var.set(progress)
-                                self.root.after(0, update_progress)
+                                self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
+                                continue
+                            
+                            # İçerik hedefte zaten var - bayt kopyalamadan atla
+                            existing_copy = content_matches.get(file_info['path'])
+                            if existing_copy is not None:
+                                content_skipped += 1
+                                content_skipped_bytes += file_info['size']
+                                processed_items += 1
+                                
+                                # Progress güncelle
+                                progress = (processed_items / total_items) * 100
+                                self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                                 
-                                # Time estimation güncelle
-                                def update_time():
-                                    self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                                self.root.after(0, update_time)
+                                print(f"🎯 Dosya atlandı (içerik hedefte var): {file_info['name']} = {existing_copy}")
                                 continue
                             
                             # ARTIK DUPLIKAT KONTROLÜ YOK - Çünkü duplikatlar zaten ayrı klasörlerde
@@ -710,14 +751,7 @@ class ModularFileManager:
                                     
                                     # Progress güncelle
                                     progress = (processed_items / total_items) * 100
-                                    def update_progress():
-                                        self.gui_manager.progress_var.set(progress)
-                                    self.root.after(0, update_progress)
-                                    
-                                    # Time estimation güncelle
-                                    def update_time():
-                                        self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                                    self.root.after(0, update_time)
+                                    self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                                     
                                     print(f"⏭️ Dosya atlandı (zaten var): {file_info['name']}")
                                     continue
@@ -755,14 +789,7 @@ class ModularFileManager:
                                         
                                         # Progress güncelle
                                         progress = (processed_items / total_items) * 100
-                                        def update_progress():
-                                            self.gui_manager.progress_var.set(progress)
-                                        self.root.after(0, update_progress)
-                                        
-                                        # Time estimation güncelle
-                                        def update_time():
-                                            self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                                        self.root.after(0, update_time)
+                                        self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                                         
                                         print(f"⏭️ Kullanıcı dosyayı atladı: {file_info['name']}")
                                         
@@ -862,6 +889,8 @@ class ModularFileManager:
                                     success, message = self.file_operations.copy_file_optimized(file_info['path'], target_file)
                                     if success:
                                         copied_files += 1
+                                        if target_index:
+                                            target_index.add(target_file, file_info)
                                         print(f"📄 Normal dosya kopyalandı: {file_info['name']}")
                                     else:
                                         error_files += 1
@@ -871,14 +900,7 @@ class ModularFileManager:
                             
                             # Progress güncelle
                             progress = (processed_items / total_items) * 100
-                            def update_progress():
-                                self.gui_manager.progress_var.set(progress)
-                            self.root.after(0, update_progress)
-                            
-                            # Time estimation güncelle
-                            def update_time():
-                                self.gui_manager.update_time_estimation(progress, processed_items, total_items)
-                            self.root.after(0, update_time)
+                            self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
                         
                         except Exception as e:
                             error_files += 1
@@ -887,12 +909,11 @@ class ModularFileManager:
                             
                             # Progress güncelle (hata durumunda da)
                             progress = (processed_items / total_items) * 100
-                            def update_progress():
-                                self.gui_manager.progress_var.set(progress)
-                            self.root.after(0, update_progress)
+                            self.gui_manager.progress_bus.publish(progress, processed=processed_items, total=total_items)
             
             # İşlem tamamlandığında UI'yi güncelle
             def final_update():
+                self.gui_manager.progress_bus.flush()
                 self.gui_manager.progress_var.set(100)
                 
                 # Time estimation durdur
@@ -906,6 +927,9 @@ class ModularFileManager:
                 else:
                     message += f"{lang_manager.get_text('messages.copied')}: {copied_files}\n"
                 message += f"{lang_manager.get_text('messages.skipped')}: {skipped_files}\n"
+                if content_skipped > 0:
+                    message += f"{lang_manager.get_text('messages.content_skipped')}: {content_skipped}\n"
+                    message += f"{lang_manager.get_text('messages.copy_avoided')}: {self.file_operations.format_size(content_skipped_bytes)}\n"
                 message += f"{lang_manager.get_text('messages.errors')}: {error_files}\n"
                 
                 # Duplikat ve boş klasör bilgileri
@@ -921,6 +945,10 @@ class ModularFileManager:
                 # Butonları yeniden aktif et
                 self._reset_buttons_after_operation()
             
+            # Yeni kopyalananlar indekste - sonraki organizasyonda tekrar hash'lenmez
+            if target_index:
+                target_index.close()
+            
             # Boş klasörleri temizle
             if operation_mode == "move":
                 empty_folders_moved += self._cleanup_empty_folders(self.file_operations.source_path, duplicate_files_folder)
@@ -930,6 +958,8 @@ class ModularFileManager:
         except Exception as e:
             # Kritik hata durumunda
             def error_update():
+                self.gui_manager.progress_bus.flush()
+                
                 # Time estimation durdur
                 self.gui_manager.stop_time_estimation()
                 
@@ -1031,65 +1061,45 @@ class ModularFileManager:
         empty_folders_moved = 0
         
         try:
-            # Kaynak klasörde boş klasörleri bul (bottom-up approach)
-            for root, dirs, files in os.walk(source_path, topdown=False):
-                for dir_name in dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    
-                    # Klasör boş mu kontrol et
-                    if self._is_folder_empty(dir_path):
-                        try:
-                            # Boş klasörü Duplicate Files'a taşı
-                            timestamp = int(time.time())
-                            empty_folder_name = f"empty_folder_{timestamp}_{dir_name}"
-                            target_path = os.path.join(duplicate_files_folder, empty_folder_name)
-                            
-                            # Klasörü taşı
-                            shutil.move(dir_path, target_path)
-                            empty_folders_moved += 1
-                            print(f"📁 Boş klasör taşındı: {dir_name} -> Duplicate Files/{empty_folder_name}")
-                            
-                        except Exception as e:
-                            print(f"⚠️ Boş klasör taşıma hatası: {e}")
-                            continue
+            # Kaynak klasörde boş klasörleri bul (bottom-up approach) - tek post-order geçiş
+            aggregates = self.file_operations.folder_aggregates
+            aggregates.invalidate(source_path)
+            
+            for dir_path, aggregate in aggregates.iter_post_order(source_path):
+                # Klasör boş mu kontrol et (alt ağaçta hiç dosya veya sembolik bağlantı yok)
+                if aggregate.is_empty and os.path.isdir(dir_path):
+                    dir_name = os.path.basename(dir_path)
+                    try:
+                        # Boş klasörü Duplicate Files'a taşı
+                        timestamp = int(time.time())
+                        empty_folder_name = f"empty_folder_{timestamp}_{dir_name}"
+                        target_path = os.path.join(duplicate_files_folder, empty_folder_name)
+                        
+                        # Klasörü taşı
+                        shutil.move(dir_path, target_path)
+                        empty_folders_moved += 1
+                        print(f"📁 Boş klasör taşındı: {dir_name} -> Duplicate Files/{empty_folder_name}")
+                        
+                    except Exception as e:
+                        print(f"⚠️ Boş klasör taşıma hatası: {e}")
+                        continue
             
+            aggregates.invalidate(source_path)
             return empty_folders_moved
             
         except Exception as e:
             print(f"⚠️ Boş klasör temizleme hatası: {e}")
             return 0
     
-    def _is_folder_empty(self, folder_path):
-        """Klasörün tamamen boş olup olmadığını kontrol et"""
-        try:
-            # Klasör var mı kontrol et
-            if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
-                return False
-            
-            # Klasör içeriğini kontrol et
-            for root, dirs, files in os.walk(folder_path):
-                # Herhangi bir dosya varsa boş değil
-                if files:
-                    return False
-                
-                # Alt klasörlerde dosya var mı kontrol et
-                for subdir in dirs:
-                    subdir_path = os.path.join(root, subdir)
-                    if not self._is_folder_empty(subdir_path):
-                        return False
-            
-            # Hiç dosya bulunamadıysa boş
-            return True
-            
-        except Exception as e:
-            print(f"⚠️ Klasör boşluk kontrolü hatası: {e}")
-            return False
-    
     def quit_application(self):
         """Uygulamayı güvenli şekilde kapat"""
         try:
             # Kullanıcıya onay sor
             if messagebox.askyesno(lang_manager.get_text('dialogs.exit.title'), lang_manager.get_text('dialogs.exit.message')):
+                # Canlı izlemeyi durdur
+                if hasattr(self, 'scan_engine'):
+                    self.scan_engine.stop_watch()
+                
                 # Öğrenilmiş kategorileri kaydet
                 if hasattr(self, 'file_operations'):
                     try:
@@ -1121,16 +1131,9 @@ class ModularFileManager:
         except Exception as e:
             messagebox.showerror("Kritik Hata", f"Program çalıştırılamadı: {e}")
 
-    def _calculate_file_hash(self, file_path, chunk_size=8192):
-        """Dosya hash'ini hesapla"""
-        try:
-            hash_md5 = hashlib.md5()  # MD5 algoritması kullanılıyor
-            with open(file_path, "rb") as f:  # Dosyayı binary modda aç
-                for chunk in iter(lambda: f.read(chunk_size), b""):  # 8KB parçalar halinde oku
-                    hash_md5.update(chunk)  # Her parçayı hash'e ekle
-            return hash_md5.hexdigest()  # Hexadecimal string döndür
-        except:
-            return None  # Hata durumunda None döndür
+    def _calculate_file_hash(self, file_path):
+        """Dosya hash'ini hesapla (paylaşılan hash servisi)"""
+        return get_hashing_service().hash_file(file_path)  # Okunamazsa None
     
     def _get_media_dimensions(self, file_path):
         """Media dosyasının boyutlarını al (resim/video)"""
@@ -1142,7 +1145,7 @@ class ModularFileManager:
                 return self._get_image_dimensions(file_path)
             
             # Video dosyaları için
-            elif extension in ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v']:
+            elif extension in ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp']:
                 return self._get_video_dimensions(file_path)
             
             return None
@@ -1217,29 +1220,18 @@ class ModularFileManager:
             return None
     
     def _get_video_dimensions(self, file_path):
-        """Video dosyasının boyutlarını al (basit yaklaşım)"""
+        """Video çözünürlüğü ve süresi kapsayıcı başlığından (MP4/MOV, MKV/WebM, AVI - decode yok)"""
         try:
-            # Video metadata okuma çok karmaşık, basit bir yaklaşım kullanıyoruz
-            # Gerçek uygulamada ffprobe veya benzeri araçlar kullanılabilir
-            
-            # Dosya boyutuna göre tahmin (çok basit)
-            file_size = os.path.getsize(file_path)
-            
-            # Yaygın video çözünürlükleri ve dosya boyutları
-            if file_size < 50 * 1024 * 1024:  # 50MB altı
-                return "720x480"  # SD
-            elif file_size < 200 * 1024 * 1024:  # 200MB altı
-                return "1280x720"  # HD
-            elif file_size < 500 * 1024 * 1024:  # 500MB altı
-                return "1920x1080"  # Full HD
-            else:
-                return "3840x2160"  # 4K
-                
-        except:
+            # Başlık okunamazsa None - media modunda dosya tek başına kalır, yanlış gruplanmaz
+            return video_dimensions(file_path)
+        except Exception:
             return None
 
 
 if __name__ == "__main__":
+    # Paketlenmiş exe'de süreç havuzu çocukları (algısal resim hash'i) uygulamayı tekrar başlatmasın
+    multiprocessing.freeze_support()
+    
     try:
         # Ana uygulama örneği oluştur
         app = ModularFileManager()
@@ -0,0 +1,265 @@
+"""
+Name Similarity Module
+Dosya ismi benzerliği: bit-paralel (Myers/Hyyrö) Levenshtein mesafesi, eşik verilince erken
+çıkış, isim başına önbelleğe alınan parçalar (küçük harfli kök, kelime kümesi, bit maskeleri)
+ve önceden derlenmiş, önbellekli isim normalizasyonu
+"""
+
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+
+# Karşılaştırmalar aynı isimleri tekrar tekrar kullanır (bloklama) - önbellek sınırlı tutulur
+NAME_CACHE_SIZE = 1 << 16
+
+_WORD_SPLIT = re.compile(r'[\s\-_]+')
+
+# Normalizasyon hattı - adımlar sırayla uygulanır (her adım öncekinin çıktısında çalışır)
+_DIGIT_STEPS = (
+    # Tarih kalıpları: 20231105, 2023-11-05, 05.11.2023
+    (re.compile(r'\d{8}'), ''),
+    (re.compile(r'\d{4}-\d{2}-\d{2}'), ''),
+    (re.compile(r'\d{2}\.\d{2}\.\d{4}'), ''),
+    # Saat kalıpları: 14:30, 1430
+    (re.compile(r'\d{2}:\d{2}'), ''),
+    (re.compile(r'\d{4}(?=\D|$)'), ''),
+    # Sayı dizileri (3+ rakam)
+    (re.compile(r'\d{3,}'), ''),
+)
+_TEXT_STEPS = (
+    # Özel karakterler boşluk, çoklu boşluk tek boşluk olur
+    (re.compile(r'[_\-\(\)\[\]{}]'), ' '),
+    (re.compile(r'\s+'), ' '),
+)
+_has_digit = re.compile(r'\d').search
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def name_parts(name):
+    """İsmin karşılaştırma parçaları: (uzantısız küçük harfli kök, kelime kümesi, karakter maskeleri)"""
+    base = os.path.splitext(name)[0].lower()
+    masks = {}
+    for index, char in enumerate(base):
+        masks[char] = masks.get(char, 0) | (1 << index)
+    return base, frozenset(_WORD_SPLIT.split(base)), masks
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_filename(filename):
+    """Benzerlik gruplaması için isim: uzantısız, küçük harf, tarih/saat/sayaçlar ve ayraçlar atılmış"""
+    name_base = os.path.splitext(filename)[0].lower()
+    if _has_digit(name_base):
+        # Rakam yoksa rakam kalıplarının hiçbiri eşleşmez
+        for pattern, replacement in _DIGIT_STEPS:
+            name_base = pattern.sub(replacement, name_base)
+    for pattern, replacement in _TEXT_STEPS:
+        name_base = pattern.sub(replacement, name_base)
+    return name_base.strip()
+
+
+def levenshtein(text1, text2, max_distance=None, masks=None):
+    """Bit-paralel Levenshtein mesafesi (Myers 1999, Hyyrö 2001)
+
+    text1 desen olarak bit maskelerine çevrilir (Python int'i uzunluk sınırı tanımaz), text2'nin
+    her karakteri tek adımda işlenir. max_distance verilirse mesafe bunu aşacağı kesinleştiğinde
+    max_distance + 1 döner. masks: text1 için önceden hesaplanmış karakter maskeleri.
+    """
+    length1, length2 = len(text1), len(text2)
+    if max_distance is not None and abs(length1 - length2) > max_distance:
+        return max_distance + 1
+    if not length1 or not length2:
+        return length1 or length2
+    if masks is None:
+        masks = {}
+        for index, char in enumerate(text1):
+            masks[char] = masks.get(char, 0) | (1 << index)
+
+    full = (1 << length1) - 1
+    last = 1 << (length1 - 1)
+    positive, negative = full, 0
+    distance = length1
+    for column, char in enumerate(text2, 1):
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        h_positive = negative | (~(horizontal | positive) & full)
+        h_negative = positive & horizontal
+        if h_positive & last:
+            distance += 1
+        elif h_negative & last:
+            distance -= 1
+        if max_distance is not None and distance - (length2 - column) > max_distance:
+            # Kalan her sütun mesafeyi en fazla 1 azaltabilir
+            return max_distance + 1
+        h_positive = ((h_positive << 1) | 1) & full
+        h_negative = (h_negative << 1) & full
+        positive = h_negative | (~(vertical | h_positive) & full)
+        negative = h_positive & vertical
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+def _score(distance, max_len, contained, word_bonus, length_ratio):
+    # ScanEngine'in eski hesabıyla aynı işlem sırası (float sonuçları birebir aynı kalsın)
+    similarity = ((max_len - distance) / max_len) * 100
+    if contained:
+        similarity = min(100, similarity + 10)
+    if word_bonus is not None:
+        similarity = min(100, similarity + word_bonus)
+    if length_ratio < 0.5:
+        similarity *= 0.8
+    return int(max(0, min(100, similarity)))
+
+
+def name_similarity(name1, name2, min_similarity=0):
+    """İki dosya isminin benzerlik oranı (0-100)
+
+    Levenshtein oranına ek olarak: biri diğerini içeriyorsa +10, ortak kelimeler için en fazla
+    +15, biri diğerinin yarısından kısaysa %20 ceza. min_similarity verilirse sonucu bu eşiğe
+    ulaşamayacak çiftlerde mesafe hesabı erken kesilir ve 0 döner; eşiğe ulaşanların sonucu
+    eşiksiz hesapla aynıdır.
+    """
+    base1, words1, masks1 = name_parts(name1)
+    base2, words2, _ = name_parts(name2)
+    if not base1 or not base2:
+        return 0
+    if base1 == base2:
+        return 100
+
+    # Mesafeden bağımsız kısımlar önce - eşik için izin verilen en büyük mesafe bunlardan çıkar
+    max_len = max(len(base1), len(base2))
+    contained = base1 in base2 or base2 in base1
+    word_bonus = None
+    if words1 and words2:
+        common_words = words1 & words2
+        if common_words:
+            word_bonus = (len(common_words) / max(len(words1), len(words2))) * 15
+    length_ratio = min(len(base1), len(base2)) / max_len
+
+    max_distance = None
+    if min_similarity > 0:
+        # Skor mesafeyle azalır - eşiği sağlayan en büyük mesafe ikili aramayla
+        low, high = abs(len(base1) - len(base2)), max_len
+        if _score(low, max_len, contained, word_bonus, length_ratio) < min_similarity:
+            return 0
+        while low < high:
+            middle = (low + high + 1) // 2
+            if _score(middle, max_len, contained, word_bonus, length_ratio) >= min_similarity:
+                low = middle
+            else:
+                high = middle - 1
+        max_distance = low
+
+    distance = levenshtein(base1, base2, max_distance, masks1)
+    if max_distance is not None and distance > max_distance:
+        return 0
+    return _score(distance, max_len, contained, word_bonus, length_ratio)
+
+
+def _reference_similarity(name1, name2):
+    """Eski saf Python hesabı (özyinelemeli satır satır Levenshtein) - karşılaştırma için"""
+    name1_base = os.path.splitext(name1)[0].lower()
+    name2_base = os.path.splitext(name2)[0].lower()
+    if not name1_base or not name2_base:
+        return 0
+    if name1_base == name2_base:
+        return 100
+
+    def levenshtein_distance(s1, s2):
+        if len(s1) < len(s2):
+            return levenshtein_distance(s2, s1)
+        if len(s2) == 0:
+            return len(s1)
+        previous_row = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1):
+            current_row = [i + 1]
+            for j, c2 in enumerate(s2):
+                insertions = previous_row[j + 1] + 1
+                deletions = current_row[j] + 1
+                substitutions = previous_row[j] + (c1 != c2)
+                current_row.append(min(insertions, deletions, substitutions))
+            previous_row = current_row
+        return previous_row[-1]
+
+    max_len = max(len(name1_base), len(name2_base))
+    distance = levenshtein_distance(name1_base, name2_base)
+    similarity = ((max_len - distance) / max_len) * 100
+    if name1_base in name2_base or name2_base in name1_base:
+        similarity = min(100, similarity + 10)
+    words1 = set(re.split(r'[\s\-_]+', name1_base))
+    words2 = set(re.split(r'[\s\-_]+', name2_base))
+    if words1 and words2:
+        common_words = words1.intersection(words2)
+        if common_words:
+            word_bonus = (len(common_words) / max(len(words1), len(words2))) * 15
+            similarity = min(100, similarity + word_bonus)
+    length_ratio = min(len(name1_base), len(name2_base)) / max(len(name1_base), len(name2_base))
+    if length_ratio < 0.5:
+        similarity *= 0.8
+    return int(max(0, min(100, similarity)))
+
+
+def benchmark(root_path, pairs=20000, threshold=90, seed=1):
+    """Gerçek dosya isimleriyle eski hesap vs bit-paralel hesap (sonuçlar birebir karşılaştırılır)
+
+    Rastgele çiftler çoğunlukla benzemez; komşu isimler (sıralı listede yan yana) benzer
+    çiftleri temsil eder - ikisi yarı yarıya karışık ölçülür.
+    """
+    import random
+    from dir_walker import DirWalker
+
+    names = sorted({entry.name for entry in DirWalker().walk(root_path)})
+    if len(names) < 2:
+        print("⚠️ Karşılaştırma için en az iki dosya gerekli")
+        return None
+    rng = random.Random(seed)
+    sample = []
+    for index in range(pairs):
+        if index % 2:
+            first = rng.randrange(len(names) - 1)
+            sample.append((names[first], names[first + 1]))
+        else:
+            sample.append((rng.choice(names), rng.choice(names)))
+
+    start = time.perf_counter()
+    expected = [_reference_similarity(name1, name2) for name1, name2 in sample]
+    reference_time = time.perf_counter() - start
+
+    name_parts.cache_clear()
+    start = time.perf_counter()
+    exact = [name_similarity(name1, name2) for name1, name2 in sample]
+    exact_time = time.perf_counter() - start
+
+    name_parts.cache_clear()
+    start = time.perf_counter()
+    bounded = [name_similarity(name1, name2, threshold) for name1, name2 in sample]
+    bounded_time = time.perf_counter() - start
+
+    same = exact == expected
+    same_bounded = all((value >= threshold) == (reference >= threshold) and (value < threshold or value == reference)
+                       for value, reference in zip(bounded, expected))
+    print(f"📂 {len(names)} isim, {len(sample)} çift (ort. {sum(map(len, names)) / len(names):.1f} karakter)")
+    print(f"🐢 Eski hesap            : {reference_time:.2f} sn ({len(sample) / reference_time:,.0f} çift/sn)")
+    print(f"🚀 Bit-paralel           : {exact_time:.2f} sn ({len(sample) / exact_time:,.0f} çift/sn)")
+    print(f"⚡ Bit-paralel, eşik %{threshold}: {bounded_time:.2f} sn ({len(sample) / bounded_time:,.0f} çift/sn)")
+    print(f"{'✅' if same else '❌'} Sonuçlar eski hesapla {'aynı' if same else 'FARKLI'}; "
+          f"eşikli sonuçlar {'tutarlı' if same_bounded else 'TUTARSIZ'}")
+    return reference_time, exact_time, bounded_time
+
+
+if __name__ == "__main__":
+    # Kullanım: python name_similarity.py <klasör> [--pairs 20000] [--threshold 90]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="İsim benzerliği hesabı karşılaştırması")
+    parser.add_argument('path', help="İsimleri kullanılacak klasör")
+    parser.add_argument('--pairs', type=int, default=20000, help="Karşılaştırılacak çift sayısı")
+    parser.add_argument('--threshold', type=int, default=90, help="Erken çıkış eşiği")
+    args = parser.parse_args()
+    if not os.path.isdir(args.path):
+        print(f"Klasör bulunamadı: {args.path}")
+        sys.exit(1)
+    benchmark(args.path, args.pairs, args.threshold)
@@ -0,0 +1,83 @@
+"""
+Progress Bus Module
+Worker thread'lerden gelen ilerleme bilgisini toplayan ve Tk tarafında sabit hızda uygulayan veri yolu
+"""
+
+import threading
+
+
+class ProgressBus:
+    """Thread-safe ilerleme veri yolu
+
+    Worker'lar publish() ile sadece son durumu yazar (kilit + birkaç atama).
+    Tk tarafı drain döngüsü saniyede 'fps' kez en son anlık görüntüyü
+    progress_var / status_var / zaman tahminine uygular; aradaki ara değerler atlanır.
+    """
+
+    def __init__(self, root, progress_var, status_var, time_callback=None, fps=20):
+        self.root = root
+        self.progress_var = progress_var
+        self.status_var = status_var
+        self.time_callback = time_callback
+        self.interval_ms = max(1, int(1000 / fps))
+
+        self.lock = threading.Lock()
+        self._progress = None
+        self._status = None
+        self._processed = None
+        self._total = None
+        self._dirty = False
+        self._after_id = None
+
+    def publish(self, progress=None, status=None, processed=None, total=None):
+        """Son durumu yaz - herhangi bir thread'den çağrılabilir"""
+        with self.lock:
+            if progress is not None:
+                self._progress = progress
+                self._processed = processed
+                self._total = total
+            if status is not None:
+                self._status = status
+            self._dirty = True
+
+    def start(self):
+        """Drain döngüsünü başlat (ana thread)"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Drain döngüsünü durdur (ana thread)"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def flush(self):
+        """Bekleyen durumu hemen uygula (ana thread)
+
+        İşlem sonu UI güncellemelerinden önce çağrılır ki eski bir anlık görüntü
+        sonradan '%100' veya son durum mesajının üzerine yazılmasın.
+        """
+        with self.lock:
+            if not self._dirty:
+                return
+            progress, status = self._progress, self._status
+            processed, total = self._processed, self._total
+            self._progress = self._status = self._processed = self._total = None
+            self._dirty = False
+
+        try:
+            if progress is not None:
+                self.progress_var.set(progress)
+                if self.time_callback:
+                    self.time_callback(progress, processed, total)
+            if status is not None:
+                self.status_var.set(status)
+        except Exception as e:
+            print(f"⚠️ İlerleme güncelleme hatası: {e}")
+
+    def _drain(self):
+        self.flush()
+        self._after_id = self.root.after(self.interval_ms, self._drain)
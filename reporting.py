@@ -11,6 +11,8 @@ import time
 from pathlib import Path
 from collections import defaultdict
 from lang_manager import lang_manager
+from file_records import FileRecordStore
+from target_index import TargetIndex
 
 class ReportingManager:
     def __init__(self, gui_manager, file_operations, scan_engine):
@@ -63,10 +65,10 @@ class ReportingManager:
         target_path = self.gui.target_var.get()
         
         # Hedef diskteki mevcut dosyaları tara
-        existing_files = self._scan_target_files(target_path)
+        target_index = self._scan_target_files(target_path)
         
         # Kaynak dosyalarla karşılaştır
-        self._compare_source_target(existing_files)
+        self._compare_source_target(target_index)
         
         # Disk alanı analizi
         self._analyze_disk_space(target_path)
@@ -75,71 +77,70 @@ class ReportingManager:
         self._analyze_by_categories()
     
     def _scan_target_files(self, target_path):
-        """Hedef diskteki dosyaları tara"""
-        existing_files = {}
+        """Hedef diskteki dosyaları içerik indeksine al (önceki analizden kalan parmak izleri korunur)"""
+        # Gizli dosyalar için stat yapılmaz, indeks dosyası da gizli olduğundan taranmaz
+        target_index = TargetIndex(target_path)
+        self.gui.progress_bus.publish(25)
         
         try:
-            for root, dirs, files in os.walk(target_path):
-                # Progress güncelle
-                self.gui.root.after(0, lambda: self.gui.progress_var.set(25))
-                
-                for i, file in enumerate(files):
-                    if self.file_ops.is_hidden_file(file):
-                        continue
-                    
-                    file_path = os.path.join(root, file)
-                    try:
-                        stat = os.stat(file_path)
-                        file_key = f"{file}_{stat.st_size}"  # İsim + boyut
-                        existing_files[file_key] = {
-                            'path': file_path,
-                            'name': file,
-                            'size': stat.st_size,
-                            'relative_path': os.path.relpath(file_path, target_path)
-                        }
-                    except:
-                        continue
-                    
-                    # Time estimation güncelle
-                    self.gui.root.after(0, lambda p=25 + (i + 1) / len(files) * 50, processed=i+1, total=len(files): 
-                                       self.gui.update_time_estimation(p, processed, total))
-        except:
-            pass
-        
-        return existing_files
+            target_index.refresh(dir_filter=self.file_ops.ignore_rules.dir_filter,
+                                 file_filter=self.file_ops.ignore_rules.file_filter)
+        except Exception as e:
+            print(f"⚠️ Hedef indeksi oluşturulamadı: {e}")
+        
+        return target_index
     
-    def _compare_source_target(self, existing_files):
-        """Kaynak ve hedef dosyaları karşılaştır"""
+    def _compare_source_target(self, target_index):
+        """Kaynak ve hedef dosyaları içerik (hash) ile karşılaştır - isim/boyut tek başına yetmez"""
         self.target_analysis = {
             'files_to_copy': [],
             'files_existing': [],
             'new_files': 0,
             'existing_files': 0,
             'total_copy_size': 0,
-            'existing_size': 0
+            'existing_size': 0,
+            'renamed_size': 0
         }
         
-        total_files = len(self.scan_engine.unique_files)
+        # Canlı izleme listeyi değiştirebilir - karşılaştırma anlık görüntü üzerinde yapılır
+        with self.scan_engine._watch_lock:
+            unique_files = list(self.scan_engine.unique_files)
+        total_files = len(unique_files)
+        
+        def on_progress(done, total, read_bytes, speed):
+            # İçerik karşılaştırması %25-65 arası
+            self.gui.progress_bus.publish(25 + done / max(total, 1) * 40)
+        
+        # İsmi değişmiş kopyalar da bulunur, aynı isimli farklı içerikler atlanmaz
+        try:
+            matches = target_index.find_many(unique_files, on_progress)
+            print(target_index.get_stats_text())
+        except Exception as e:
+            print(f"⚠️ Hedef içerik karşılaştırma hatası: {e}")
+            matches = {}
+        finally:
+            target_index.close()
+        record_store = FileRecordStore()
         
-        for i, file_info in enumerate(self.scan_engine.unique_files):
+        for i, file_info in enumerate(unique_files):
             # Progress güncelle
-            progress = 25 + (i + 1) / total_files * 50  # %25-75 arası
-            self.gui.root.after(0, lambda p=progress: self.gui.progress_var.set(p))
+            progress = 65 + (i + 1) / total_files * 10  # %65-75 arası
+            self.gui.progress_bus.publish(progress, processed=i + 1, total=total_files)
             
-            # Time estimation güncelle
-            self.gui.root.after(0, lambda p=progress, processed=i+1, total=total_files: 
-                               self.gui.update_time_estimation(p, processed, total))
+            rel_path = matches.get(file_info['path'])
             
-            file_key = f"{file_info['name']}_{file_info['size']}"
-            
-            if file_key in existing_files:
-                # Dosya zaten mevcut
+            if rel_path is not None:
+                # İçerik hedefte zaten mevcut
+                size, mtime_ns, inode = target_index.files[rel_path][:3]
                 self.target_analysis['files_existing'].append({
                     'source': file_info,
-                    'target': existing_files[file_key]
+                    'target': record_store.create(target_index.target_path_of(rel_path), size, mtime_ns, inode)
                 })
                 self.target_analysis['existing_files'] += 1
                 self.target_analysis['existing_size'] += file_info['size']
+                if os.path.basename(rel_path) != file_info['name']:
+                    # Eski isim + boyut karşılaştırmasının kaçıracağı (ismi değişmiş) kopyalar
+                    self.target_analysis['renamed_size'] += file_info['size']
             else:
                 # Dosya kopyalanacak
                 self.target_analysis['files_to_copy'].append(file_info)
@@ -203,7 +204,7 @@ class ReportingManager:
             self.category_analysis[category]['files_existing'].append(existing_info)
         
         # Progress tamamla
-        self.gui.root.after(0, lambda: self.gui.progress_var.set(100))
+        self.gui.progress_bus.publish(100)
     
     def _show_analysis_results(self):
         """Analiz sonuçlarını göster"""
@@ -220,8 +221,9 @@ class ReportingManager:
         text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=('Consolas', 10))
         text_widget.pack(fill=tk.BOTH, expand=True)
         
-        # Rapor içeriği
-        report_content = self._generate_analysis_report()
+        # Rapor içeriği (izleyici thread'i tarama sonuçlarını değiştirirken okunmasın)
+        with self.scan_engine._watch_lock:
+            report_content = self._generate_analysis_report()
         text_widget.insert(tk.END, report_content)
         text_widget.config(state=tk.DISABLED)
         
@@ -260,7 +262,8 @@ class ReportingManager:
         report += f"{lang_manager.get_text('reports.analysis.size_info')}\n"
         report += "-" * 30 + "\n"
         report += f"{lang_manager.get_text('reports.analysis.total_copy_size')}: {self._format_size(self.target_analysis['total_copy_size'])}\n"
-        report += f"{lang_manager.get_text('reports.analysis.existing_size')}: {self._format_size(self.target_analysis['existing_size'])}\n\n"
+        report += f"{lang_manager.get_text('reports.analysis.existing_size')}: {self._format_size(self.target_analysis['existing_size'])}\n"
+        report += f"{lang_manager.get_text('reports.analysis.renamed_copies')}: {self._format_size(self.target_analysis['renamed_size'])}\n\n"
         
         # Disk alanı analizi
         if 'error' not in self.disk_analysis:
@@ -382,7 +385,8 @@ class ReportingManager:
         text_widget.pack(fill=tk.BOTH, expand=True)
         
         # Duplikat raporu oluştur
-        dup_report = self._generate_duplicate_report()
+        with self.scan_engine._watch_lock:
+            dup_report = self._generate_duplicate_report()
         text_widget.insert(tk.END, dup_report)
         text_widget.config(state=tk.DISABLED)
         
@@ -442,28 +446,30 @@ class ReportingManager:
             messagebox.showwarning("Uyarı", "Önce dosyaları tarayın!")
             return
         
-        report = "📂 ORGANİZASYON RAPORU\n"
-        report += "=" * 30 + "\n\n"
-        
-        # Özet
-        total_files = sum(len(files) for subfolders in self.scan_engine.organization_structure.values() 
-                         for files in subfolders.values())
-        total_size = sum(sum(f['size'] for f in files) for subfolders in self.scan_engine.organization_structure.values() 
-                        for files in subfolders.values())
-        
-        report += f"Toplam dosya: {total_files}\n"
-        report += f"Toplam boyut: {self._format_size(total_size)}\n"
-        report += f"Kategori sayısı: {len(self.scan_engine.organization_structure)}\n\n"
-        
-        # Detaylar
-        for main_folder, subfolders in self.scan_engine.organization_structure.items():
-            folder_files = sum(len(files) for files in subfolders.values())
-            folder_size = sum(sum(f['size'] for f in files) for files in subfolders.values())
+        # İzleyici thread'i yapıyı değiştirirken okunmasın
+        with self.scan_engine._watch_lock:
+            report = "📂 ORGANİZASYON RAPORU\n"
+            report += "=" * 30 + "\n\n"
+        
+            # Özet
+            total_files = sum(len(files) for subfolders in self.scan_engine.organization_structure.values() 
+                             for files in subfolders.values())
+            total_size = sum(sum(f['size'] for f in files) for subfolders in self.scan_engine.organization_structure.values() 
+                            for files in subfolders.values())
+        
+            report += f"Toplam dosya: {total_files}\n"
+            report += f"Toplam boyut: {self._format_size(total_size)}\n"
+            report += f"Kategori sayısı: {len(self.scan_engine.organization_structure)}\n\n"
+        
+            # Detaylar
+            for main_folder, subfolders in self.scan_engine.organization_structure.items():
+                folder_files = sum(len(files) for files in subfolders.values())
+                folder_size = sum(sum(f['size'] for f in files) for files in subfolders.values())
             
-            report += f"📁 {main_folder}/ ({folder_files} dosya, {self._format_size(folder_size)})\n"
+                report += f"📁 {main_folder}/ ({folder_files} dosya, {self._format_size(folder_size)})\n"
             
-            for subfolder, files in subfolders.items():
-                subfolder_size = sum(f['size'] for f in files)
-                report += f"  📂 {subfolder}/ ({len(files)} dosya, {self._format_size(subfolder_size)})\n"
+                for subfolder, files in subfolders.items():
+                    subfolder_size = sum(f['size'] for f in files)
+                    report += f"  📂 {subfolder}/ ({len(files)} dosya, {self._format_size(subfolder_size)})\n"
         
         return report 
\ No newline at end of file
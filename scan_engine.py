@@ -4,15 +4,27 @@ Dosya tarama, duplikat tespiti ve organizasyon algoritmalarını içerir
 """
 
 import os
-import hashlib
+import math
 import threading
+import queue
 import time
 import traceback
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, Counter
 import tkinter as tk
 from tkinter import messagebox
 from lang_manager import lang_manager
+from scan_index import ScanIndex
+from dir_walker import DirWalker
+from file_records import FileRecordStore
+from folder_aggregates import FolderAggregates
+from ignore_rules import get_ignore_rules
+from scan_watcher import ScanWatcher
+from spill_store import SpillSession, duplicate_memberships, RECORD_BYTES
+from content_hasher import StagedHasher, get_hashing_service, is_current_hash
+from hash_cache import get_hash_cache
+from name_similarity import name_similarity, normalize_filename
+from video_probe import video_dimensions
 
 class ScanEngine:
     def __init__(self, gui_manager, file_operations):
@@ -42,6 +54,44 @@ class ScanEngine:
         self.scan_thread = None
         self.stop_scanning = False
         
+        # Kalıcı artımlı tarama indeksi (hedef klasörde, learned_categories.json yanında)
+        self.scan_index = None
+        
+        # Kompakt dosya kayıtları (klasör yolları ve uzantılar paylaşılır)
+        self.record_store = FileRecordStore()
+        
+        # Paylaşılan yok sayma kuralları (FileOperations ve diğer tarayıcılarla aynı nesne)
+        self.ignore_rules = get_ignore_rules()
+        
+        # "none" modunda klasör boyutları (gizli dosya/klasörler hariç)
+        self.folder_aggregates = FolderAggregates(dir_filter=self.ignore_rules.dir_filter,
+                                                  file_filter=self.ignore_rules.file_filter)
+        
+        # Tarama sonrası canlı izleme (değişiklikler yeniden taramadan uygulanır)
+        self.scan_watcher = None
+        self._scan_mode = None
+        self._watch_index = None
+        self._record_keys = None
+        # İzleyici thread'i sonuçları bu kilit altında değiştirir; önizleme, plan kaydı ve
+        # analiz de bu kilitle okur (aynı thread'de iç içe alınabilir)
+        self._watch_lock = threading.RLock()
+        
+        # Yüklenen tarama planı (organizasyondan önce stat ile doğrulanır)
+        self.loaded_plan = None
+        
+        # Bellek bütçesi aşılınca kayıtların ve gruplama anahtarlarının taştığı geçici disk alanı
+        self.spill_session = None
+        self._spill_keys = None
+        
+        # Hash kontrolünde aşamalı tespit: boyut kovaları (tarama sonunda sadece çakışanlar okunur)
+        self._hash_buckets = None
+        self._staged_keys = None
+        # Canlı izleme: aşamalı taramada tam hash'i alınmamış grup anahtarları (kova -> anahtarlar)
+        self._unhashed_keys = None
+        # Son taramanın hash önbelleği isabet/kaçırma sayıları (tarama özetinde gösterilir)
+        self.hash_cache_stats = None
+        self._hash_cache_snapshot = None
+        
     def scan_files(self):
         """Ana tarama fonksiyonu"""
 
@@ -55,26 +105,15 @@ class ScanEngine:
                                  lang_manager.get_text('warnings.select_target_first'))
             return
         
-        # Hash kontrolü uyarısı
-        if self.gui.duplicate_check_hash.get():
-            result = messagebox.askyesno(
-                "⚠️ Hash Kontrolü Uyarısı",
-                "Hash kontrolü aktif! Bu işlem çok yavaş olabilir, özellikle büyük dosyalar için.\n\n"
-                "• Küçük dosyalar: Hızlı\n"
-                "• Büyük dosyalar (>100MB): Çok yavaş\n"
-                "• Video/resim dosyaları: Çok yavaş\n\n"
-                "Devam etmek istiyor musunuz?\n\n"
-                "💡 İpucu: Sadece dosya adı + boyut kontrolü genellikle yeterlidir.",
-                icon='warning'
-            )
-            if not result:
-                return
-            
         # Progress bar'ı göster
         self.gui.progress_var.set(0)
         if hasattr(self.gui, 'progress_label'):
             self.gui.progress_label.config(text=lang_manager.get_text('messages.starting_scan'))
         
+        # Önceki taramanın izlemesi yeni sonuçlara karışmasın
+        self.stop_watch()
+        self.loaded_plan = None
+        
         # Thread'de tarama başlat
         self.scan_thread = threading.Thread(target=self._scan_thread)
         self.scan_thread.daemon = True
@@ -89,23 +128,32 @@ class ScanEngine:
             # Time estimation başlat
             self.gui.root.after(0, lambda: self.gui.start_time_estimation())
             
-            # Dosyaları tara
-            self._scan_source_files(self.file_ops.source_path, self.gui.scan_mode.get())
+            # Dosyaları tara - keşif, duplikat gruplama ve kategori ataması tek akışta
+            self._scan_mode = self.gui.scan_mode.get()
+            self._scan_source_files(self.file_ops.source_path, self._scan_mode)
             
             if not self.stop_scanning:
-                # Duplikatları tespit et
-                self._detect_duplicates()
+                # Muhtemel duplikatlar tüm unique dosyalar bilindiğinde hesaplanır
+                self._finish_duplicate_detection()
+                
+                # Hesaplanan hash/media boyutlarını indekse yaz
+                self._store_index_media_info()
                 
-                # Organizasyon yapısını oluştur
-                self._create_organization_structure()
+                # Organizasyon yapısını tamamla
+                self._finish_organization_structure()
                 
                 # Sonuçları güncelle
-                self._update_scan_results()
+                self.gui.root.after(0, self._update_scan_results)
+            
+            # Durdurulan taramalarda da indeksi kapat
+            self._close_scan_index()
                 
             # Time estimation durdur
             self.gui.root.after(0, lambda: self.gui.stop_time_estimation())
             
         except Exception as e:
+            self._close_scan_index()
+            
             # Time estimation durdur (hata durumunda da)
             self.gui.root.after(0, lambda: self.gui.stop_time_estimation())
             
@@ -114,12 +162,20 @@ class ScanEngine:
                 self.gui.root.after(0, lambda: self.main_app._reset_buttons_after_operation())
             
             error_msg = f"Tarama hatası: {str(e)}"
-            self.gui.root.after(0, lambda: self.gui.status_var.set(error_msg))
+            self.gui.progress_bus.publish(status=error_msg)
             self.gui.root.after(0, lambda: messagebox.showerror("Hata", error_msg))
     
     def _scan_source_files(self, source_path, scan_mode):
-        """Kaynak dosyaları tara"""
-        self.all_scanned_files = []
+        """Kaynak dosyaları tara - akış hattı (keşif → duplikat gruplama → kategori)
+        
+        Keşif ayrı bir thread'de sınırlı bir kuyruğu besler; her kayıt bulunduğu anda
+        duplikat grubuna ve kategorisine atanır, önizleme ağaçları periyodik olarak yenilenir.
+        """
+        self.record_store.clear()
+        
+        # Bellek bütçesi verildiyse listeler bütçe aşılınca diske taşar
+        self._open_spill_session()
+        self.all_scanned_files = self._new_file_list()
         self.stats = {
             'total_files': 0,
             'unique_files': 0,
@@ -128,197 +184,364 @@ class ScanEngine:
             'categories': defaultdict(int)
         }
         
-        # Dosyaları topla
-        files_to_scan = []
+        self._prepare_duplicate_detection()
+        self._prepare_organization_structure()
         
-        if scan_mode == "all":
-            # Tüm alt klasörleri tara (dosyaları kategorilere ayır)
-            for root, dirs, files in os.walk(source_path):
-                if self.stop_scanning:
-                    return
-                
-                # Gizli klasörleri atla
-                dirs[:] = [d for d in dirs if not self._is_hidden_folder(d)]
-                
-                for file in files:
-                    if not self._is_hidden_file(file):
-                        file_path = os.path.join(root, file)
-                        files_to_scan.append(file_path)
-                        
-        elif scan_mode == "none":
-            # Ana klasördeki dosyaları ve klasörleri tara (alt klasörler komple kopyalanacak)
-            try:
-                for item in os.listdir(source_path):
-                    if self.stop_scanning:
-                        return
-                    
-                    item_path = os.path.join(source_path, item)
-                    
-                    if os.path.isfile(item_path) and not self._is_hidden_file(item):
-                        # Normal dosyalar
-                        files_to_scan.append(item_path)
-                    elif os.path.isdir(item_path) and not self._is_hidden_folder(item):
-                        # Alt klasörler - komple klasör olarak işaretle
-                        folder_info = {
-                            'path': item_path,
-                            'name': item,
-                            'is_folder': True,
-                            'size': self._get_folder_size(item_path),
-                            'modified': os.path.getmtime(item_path),
-                            'extension': 'folder',
-                            'hash': None
-                        }
-                        self.all_scanned_files.append(folder_info)
-                        self.stats['total_files'] += 1
-                        self.stats['total_size'] += folder_info['size']
-                        self.stats['categories']['Yazılım Paketleri'] += 1
-                        
-            except PermissionError:
-                pass
-                
-        elif scan_mode == "files_only":
-            # Sadece ana klasördeki dosyaları tara (alt klasörleri görmezden gel)
-            try:
-                for item in os.listdir(source_path):
-                    if self.stop_scanning:
-                        return
-                    
-                    item_path = os.path.join(source_path, item)
-                    
-                    # Sadece dosyaları ekle, klasörleri görmezden gel
-                    if os.path.isfile(item_path) and not self._is_hidden_file(item):
-                        files_to_scan.append(item_path)
-                        
-            except PermissionError:
-                pass
+        # Aşama 1: keşif (üretici thread)
+        file_queue = queue.Queue(maxsize=5000)
+        discovered = [0]
+        producer = threading.Thread(target=self._discover_files,
+                                    args=(source_path, scan_mode, file_queue, discovered))
+        producer.daemon = True
+        producer.start()
         
-        # Dosyaları işle
-        total_files = len(files_to_scan)
+        from lang_manager import t
+        processed = 0
+        last_refresh = time.time()
         
-        for i, file_path in enumerate(files_to_scan):
+        while True:
             if self.stop_scanning:
                 return
+            try:
+                file_info = file_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if file_info is None:
+                break
             
             try:
-                # Dosya bilgilerini al
-                file_info = self._get_file_info(file_path)
-                if file_info:
-                    self.all_scanned_files.append(file_info)
-                    self.stats['total_files'] += 1
-                    self.stats['total_size'] += file_info['size']
-                    
-                    # Kategori istatistiği
-                    category, _ = self.file_ops.get_file_category(file_path)
-                    self.stats['categories'][category] += 1
-                
-                # Progress güncelle
-                progress = (i + 1) / total_files * 50  # İlk %50
-                self.gui.root.after(0, lambda p=progress: self.gui.progress_var.set(p))
-                
-                # Time estimation güncelle
-                self.gui.root.after(0, lambda p=progress, processed=i+1, total=total_files: 
-                                   self.gui.update_time_estimation(p, processed, total))
+                # Önce işlenir, sonra eklenir: SpillList diske taşarsa sonraki değişiklikler kaybolur
+                self._ingest_file(file_info)
+            except Exception as e:
+                # Kategori/anahtar hesaplanamadı - kayıt hiçbir yapıya girmedi, listeye de eklenmez
+                print(f"Dosya işlenirken hata: {file_info.get('path')} - {e}")
+            else:
+                self.all_scanned_files.append(file_info)
+            
+            processed += 1
+            
+            # Progress: işlenen / şu ana kadar keşfedilen (%0-80) - UI'ye progress bus ile 20 Hz'de yansır
+            total_found = max(discovered[0], processed)
+            self.gui.progress_bus.publish(processed / total_found * 80,
+                                          status=f"{t('messages.scanning')}: {processed}/{total_found}",
+                                          processed=processed, total=total_found)
+            
+            # Önizleme ve duplikat ağaçlarını kademeli doldur
+            if time.time() - last_refresh >= 1.0:
+                self._schedule_live_refresh()
+                last_refresh = time.time()
+            
+            # UI donmasını önle
+            if processed % 100 == 0:
+                time.sleep(0.001)
+        
+        self.gui.progress_bus.publish(80)
+    
+    def _stat_category(self, file_info):
+        """İstatistiklerde kullanılan kategori adı"""
+        if file_info.get('is_folder', False):
+            return 'Yazılım Paketleri'
+        category, _ = self.file_ops.get_file_category(file_info['path'])
+        return category
+    
+    def _ingest_file(self, file_info):
+        """Kaydı istatistiklere, duplikat gruplarına ve organizasyon yapısına ekle
+        
+        Kategori ve ertelenen gruplama anahtarı önce hesaplanır; bunlar hata verirse kayıt
+        hiçbir yapıya girmez ve hata çağırana iletilir (kayıt all_scanned_files'a eklenmemeli).
+        """
+        category = self._stat_category(file_info)
+        key = None
+        if self._spill_keys is not None or self._hash_buckets is not None:
+            key = self._duplicate_key(file_info, staged=self._hash_buckets is not None or self._dup_checks['hash'])
+        
+        self.stats['total_files'] += 1
+        self.stats['total_size'] += file_info['size']
+        self.stats['categories'][category] += 1
+        
+        if self._spill_keys is not None:
+            # Bellek bütçeli tarama: gruplama ve kategori ataması tarama sonunda dış birleştirme ile
+            seq = len(self.all_scanned_files)
+            if self._dup_checks['hash']:
+                self._spill_keys.add((key, seq, file_info['path'], file_info['size']),
+                                     len(key) + len(file_info['path']))
+            else:
+                self._spill_keys.add((key, seq), len(key))
+            return
+        
+        if self._hash_buckets is not None:
+            # Hash kontrolü: önce boyut kovası, içerik tarama sonunda aşamalı olarak okunur
+            self._staged_keys.append((file_info, key))
+            self._hash_buckets[key].append(file_info)
+            return
+        
+        # Aşama 2: duplikat gruplama, Aşama 3: kategori ataması
+        # Yerleştirme hatası kaydı düşürmez (istatistiklere sayıldı, listede kalır)
+        try:
+            if self._assign_duplicate_group(file_info):
+                self._add_duplicate_to_structure(file_info)
+            else:
+                self._categorize_file(file_info)
+        except Exception as e:
+            print(f"Dosya işlenirken hata: {file_info.get('path')} - {e}")
+    
+    def _discover_files(self, source_path, scan_mode, file_queue, discovered):
+        """Keşif aşaması - bulunan dosya kayıtlarını kuyruğa yaz (kayıtlar DirEntry'den hazır gelir)"""
+        def emit(file_info):
+            # Tüketici durduysa bloklanmamak için zaman aşımlı ekle
+            while not self.stop_scanning:
+                try:
+                    file_queue.put(file_info, timeout=0.1)
+                    discovered[0] += 1
+                    return
+                except queue.Full:
+                    continue
+        
+        walker = DirWalker(dir_filter=self.ignore_rules.dir_filter,
+                           file_filter=self.ignore_rules.file_filter,
+                           should_stop=lambda: self.stop_scanning)
+        
+        try:
+            if scan_mode == "all" and self._open_scan_index():
+                # Artımlı tarama: mtime'ı değişmemiş dizinler indeksten okunur
+                for file_info in self.scan_index.scan(source_path, self.ignore_rules.is_hidden_folder,
+                                                      self.ignore_rules.is_hidden_file,
+                                                      should_stop=lambda: self.stop_scanning,
+                                                      rules_fingerprint=self.ignore_rules.fingerprint()):
+                    emit(file_info)
+                if not self.stop_scanning:
+                    print(self.scan_index.get_stats_text())
                 
-                # Status güncelle
-                if i % 50 == 0:
-                    from lang_manager import t
-                    self.gui.root.after(0, lambda: self.gui.status_var.set(f"{t('messages.scanning')}: {i+1}/{total_files}"))
+            elif scan_mode == "all":
+                # Tüm alt klasörleri tara (dosyaları kategorilere ayır, gizli klasörler budanır)
+                for entry in walker.walk_parallel(source_path, self._get_scan_workers()):
+                    emit(self._file_info_from_entry(entry))
+                        
+            elif scan_mode == "none":
+                # Ana klasördeki dosyaları ve klasörleri tara (alt klasörler komple kopyalanacak)
+                # Tüm alt klasör boyutları tek post-order geçişte (üst seviye klasörler paralel) hesaplanır
+                self.folder_aggregates.invalidate()
+                self.folder_aggregates.compute(source_path)
                 
-                # UI donmasını önle
-                if i % 100 == 0:
-                    time.sleep(0.001)
+                for entry in walker.walk(source_path, recursive=False, include_dirs=True):
+                    if not entry.is_dir:
+                        # Normal dosyalar
+                        emit(self._file_info_from_entry(entry))
+                        continue
                     
-            except Exception as e:
-                print(f"Dosya işlenirken hata: {file_path} - {e}")
-                continue
+                    # Alt klasörler - komple klasör olarak işaretle
+                    emit(self.record_store.create(entry.path, self._get_folder_size(entry.path),
+                                                  entry.mtime_ns, entry.inode, is_folder=True))
+                    
+            elif scan_mode == "files_only":
+                # Sadece ana klasördeki dosyaları tara (alt klasörleri görmezden gel)
+                for entry in walker.walk(source_path, recursive=False):
+                    emit(self._file_info_from_entry(entry))
+                    
+        except Exception as e:
+            print(f"❌ Dosya keşif hatası: {e}")
+        finally:
+            # Akış sonu işareti
+            while not self.stop_scanning:
+                try:
+                    file_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+    
+    def _file_info_from_entry(self, entry):
+        """DirWalker kaydından dosya bilgisi oluştur (stat zaten yapılmış, hash lazy loading)"""
+        return self.record_store.from_entry(entry)
     
     def _get_file_info(self, file_path):
         """Dosya bilgilerini al"""
         try:
             stat = os.stat(file_path)
-            
-            file_info = {
-                'path': file_path,
-                'name': os.path.basename(file_path),
-                'size': stat.st_size,
-                'modified': stat.st_mtime,
-                'extension': Path(file_path).suffix.lower(),
-                'hash': None,  # Lazy loading
-                'is_folder': False
-            }
-            
-            return file_info
+            return self.record_store.create(file_path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
             
         except (OSError, PermissionError):
             return None
     
+    def _open_scan_index(self):
+        """Tarama indeksini aç - hedef klasör yoksa veya kapalıysa False"""
+        use_index = getattr(self.gui, 'use_scan_index', None)
+        if use_index is not None and not use_index.get():
+            return False
+        
+        target_path = self.file_ops.target_path
+        if not target_path or not os.path.isdir(target_path):
+            return False
+        
+        try:
+            if self.scan_index and self.scan_index.index_dir != target_path:
+                self._close_scan_index()
+            if not self.scan_index:
+                self.scan_index = ScanIndex(target_path, self.record_store)
+            self.scan_index.open()
+            return True
+        except Exception as e:
+            print(f"⚠️ Tarama indeksi açılamadı, normal taramaya geçiliyor: {e}")
+            self.scan_index = None
+            return False
+    
+    def _close_scan_index(self):
+        """Tarama indeksini kapat"""
+        if self.scan_index:
+            try:
+                self.scan_index.close()
+            except Exception as e:
+                print(f"⚠️ Tarama indeksi kapatılamadı: {e}")
+    
+    def _store_index_media_info(self):
+        """Duplikat tespitinde hesaplanan hash/boyutları indekse kaydet"""
+        if not self.scan_index or not self.scan_index.conn:
+            return
+        try:
+            stored = self.scan_index.store_media_info(self.all_scanned_files)
+            if stored:
+                print(f"📇 {stored} dosyanın hash/boyut bilgisi indekse kaydedildi")
+        except Exception as e:
+            print(f"⚠️ İndeks güncelleme hatası: {e}")
+        finally:
+            self._close_scan_index()
+    
     def _get_folder_size(self, folder_path):
-        """Klasör boyutunu hesapla"""
-        total_size = 0
+        """Klasör boyutunu hesapla (gizli dosya/klasörler hariç, önbellekli)"""
+        return self.folder_aggregates.get(folder_path).size
+    
+    def _get_memory_budget_mb(self):
+        """Tarama seçeneklerindeki bellek bütçesi (MB, 0 = sınırsız)"""
         try:
-            for root, dirs, files in os.walk(folder_path):
-                # Gizli klasörleri atla
-                dirs[:] = [d for d in dirs if not self._is_hidden_folder(d)]
-                
-                for file in files:
-                    if not self._is_hidden_file(file):
-                        try:
-                            file_path = os.path.join(root, file)
-                            total_size += os.path.getsize(file_path)
-                        except (OSError, PermissionError):
-                            continue
-        except (OSError, PermissionError):
-            pass
-        
-        return total_size
+            return max(0, int(self.gui.memory_budget.get()))
+        except (AttributeError, ValueError, tk.TclError):
+            return 0
+    
+    def _open_spill_session(self):
+        """Önceki taramanın geçici dosyalarını sil, bütçe verildiyse yeni oturum aç"""
+        self._close_spill_session()
+        budget_mb = self._get_memory_budget_mb()
+        if budget_mb:
+            self.spill_session = SpillSession(budget_mb * 1024 * 1024)
+            self._spill_keys = self.spill_session.new_sorter()
+            print(f"🧠 Bellek bütçesi: {budget_mb} MB - aşılırsa kayıtlar {self.spill_session.directory} klasörüne taşar")
+    
+    def _close_spill_session(self):
+        if self.spill_session:
+            self.spill_session.close()
+        self.spill_session = None
+        self._spill_keys = None
+    
+    def _new_file_list(self):
+        """Kayıt listesi - bellek bütçeli taramada diske taşabilen SpillList"""
+        return self.spill_session.new_list() if self.spill_session else []
+    
+    def _resolve_spilled_groups(self):
+        """Bellek bütçeli tarama: anahtarları dış birleştirmeyle grupla, kayıtları yerleştir
+        
+        Kayıtlar keşif sırasıyla tekrar okunur; grup üyelikleri de sıra numarasına göre
+        sıralı geldiğinden iki akış birlikte ilerler. Her grubun en küçük sıralı üyesi orijinaldir -
+        sonuç bellek içi akıştaki _assign_duplicate_group ile aynıdır. Aşamalı hash'te hesaplanan
+        hash'ler de sıra numarasıyla kayıtlara yazılır ve kayıt listesi yeniden oluşturulur
+        (diske taşmış kayıtlar okunurken yeni nesnedir - yerinde değiştirmek kalıcı olmaz).
+        """
+        from lang_manager import t
+        self.gui.progress_bus.publish(status=t('messages.merging_spilled'))
+        
+        hashes = None
+        if self._dup_checks['hash']:
+            self._spill_keys, hashes = self._stage_spilled_keys(self._spill_keys)
+        memberships = duplicate_memberships(self.spill_session, self._spill_keys)
+        self._spill_keys = None
+        group_members = self.spill_session.new_sorter(RECORD_BYTES)
+        membership = next(memberships, None)
+        hash_items = hashes.sorted_items() if hashes is not None else iter(())
+        next_hash = next(hash_items, None)
+        records = self._new_file_list() if hashes is not None else None
+        
+        for seq, file_info in enumerate(self.all_scanned_files):
+            if self.stop_scanning:
+                return
+            if next_hash is not None and next_hash[0] == seq:
+                file_info['hash'] = next_hash[1]
+                next_hash = next(hash_items, None)
+            if records is not None:
+                records.append(file_info)
+            rank = None
+            if membership is not None and membership[0] == seq:
+                _, group_id, rank = membership
+                membership = next(memberships, None)
+            
+            try:
+                if not rank:
+                    self.unique_files.append(file_info)
+                    self._categorize_file(file_info)
+                else:
+                    self.duplicate_files.append(file_info)
+                    self._add_duplicate_to_structure(file_info)
+                if rank is not None:
+                    group_members.add((group_id, rank, file_info))
+            except Exception as e:
+                print(f"Dosya işlenirken hata: {file_info.get('path')} - {e}")
+        
+        # Gruplar ikinci üyenin sırasıyla - bellek içi akışta source_duplicates'e eklenme sırası
+        group, current_id = [], None
+        for group_id, _, file_info in group_members.sorted_items():
+            if group_id != current_id and group:
+                self.source_duplicates.append(group, RECORD_BYTES * len(group))
+                group = []
+            current_id = group_id
+            group.append(file_info)
+        if group:
+            self.source_duplicates.append(group, RECORD_BYTES * len(group))
+        if records is not None:
+            self.all_scanned_files = records
+        
+        print(self.spill_session.get_stats_text())
+    
+    def _get_scan_workers(self):
+        """Tarama seçeneklerindeki paralel worker sayısı (1 = sıralı)"""
+        try:
+            return max(1, min(32, int(self.gui.scan_workers.get())))
+        except (AttributeError, ValueError, tk.TclError):
+            return 1
     
     def _is_hidden_file(self, filename):
         """Gizli dosya kontrolü"""
-        # Windows gizli dosyaları
-        if filename.startswith('.'):
-            return True
-        
-        # Sistem dosyaları
-        system_files = [
-            'thumbs.db', 'desktop.ini', 'folder.jpg', 'folder.png',
-            'albumartsmall.jpg', 'albumart_{', '.ds_store',
-            'system volume information', '$recycle.bin', 'recycler'
-        ]
-        
-        if filename.lower() in system_files:
-            return True
-        
-        # Geçici dosyalar
-        temp_extensions = ['.tmp', '.temp', '.bak', '.old', '.cache', '.log']
-        if any(filename.lower().endswith(ext) for ext in temp_extensions):
-            return True
-        
-        return False
+        return self.ignore_rules.is_hidden_file(filename)
     
     def _is_hidden_folder(self, foldername):
         """Gizli klasör kontrolü"""
-        if foldername.startswith('.'):
-            return True
-        
-        hidden_folders = [
-            'system volume information', '$recycle.bin', 'recycler',
-            '__pycache__', '.git', '.svn', 'node_modules'
-        ]
-        
-        return foldername.lower() in hidden_folders
+        return self.ignore_rules.is_hidden_folder(foldername)
     
-    def _detect_duplicates(self):
-        """Duplikat dosyaları tespit et"""
-        self.duplicate_files = []
-        self.unique_files = []
-        self.source_duplicates = []
+    def _prepare_duplicate_detection(self):
+        """Akış için duplikat tespit durumunu sıfırla ve kontrol seçeneklerini oku"""
+        self.duplicate_files = self._new_file_list()
+        self.unique_files = self._new_file_list()
+        self.source_duplicates = self._new_file_list()
+        self.likely_duplicates = []
+        
+        # Anahtar -> grup (ilk gelen dosya orijinal)
+        self._duplicate_groups = {}
+        # Canlı izlemede kayıt -> grup anahtarı (izleme başlayınca doldurulur)
+        self._record_keys = None
         
         # Duplikat kontrol seçeneklerini al
-        check_name = self.gui.duplicate_check_name.get()
-        check_size = self.gui.duplicate_check_size.get()
-        check_hash = self.gui.duplicate_check_hash.get()
-        check_media = self.gui.duplicate_check_media.get()
-        check_similar = self.gui.duplicate_check_similar.get()
+        self._dup_checks = {
+            'name': self.gui.duplicate_check_name.get(),
+            'size': self.gui.duplicate_check_size.get(),
+            'hash': self.gui.duplicate_check_hash.get(),
+            'media': self.gui.duplicate_check_media.get(),
+            'similar': self.gui.duplicate_check_similar.get()
+        }
+        check_name, check_size, check_hash, check_media, check_similar = self._dup_checks.values()
+        
+        # Hash seçiliyse gruplama tarama sonunda aşamalı yapılır (sadece boyutu çakışan dosyalar okunur)
+        staged = check_hash and self._spill_keys is None
+        self.hash_cache_stats = None
+        self._hash_cache_snapshot = get_hash_cache().snapshot() if check_hash else None
+        self._hash_buckets = defaultdict(list) if staged else None
+        self._staged_keys = [] if staged else None  # (kayıt, kova anahtarı) - akış sırasıyla
+        self._unhashed_keys = None
         
         print(f"🔍 Duplikat kontrol seçenekleri: Name={check_name}, Size={check_size}, Hash={check_hash}, Media={check_media}, Similar={check_similar}")
         
@@ -328,133 +551,139 @@ class ScanEngine:
             print("🤔 MUHTEMEL DUPLIKAT aktif: İsim benzerliği + boyut kontrolü (çok sıkı kriterler)")
         if not any([check_name, check_size, check_hash, check_media, check_similar]):
             print("⚠️ Hiçbir duplikat kontrolü seçilmedi - tüm dosyalar unique olacak")
+    
+    def _duplicate_key(self, file_info, staged=False):
+        """Dosyanın duplikat gruplama anahtarını oluştur
         
-        # Dosyaları grupla
-        file_groups = defaultdict(list)
+        staged=True: hash parçası olmadan boyut kovası anahtarı (içerik _resolve_staged_hashes'te eklenir)
+        """
+        check_name = self._dup_checks['name']
+        check_size = self._dup_checks['size']
+        check_hash = self._dup_checks['hash']
+        check_media = self._dup_checks['media']
+        check_similar = self._dup_checks['similar']
         
-        total_files = len(self.all_scanned_files)
+        # Duplikat anahtarı oluştur
+        key_parts = []
         
-        for i, file_info in enumerate(self.all_scanned_files):
-            if self.stop_scanning:
-                return
-            
-            # Duplikat anahtarı oluştur
-            key_parts = []
-            
-            if check_name:
-                key_parts.append(f"name:{file_info['name'].lower()}")
-            
-            if check_size:
-                key_parts.append(f"size:{file_info['size']}")
-            
-            if check_hash:
-                if not file_info['hash']:
-                    file_info['hash'] = self._calculate_file_hash(file_info['path'])
-                if file_info['hash']:
-                    key_parts.append(f"hash:{file_info['hash']}")
-            
-            if check_media:
-                # Media duplikat kontrolü: SADECE media dosyaları için boyut + dimensions match
-                if self._is_media_file(file_info['path']):
-                    # Media boyutları (dimensions) - ZORUNLU
-                    if not file_info.get('dimensions'):
-                        file_info['dimensions'] = self._get_media_dimensions(file_info['path'])
-                    
-                    # MEDIA MATCH için kriterler (İSİM KONTROLÜ YOK):
-                    # 1. Dosya boyutu (tam eşleşme)
-                    key_parts.append(f"media_size:{file_info['size']}")
-                    
-                    # 2. Media boyutları (tam eşleşme)
-                    if file_info.get('dimensions'):
-                        key_parts.append(f"media_dim:{file_info['dimensions']}")
-                        print(f"📸 Media kontrolü: {file_info['name']} -> {file_info.get('dimensions', 'boyut_yok')} ({file_info['size']} bytes)")
-                    else:
-                        # Boyutları alınamazsa unique key ver (duplikat olmayacak)
-                        key_parts.append(f"media_no_dim:{file_info['path']}")
-                        print(f"📸 Media kontrolü (boyut alınamadı): {file_info['name']} -> unique")
-                    
-                    # NOT: İsim kontrolü YOK - farklı isimlerde ama aynı boyut+dimensions olan dosyalar duplikat bulunacak
-                    
-                else:
-                    # Media olmayan dosyalar için media kontrolü geçersiz
-                    # Unique key ver ki duplikat olmasın
-                    key_parts.append(f"non_media:{file_info['path']}")
-            
-            if check_similar:
-                # Muhtemel duplikat kontrolü: normalize edilmiş isim + boyut/boyutlar
-                # NOT: Bu sadece likely duplicate için kullanılacak, exact duplicate için değil
-                normalized_name = self._normalize_filename(file_info['name'])
-                if normalized_name.strip():  # Boş değilse
-                    key_parts.append(f"norm_name:{normalized_name}")
-                    
-                    # Dosya boyutu ekle (eğer yoksa)
-                    if not check_size:
-                        key_parts.append(f"similar_size:{file_info['size']}")
-                    
-                    # Media dosyası ise boyutları da ekle
-                    if self._is_media_file(file_info['path']):
-                        if not file_info.get('dimensions'):
-                            file_info['dimensions'] = self._get_media_dimensions(file_info['path'])
-                        if file_info.get('dimensions'):
-                            key_parts.append(f"similar_dim:{file_info['dimensions']}")
-                    
-                    print(f"🤔 Muhtemel duplikat kontrolü: {file_info['name']} -> '{normalized_name}'")
-            
-            # Anahtar oluştur
-            if key_parts:
-                key = '|'.join(key_parts)
-                file_groups[key].append(file_info)
-            else:
-                # Hiçbir kontrol seçilmemişse her dosya unique
-                unique_key = f"unique:{file_info['path']}"
-                file_groups[unique_key].append(file_info)
-            
-            # Progress güncelle
-            progress = 50 + (i + 1) / total_files * 30  # %50-80 arası
-            self.gui.root.after(0, lambda p=progress: self.gui.progress_var.set(p))
-            
-            # Time estimation güncelle
-            self.gui.root.after(0, lambda p=progress: self.gui.update_time_estimation(p))
-            
-            # UI donmasını önle
-            if i % 50 == 0:
-                time.sleep(0.001)
+        if check_name:
+            key_parts.append(f"name:{file_info['name'].lower()}")
         
-        # Duplikatları ayır - DÜZELTME: Sadece fazladan olanlar duplikat
-        exact_duplicates_found = 0
-        print(f"🔍 Dosya grupları analiz ediliyor: {len(file_groups)} grup bulundu")
+        if check_size:
+            key_parts.append(f"size:{file_info['size']}")
         
-        for key, files in file_groups.items():
-            if len(files) > 1:
-                # Duplikat grup - İlk dosya orijinal, geri kalanlar duplikat
-                original_file = files[0]  # İlk dosyayı orijinal olarak kabul et
-                duplicate_files_in_group = files[1:]  # Geri kalanlar duplikat
+        if check_media:
+            # Media duplikat kontrolü: SADECE media dosyaları için boyut + dimensions match
+            if self._is_media_file(file_info['path']):
+                # Media boyutları (dimensions) - ZORUNLU
+                if not file_info.get('dimensions'):
+                    file_info['dimensions'] = self._get_media_dimensions(file_info['path'])
+                
+                # MEDIA MATCH için kriterler (İSİM KONTROLÜ YOK):
+                # 1. Dosya boyutu (tam eşleşme)
+                key_parts.append(f"media_size:{file_info['size']}")
                 
-                # Orijinal dosyayı unique'e ekle
-                self.unique_files.append(original_file)
+                # 2. Media boyutları (tam eşleşme)
+                if file_info.get('dimensions'):
+                    key_parts.append(f"media_dim:{file_info['dimensions']}")
+                    print(f"📸 Media kontrolü: {file_info['name']} -> {file_info.get('dimensions', 'boyut_yok')} ({file_info['size']} bytes)")
+                else:
+                    # Boyutları alınamazsa unique key ver (duplikat olmayacak)
+                    key_parts.append(f"media_no_dim:{file_info['path']}")
+                    print(f"📸 Media kontrolü (boyut alınamadı): {file_info['name']} -> unique")
                 
-                # Duplikatları duplikat listesine ekle
-                self.duplicate_files.extend(duplicate_files_in_group)
-                self.source_duplicates.append(files)  # Tüm grup (debug için)
+                # NOT: İsim kontrolü YOK - farklı isimlerde ama aynı boyut+dimensions olan dosyalar duplikat bulunacak
                 
-                exact_duplicates_found += len(duplicate_files_in_group)
-                print(f"🔍 EXACT duplikat grup bulundu:")
-                print(f"   📋 Anahtar: {key}")
-                print(f"   📄 Orijinal: {original_file['name']}")
-                for i, dup_file in enumerate(duplicate_files_in_group):
-                    print(f"   📄 Duplikat {i+1}: {dup_file['name']}")
-                print(f"   📊 Toplam: 1 orijinal + {len(duplicate_files_in_group)} duplikat")
             else:
-                # Unique dosya
-                self.unique_files.extend(files)
-                # Sadece media dosyaları için anahtar göster
-                if any(self._is_media_file(f['path']) for f in files):
-                    print(f"📄 Unique media dosyası: {files[0]['name']} (anahtar: {key})")
+                # Media olmayan dosyalar için media kontrolü geçersiz
+                # Unique key ver ki duplikat olmasın
+                key_parts.append(f"non_media:{file_info['path']}")
+        
+        if check_similar:
+            # Muhtemel duplikat kontrolü: normalize edilmiş isim + boyut/boyutlar
+            # NOT: Bu sadece likely duplicate için kullanılacak, exact duplicate için değil
+            normalized_name = self._normalized_name(file_info)
+            if normalized_name.strip():  # Boş değilse
+                key_parts.append(f"norm_name:{normalized_name}")
+                
+                # Dosya boyutu ekle (eğer yoksa)
+                if not check_size:
+                    key_parts.append(f"similar_size:{file_info['size']}")
+                
+                # Media dosyası ise boyutları da ekle
+                if self._is_media_file(file_info['path']):
+                    if not file_info.get('dimensions'):
+                        file_info['dimensions'] = self._get_media_dimensions(file_info['path'])
+                    if file_info.get('dimensions'):
+                        key_parts.append(f"similar_dim:{file_info['dimensions']}")
+                
+                print(f"🤔 Muhtemel duplikat kontrolü: {file_info['name']} -> '{normalized_name}'")
+        
+        if check_hash:
+            # İçerik parçası en sonda - aşamalı tespitte anahtarın geri kalanı (boyut kovası) önceden bilinir
+            key_parts.append(f"hash_size:{file_info['size']}")
+            if not staged:
+                if self._unhashed_keys:
+                    self._hash_unhashed_groups('|'.join(key_parts))
+                if not is_current_hash(file_info['hash']):
+                    file_info['hash'] = self._calculate_file_hash(file_info['path'])
+                if file_info['hash']:
+                    key_parts.append(f"hash:{file_info['hash']}")
+                else:
+                    # Okunamadı - hash'siz anahtar
+                    key_parts.pop()
+        
+        # Anahtar oluştur
+        if key_parts:
+            return '|'.join(key_parts)
+        # Hiçbir kontrol seçilmemişse her dosya unique
+        return f"unique:{file_info['path']}"
+    
+    def _assign_duplicate_group(self, file_info, key=None):
+        """Dosyayı duplikat grubuna ata - duplikatsa True (grubun ilk dosyası orijinaldir)"""
+        if key is None:
+            key = self._duplicate_key(file_info)
+        group = self._duplicate_groups.get(key)
+        if self._record_keys is not None:
+            self._record_keys[id(file_info)] = key
+        
+        if group is None:
+            # İlk kez görülen anahtar - unique (veya ileride grubun orijinali)
+            self._duplicate_groups[key] = [file_info]
+            self.unique_files.append(file_info)
+            return False
         
-        print(f"✅ EXACT duplikat kontrolü tamamlandı: {exact_duplicates_found} exact duplikat bulundu")
+        # Duplikat - DÜZELTME: Sadece fazladan olanlar duplikat
+        if len(group) == 1:
+            self.source_duplicates.append(group)  # Tüm grup (debug için)
+            print(f"🔍 EXACT duplikat grup bulundu:")
+            print(f"   📋 Anahtar: {key}")
+            print(f"   📄 Orijinal: {group[0]['name']}")
+        group.append(file_info)
+        self.duplicate_files.append(file_info)
+        print(f"   📄 Duplikat {len(group) - 1}: {file_info['name']}")
+        return True
+    
+    def _finish_duplicate_detection(self):
+        """Akış bittikten sonra duplikat tespitini tamamla"""
+        if self._hash_buckets is not None:
+            self._resolve_staged_hashes()
+        if self._spill_keys is not None:
+            self._resolve_spilled_groups()
+        if self._hash_cache_snapshot is not None:
+            cache = get_hash_cache()
+            cache.flush()
+            self.hash_cache_stats = cache.since(self._hash_cache_snapshot)
+            print(cache.get_stats_text(self._hash_cache_snapshot))
+        
+        print(f"🔍 Dosya grupları analiz edildi: {len(self._duplicate_groups)} grup bulundu")
+        print(f"✅ EXACT duplikat kontrolü tamamlandı: {len(self.duplicate_files)} exact duplikat bulundu")
+        # Gruplar sadece canlı izleme için tutulur (aksi halde bellek serbest kalsın)
+        if not self.gui.watch_changes.get():
+            self._duplicate_groups = {}
         
         # Muhtemel duplikatları tespit et (eğer similar kontrolü aktifse)
-        if check_similar:
+        if self._dup_checks['similar']:
             print("🤔 Muhtemel duplikat kontrolü başlatılıyor...")
             self._detect_likely_duplicates()
         else:
@@ -464,16 +693,134 @@ class ScanEngine:
         self.stats['unique_files'] = len(self.unique_files)
         self.stats['duplicate_files'] = len(self.duplicate_files)
     
-    def _calculate_file_hash(self, file_path, chunk_size=8192):
-        """Dosya hash'ini hesapla"""
-        try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except:
-            return None
+    def _resolve_staged_hashes(self):
+        """Hash kontrolü: boyut kovalarını aşamalı hash ile ayır, kayıtları akış sırasıyla grupla
+        
+        Boyutu benzersiz dosyalar hiç okunmaz, büyük dosyalarda önce baş/orta/son örneği
+        karşılaştırılır; tam hash sadece örneği çakışan dosyalar için hesaplanır.
+        """
+        from lang_manager import t
+        buckets, staged = self._hash_buckets, self._staged_keys
+        self._hash_buckets = self._staged_keys = None
+        
+        def on_progress(done, total, done_bytes, speed):
+            self.gui.progress_bus.publish(status=f"{t('messages.hashing_candidates')}: {done}/{total} ({speed:.1f} MB/s)")
+        
+        hasher = StagedHasher(should_stop=lambda: self.stop_scanning, on_progress=on_progress)
+        parts = {}
+        candidates = []
+        for records in buckets.values():
+            if len(records) == 1:
+                hasher.stats['skipped'] += 1
+                hasher.stats['skipped_bytes'] += records[0]['size']
+            elif all(is_current_hash(file_info['hash']) for file_info in records):
+                # Hash'ler tarama indeksinden geldi (seçili algoritmayla) - okumaya gerek yok
+                parts.update((id(file_info), f"hash:{file_info['hash']}") for file_info in records)
+            else:
+                candidates.append(records)
+        print(f"⚡ Hash: {len(buckets)} boyut kovası, {sum(len(records) for records in candidates)} aday dosya")
+        
+        # Tüm kovalar tek seferde paylaşılan hash havuzuna verilir (disk başına paralel)
+        resolved = hasher.resolve([(records[0]['size'], [file_info['path'] for file_info in records])
+                                   for records in candidates])
+        if self.stop_scanning:
+            return
+        for records, record_parts in zip(candidates, resolved):
+            for file_info, part in zip(records, record_parts):
+                parts[id(file_info)] = part
+                if part and part.startswith('hash:'):
+                    file_info['hash'] = part[5:]
+        print(hasher.get_stats_text())
+        
+        # Canlı izlemede sonradan gelen dosya bu gruplarla karşılaştırılırken tam hash gerekir
+        unhashed = defaultdict(set) if self.gui.watch_changes.get() else None
+        for file_info, bucket_key in staged:
+            part = parts.get(id(file_info))
+            key = self._content_key(bucket_key, part, file_info['path'], id(file_info) in parts)
+            try:
+                if self._assign_duplicate_group(file_info, key):
+                    self._add_duplicate_to_structure(file_info)
+                else:
+                    self._categorize_file(file_info)
+            except Exception as e:
+                print(f"Dosya işlenirken hata: {file_info.get('path')} - {e}")
+            if unhashed is not None and not (part and part.startswith('hash:')):
+                unhashed[bucket_key].add(key)
+        self._unhashed_keys = unhashed
+    
+    @staticmethod
+    def _content_key(bucket_key, part, file_path, was_read):
+        """Boyut kovası anahtarı + içerik parçası
+        
+        Okunamayan dosyada hash parçası (ve boyut kovası) olmadan anahtar - aşamasız akıştaki gibi.
+        """
+        if part:
+            return f"{bucket_key}|{part}"
+        if not was_read:
+            return bucket_key
+        return bucket_key.rpartition('|')[0] or f"unique:{file_path}"
+    
+    def _hash_unhashed_groups(self, bucket_key):
+        """Canlı izleme: kovadaki hash'siz grupları tam hash anahtarına taşı (yeni dosya eşleşebilsin)"""
+        for old_key in self._unhashed_keys.pop(bucket_key, ()):
+            group = self._duplicate_groups.get(old_key)
+            if not group:
+                continue
+            original = group[0]
+            if not is_current_hash(original['hash']):
+                original['hash'] = self._calculate_file_hash(original['path'])
+            new_key = f"{bucket_key}|hash:{original['hash']}"
+            if not original['hash'] or new_key in self._duplicate_groups:
+                continue
+            self._duplicate_groups[new_key] = self._duplicate_groups.pop(old_key)
+            if self._record_keys is not None:
+                for member in group:
+                    self._record_keys[id(member)] = new_key
+    
+    def _stage_spilled_keys(self, sorter):
+        """Bellek bütçeli tarama + hash: dış sıralanmış boyut kovalarını aşamalı hash ile ayır
+        
+        (içerik anahtarları, (sıra, hash) sıralayıcısı) döner - hash'ler kayıtlara
+        _resolve_spilled_groups'ta yazılır (bellek içi akıştaki gibi).
+        """
+        hasher = StagedHasher(should_stop=lambda: self.stop_scanning)
+        staged = self.spill_session.new_sorter()
+        hashes = self.spill_session.new_sorter()
+        pending = []  # (kova anahtarı, üyeler) - havuza toplu verilir
+        
+        def flush():
+            resolved = hasher.resolve([(members[0][2], [path for _, path, _ in members])
+                                       for _, members in pending])
+            for (bucket_key, members), member_parts in zip(pending, resolved):
+                for (seq, path, _), part in zip(members, member_parts):
+                    key = self._content_key(bucket_key, part, path, len(members) > 1)
+                    staged.add((key, seq), len(key))
+                    if part and part.startswith('hash:'):
+                        hashes.add((seq, part[5:]), len(part))
+            pending.clear()
+        
+        current, members, pending_files = None, [], 0
+        for bucket_key, seq, path, size in sorter.sorted_items():
+            if self.stop_scanning:
+                break
+            if bucket_key != current and members:
+                pending.append((current, members))
+                pending_files += len(members)
+                members = []
+                if pending_files >= 2000:
+                    flush()
+                    pending_files = 0
+            current = bucket_key
+            members.append((seq, path, size))
+        if members:
+            pending.append((current, members))
+        flush()
+        print(hasher.get_stats_text())
+        return staged, hashes
+    
+    def _calculate_file_hash(self, file_path):
+        """Dosya hash'ini hesapla (paylaşılan hash servisi)"""
+        return get_hashing_service().hash_file(file_path)
     
     def _is_media_file(self, file_path):
         """Dosyanın media dosyası olup olmadığını kontrol et"""
@@ -501,7 +848,7 @@ class ScanEngine:
                 return dimensions
             
             # Video dosyaları için
-            elif extension in ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v']:
+            elif extension in ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp']:
                 dimensions = self._get_video_dimensions(file_path)
                 if dimensions:
                     print(f"📐 Video boyutu alındı: {os.path.basename(file_path)} -> {dimensions}")
@@ -579,234 +926,146 @@ class ScanEngine:
             return None
     
     def _get_video_dimensions(self, file_path):
-        """Video dosyasının boyutlarını al (basit yaklaşım)"""
+        """Video çözünürlüğü ve süresi kapsayıcı başlığından (MP4/MOV, MKV/WebM, AVI - decode yok)"""
         try:
-            # Video metadata okuma karmaşık, basit tahmin kullanıyoruz
-            file_size = os.path.getsize(file_path)
-            
-            # Dosya boyutuna göre tahmin
-            if file_size < 50 * 1024 * 1024:  # 50MB altı
-                return "720x480"  # SD
-            elif file_size < 200 * 1024 * 1024:  # 200MB altı
-                return "1280x720"  # HD
-            elif file_size < 500 * 1024 * 1024:  # 500MB altı
-                return "1920x1080"  # Full HD
-            else:
-                return "3840x2160"  # 4K
-                
-        except:
+            # Başlık okunamazsa None - media modunda dosya tek başına kalır, yanlış gruplanmaz
+            return video_dimensions(file_path)
+        except Exception:
             return None
     
-    def _calculate_name_similarity(self, name1, name2):
-        """İki dosya isminin benzerlik oranını hesapla (0-100) - GELİŞTİRİLMİŞ ALGORİTMA"""
+    def _calculate_name_similarity(self, name1, name2, min_similarity=0):
+        """İki dosya isminin benzerlik oranını hesapla (0-100) - GELİŞTİRİLMİŞ ALGORİTMA
+        
+        min_similarity: bu eşiğin altında kalacak çiftlerde hesap erken kesilir ve 0 döner
+        """
         try:
-            # Uzantıları kaldır
-            name1_base = os.path.splitext(name1)[0].lower()
-            name2_base = os.path.splitext(name2)[0].lower()
-            
-            # Boş isim kontrolü
-            if not name1_base or not name2_base:
-                return 0
-            
-            # Tamamen aynıysa %100
-            if name1_base == name2_base:
-                return 100
-            
-            # Basit Levenshtein distance hesapla
-            def levenshtein_distance(s1, s2):
-                if len(s1) < len(s2):
-                    return levenshtein_distance(s2, s1)
-                
-                if len(s2) == 0:
-                    return len(s1)
-                
-                previous_row = list(range(len(s2) + 1))
-                for i, c1 in enumerate(s1):
-                    current_row = [i + 1]
-                    for j, c2 in enumerate(s2):
-                        insertions = previous_row[j + 1] + 1
-                        deletions = current_row[j] + 1
-                        substitutions = previous_row[j] + (c1 != c2)
-                        current_row.append(min(insertions, deletions, substitutions))
-                    previous_row = current_row
-                
-                return previous_row[-1]
-            
-            # Levenshtein distance'ı benzerlik oranına çevir
-            max_len = max(len(name1_base), len(name2_base))
-            distance = levenshtein_distance(name1_base, name2_base)
-            similarity = ((max_len - distance) / max_len) * 100
-            
-            # Ek bonuslar
-            # Bonus 1: Bir isim diğerinin içinde geçiyorsa
-            if name1_base in name2_base or name2_base in name1_base:
-                similarity = min(100, similarity + 10)
-            
-            # Bonus 2: Aynı kelimeler içeriyorsa (boşluk/tire ile ayrılmış)
-            import re
-            words1 = set(re.split(r'[\s\-_]+', name1_base))
-            words2 = set(re.split(r'[\s\-_]+', name2_base))
-            
-            if words1 and words2:
-                common_words = words1.intersection(words2)
-                if common_words:
-                    word_bonus = (len(common_words) / max(len(words1), len(words2))) * 15
-                    similarity = min(100, similarity + word_bonus)
-            
-            # Malus: Çok farklı uzunluklarda isimler
-            length_ratio = min(len(name1_base), len(name2_base)) / max(len(name1_base), len(name2_base))
-            if length_ratio < 0.5:  # Biri diğerinin yarısından kısaysa
-                similarity *= 0.8  # %20 azalt
-            
-            return int(max(0, min(100, similarity)))
-            
+            return name_similarity(name1, name2, min_similarity)
         except Exception as e:
             print(f"⚠️ İsim benzerliği hesaplama hatası: {e}")
             return 0
     
     def _normalize_filename(self, filename):
-        """Dosya ismini normalize et (sayılar, tarihler vs. kaldır)"""
+        """Dosya ismini normalize et (sayılar, tarihler vs. kaldır) - derlenmiş kalıplar, LRU önbellekli"""
         try:
-            import re
-            
-            # Uzantıyı kaldır
-            name_base = os.path.splitext(filename)[0].lower()
-            
-            # Yaygın kalıpları kaldır
-            # Tarih kalıpları: 20231105, 2023-11-05, 05.11.2023
-            name_base = re.sub(r'\d{8}', '', name_base)  # 20231105
-            name_base = re.sub(r'\d{4}-\d{2}-\d{2}', '', name_base)  # 2023-11-05
-            name_base = re.sub(r'\d{2}\.\d{2}\.\d{4}', '', name_base)  # 05.11.2023
-            
-            # Saat kalıpları: 14:30, 1430
-            name_base = re.sub(r'\d{2}:\d{2}', '', name_base)  # 14:30
-            name_base = re.sub(r'\d{4}(?=\D|$)', '', name_base)  # 1430
-            
-            # Sayı dizileri (3+ rakam)
-            name_base = re.sub(r'\d{3,}', '', name_base)
-            
-            # Özel karakterleri kaldır
-            name_base = re.sub(r'[_\-\(\)\[\]{}]', ' ', name_base)
-            
-            # Çoklu boşlukları tek boşluğa çevir
-            name_base = re.sub(r'\s+', ' ', name_base).strip()
-            
-            return name_base
-            
-        except:
-                         return filename
+            return normalize_filename(filename)
+        except Exception:
+            return filename
+    
+    def _normalized_name(self, file_info):
+        """Kaydın normalize isim anahtarı - ilk kullanımda hesaplanıp kayda yazılır"""
+        normalized = file_info.get('normalized_name')
+        if normalized is None:
+            normalized = file_info['normalized_name'] = self._normalize_filename(file_info['name'])
+        return normalized
     
     def _detect_likely_duplicates(self):
-        """Muhtemel duplikatları tespit et (isim benzerliği + boyut/boyutlar) - ÇOK SIKI KRİTERLER"""
+        """Muhtemel duplikatları tespit et (isim benzerliği + boyut/boyutlar) - ÇOK SIKI KRİTERLER
+        
+        Tüm çiftler yerine bloklama indeksi: dosyalar boyut bandına göre sıralanır, her band
+        bir sonrakiyle birlikte işlenir ve sadece aynı boyutlara (dimensions) ve ortak bir
+        isim anahtarına sahip dosyalar karşılaştırılır. Anahtarlar eşiğin izin verdiği en büyük
+        düzenleme mesafesinden türetilir (bkz. _likely_name_tokens) - %90 eşiğini geçen her çift
+        en az bir blokta buluşur, sonuç tüm çiftlerin karşılaştırılmasıyla aynıdır.
+        """
         try:
             self.likely_duplicates = []
             
-            # Sadece media dosyalarını kontrol et
-            media_files = [f for f in self.unique_files if self._is_media_file(f['path'])]
+            # Sadece media dosyaları - kayıt yerine küçük tuple tutulur (spill modunda da bellek sınırlı)
+            media_files = []
+            for seq, f in enumerate(self.unique_files):
+                if f['size'] > 0 and self._is_media_file(f['path']):
+                    media_files.append((f['size'], seq, f['name'], f.get('dimensions') or None,
+                                        self._normalized_name(f)))
+            media_files.sort()
             
             print(f"🤔 {len(media_files)} media dosyası için muhtemel duplikat kontrolü başlıyor...")
             
-            # PERFORMANS OPTİMİZASYONU: Çok fazla dosya varsa sınırla
-            if len(media_files) > 500:  # 1000'den 500'e düşürdük
-                print(f"⚠️ Çok fazla media dosyası ({len(media_files)}), ilk 500 tanesi kontrol edilecek")
-                media_files = media_files[:500]
-            
-            # PERFORMANS OPTİMİZASYONU: Maksimum çift sayısını sınırla
-            max_pairs = 100  # 1000'den 100'e düşürdük (çok daha sıkı)
-            pair_count = 0
-            
-            # Her dosyayı diğerleriyle karşılaştır
-            for i, file1 in enumerate(media_files):
-                if self.stop_scanning or pair_count >= max_pairs:
-                    if pair_count >= max_pairs:
-                        print(f"⚠️ Maksimum çift sayısına ulaşıldı ({max_pairs}), kontrol durduruluyor")
+            # Oranı >= 0.95 olan iki boyut aynı veya komşu bandadır
+            band_width = -math.log(0.95)
+            bands = []
+            for media in media_files:
+                band = int(math.log(media[0]) / band_width)
+                if not bands or bands[-1][0] != band:
+                    bands.append((band, []))
+                bands[-1][1].append(media)
+            
+            found = []
+            compared = 0
+            for index, (band, members) in enumerate(bands):
+                if self.stop_scanning:
                     return
+                # Bu band + komşu band; en az biri bu bandda olan çiftler burada karşılaştırılır
+                neighbours = bands[index + 1][1] if index + 1 < len(bands) and bands[index + 1][0] == band + 1 else []
+                candidates = members + neighbours
+                lengths, tokens = zip(*(self._likely_name_tokens(media[2]) for media in candidates))
+                frequency = Counter(token for name_tokens in tokens for token in name_tokens)
                 
-                # Progress göster
-                if i % 50 == 0:  # 100'den 50'ye düşürdük
-                    print(f"🔍 İşlenen dosya: {i}/{len(media_files)}")
-                
-                for j, file2 in enumerate(media_files[i+1:], i+1):
-                    if pair_count >= max_pairs:
-                        break
-                    
-                    # HIZLI FİLTRE 1: Çok farklı boyutları hemen elendir (ÇOK SIKI)
-                    size_ratio = min(file1['size'], file2['size']) / max(file1['size'], file2['size'])
-                    if size_ratio < 0.95:  # %5'ten fazla boyut farkı varsa atla (çok daha sıkı)
+                blocks = defaultdict(list)
+                short_names = []
+                by_length = defaultdict(list)
+                for position, (media, length, name_tokens) in enumerate(zip(candidates, lengths, tokens)):
+                    dimensions = media[3]
+                    if not length:
                         continue
-                    
-                    # HIZLI FİLTRE 2: Boyutlar farklıysa atla (ÇOK SIKI)
-                    if file1.get('dimensions') and file2.get('dimensions'):
-                        if file1['dimensions'] != file2['dimensions']:
-                            continue  # Boyutlar farklıysa kesinlikle duplikat değil
-                    elif file1.get('dimensions') or file2.get('dimensions'):
-                        # Birinde boyut var diğerinde yok - muhtemelen farklı dosyalar
+                    if length <= 4:
+                        by_length[(dimensions, length)].append(position)
+                    if length <= 2:
+                        # Ortak bigram garantisi yok - en fazla iki katı uzunluktaki isimlerle karşılaştırılır
+                        short_names.append(position)
                         continue
-                    
-                    # İsim benzerliği hesapla
-                    similarity = self._calculate_name_similarity(file1['name'], file2['name'])
-                    
-                    # HIZLI FİLTRE 3: Çok düşük benzerlik varsa atla (ÇOK SIKI)
-                    if similarity < 90:  # %80'den %90'a çıkardık (çok daha sıkı)
+                    # Önek filtresi: en nadir floor(L/2) + 1 bigram (bkz. _likely_name_tokens)
+                    prefix = sorted(name_tokens, key=lambda token: (frequency[token], token))[:length // 2 + 1]
+                    for token in prefix:
+                        blocks[hash((dimensions, token))].append(position)
+                
+                # Adaylar boyuta göre sıralı: bloktaki sonraki üyeler %5'ten fazla büyükse çift oluşmaz
+                pairs = set()
+                for positions in blocks.values():
+                    for i, first in enumerate(positions):
+                        if first >= len(members):
+                            break
+                        size = candidates[first][0]
+                        for second in positions[i + 1:]:
+                            if size / candidates[second][0] < 0.95:
+                                break
+                            pairs.add((first, second))
+                for position in short_names:
+                    dimensions, length = candidates[position][3], lengths[position]
+                    for other_length in range(1, 2 * length + 1):
+                        for other in by_length.get((dimensions, other_length), ()):
+                            first, second = min(position, other), max(position, other)
+                            if first != second and first < len(members):
+                                pairs.add((first, second))
+                
+                token_sets = [frozenset(name_tokens) for name_tokens in tokens]
+                for first, second in pairs:
+                    # Gerekli koşullar (ucuz): uzunluk oranı >= 0.5 ve q-gram sayım filtresi
+                    long_length = max(lengths[first], lengths[second])
+                    if 2 * min(lengths[first], lengths[second]) < long_length:
                         continue
-                    
-                    # Boyut benzerliği kontrol et
-                    size_diff = abs(file1['size'] - file2['size']) / max(file1['size'], file2['size']) * 100
-                    
-                    # Boyutlar benzer mi kontrol et (eğer varsa)
-                    dimension_match = False
-                    if file1.get('dimensions') and file2.get('dimensions'):
-                        dimension_match = file1['dimensions'] == file2['dimensions']
-                    
-                    # Muhtemel duplikat kriterleri - ÇOK ÇOK SIKI (FALSE POSITIVE ÖNLEME)
-                    is_likely_duplicate = False
-                    confidence = 0
-                    
-                    # Kriter 1: İsim %98+ benzer + boyut %99+ benzer + aynı boyutlar (neredeyse kesin)
-                    if similarity >= 98 and size_diff <= 1 and dimension_match:
-                        is_likely_duplicate = True
-                        confidence = min(98, similarity + (100 - size_diff))
-                    
-                    # Kriter 2: İsim %95+ benzer + aynı boyutlar + boyut %98+ benzer (çok yüksek güven)
-                    elif similarity >= 95 and dimension_match and size_diff <= 2:
-                        is_likely_duplicate = True
-                        confidence = min(95, similarity + (100 - size_diff))
-                    
-                    # Kriter 3: İsim %99+ benzer (neredeyse aynı isim) + boyut %95+ benzer
-                    elif similarity >= 99 and size_diff <= 5:
-                        is_likely_duplicate = True
-                        confidence = min(92, similarity)
-                    
-                    # ÇOK SIKI: Normalize edilmiş isimler de kontrol et
-                    if is_likely_duplicate:
-                        norm1 = self._normalize_filename(file1['name'])
-                        norm2 = self._normalize_filename(file2['name'])
-                        
-                        # Normalize edilmiş isimler çok farklıysa false positive olabilir
-                        if norm1.strip() and norm2.strip():
-                            norm_similarity = self._calculate_name_similarity(norm1, norm2)
-                            if norm_similarity < 80:  # Normalize edilmiş isimler %80'den düşükse atla
-                                print(f"🚫 False positive önlendi: {file1['name']} vs {file2['name']} (norm: {norm_similarity}%)")
-                                continue
-                    
-                    if is_likely_duplicate:
-                        # Muhtemel duplikat çifti kaydet
-                        likely_pair = {
-                            'file1': file1,
-                            'file2': file2,
-                            'name_similarity': similarity,
-                            'size_difference': size_diff,
-                            'dimension_match': dimension_match,
-                            'confidence': confidence
-                        }
-                        
-                        self.likely_duplicates.append(likely_pair)
-                        pair_count += 1
-                        
-                        # Her çifti logla (az olacağı için)
-                        print(f"🤔 Muhtemel duplikat bulundu ({confidence}% güven): {file1['name']} vs {file2['name']}")
-            
-            print(f"✅ Muhtemel duplikat kontrolü tamamlandı: {len(self.likely_duplicates)} çift bulundu (max {max_pairs})")
+                    if len(token_sets[first] & token_sets[second]) < (long_length + 1) // 2 - 1:
+                        continue
+                    compared += 1
+                    pair = self._evaluate_likely_pair(candidates[first], candidates[second])
+                    if pair:
+                        found.append(pair)
+                
+                if index % 50 == 0:
+                    print(f"🔍 Boyut bandı: {index + 1}/{len(bands)} ({compared} karşılaştırma)")
+            
+            # Kayıtlar ikinci geçişte alınır; çiftler eski sırayla (tarama sırası) listelenir
+            found.sort(key=lambda pair: (pair['file1'], pair['file2']))
+            needed = {pair[key] for pair in found for key in ('file1', 'file2')}
+            records = {seq: f for seq, f in enumerate(self.unique_files) if seq in needed}
+            for pair in found:
+                pair['file1'] = records[pair['file1']]
+                pair['file2'] = records[pair['file2']]
+                self.likely_duplicates.append(pair)
+                print(f"🤔 Muhtemel duplikat bulundu ({pair['confidence']}% güven): "
+                      f"{pair['file1']['name']} vs {pair['file2']['name']}")
+            
+            print(f"✅ Muhtemel duplikat kontrolü tamamlandı: {len(self.likely_duplicates)} çift bulundu "
+                  f"({compared} karşılaştırma)")
             
         except Exception as e:
             print(f"⚠️ Muhtemel duplikat tespit hatası: {e}")
@@ -815,15 +1074,99 @@ class ScanEngine:
             self.likely_duplicates = []
             
             # UI'yi güncelle
-            self.gui.root.after(0, lambda: self.gui.progress_var.set(80))
+            self.gui.progress_bus.publish(80)
             print("🔄 Muhtemel duplikat hatası nedeniyle normal taramaya devam ediliyor...")
-     
-    def _create_organization_structure(self):
-        """Organizasyon yapısını oluştur - GELİŞTİRİLMİŞ SÜRÜM"""
-
+    
+    def _likely_name_tokens(self, name):
+        """Bloklama için (isim kökü uzunluğu, bigram'lar) - tekrar eden bigram sıra numarasıyla ayrılır
+        
+        Muhtemel duplikat için isim benzerliği >= 90 olmalı. Kelime bonusu en fazla 15, içerme bonusu
+        sadece biri diğerini içerirken eklenir; kısa isim diğerinin yarısından kısaysa skor %80'e
+        iner (en fazla 80). Bu yüzden L = uzun ismin uzunluğu olmak üzere:
+        - içermeyen çiftlerde düzenleme mesafesi d <= 0.25 * L,
+        - içeren çiftlerde kısa isim >= L / 2 ve bigram'larının hepsi uzun isimde.
+        Mesafesi d olan iki isim en az L - 1 - 2d ortak bigram paylaşır (q-gram lemması); her iki
+        durumda da ortak bigram sayısı >= ceil(L / 2) - 1 >= ceil(len / 2) - 1 (len: ismin kendi
+        uzunluğu). Bigram'lar pencere genelinde nadirden yaygına sıralanırsa, bu kadar ortak öğesi
+        olan iki kümenin ilk len - (ceil(len / 2) - 1) = floor(len / 2) + 1 öğesi kesişir (önek
+        filtresi) - blok anahtarı olarak bu önek kullanılır, hiçbir blok atlanmaz.
+        En fazla 2 karakterlik isimlerde garanti yoktur; onlar ayrıca karşılaştırılır.
+        """
+        base = os.path.splitext(name)[0].lower()
+        seen = {}
+        tokens = []
+        for index in range(len(base) - 1):
+            gram = base[index:index + 2]
+            occurrence = seen.get(gram, 0)
+            seen[gram] = occurrence + 1
+            tokens.append((gram, occurrence))
+        return len(base), tokens
+    
+    def _evaluate_likely_pair(self, media1, media2):
+        """İki media dosyası (boyut, sıra, isim, boyutlar, normalize isim) muhtemel duplikat mı
+        
+        Çift sözlüğü veya None döner.
+        """
+        if media1[1] > media2[1]:
+            media1, media2 = media2, media1
+        size1, seq1, name1, dimensions1, norm1 = media1
+        size2, seq2, name2, dimensions2, norm2 = media2
+        
+        # HIZLI FİLTRE 1: Çok farklı boyutları hemen elendir (ÇOK SIKI)
+        size_ratio = min(size1, size2) / max(size1, size2)
+        if size_ratio < 0.95:  # %5'ten fazla boyut farkı varsa atla (çok daha sıkı)
+            return None
         
-        self.organization_structure = defaultdict(lambda: defaultdict(list))
-        self.existing_folder_files = defaultdict(list)
+        # HIZLI FİLTRE 2: Boyutlar farklıysa atla (blok anahtarı boyutları içerir - yine de kontrol)
+        if dimensions1 != dimensions2:
+            return None
+        
+        # İsim benzerliği hesapla - %90'a ulaşamayacak çiftlerde mesafe hesabı erken kesilir
+        similarity = self._calculate_name_similarity(name1, name2, 90)
+        
+        # HIZLI FİLTRE 3: Çok düşük benzerlik varsa atla (ÇOK SIKI)
+        if similarity < 90:
+            return None
+        
+        # Boyut benzerliği kontrol et
+        size_diff = abs(size1 - size2) / max(size1, size2) * 100
+        dimension_match = bool(dimensions1)
+        
+        # Muhtemel duplikat kriterleri - ÇOK ÇOK SIKI (FALSE POSITIVE ÖNLEME)
+        # Kriter 1: İsim %98+ benzer + boyut %99+ benzer + aynı boyutlar (neredeyse kesin)
+        if similarity >= 98 and size_diff <= 1 and dimension_match:
+            confidence = min(98, similarity + (100 - size_diff))
+        # Kriter 2: İsim %95+ benzer + aynı boyutlar + boyut %98+ benzer (çok yüksek güven)
+        elif similarity >= 95 and dimension_match and size_diff <= 2:
+            confidence = min(95, similarity + (100 - size_diff))
+        # Kriter 3: İsim %99+ benzer (neredeyse aynı isim) + boyut %95+ benzer
+        elif similarity >= 99 and size_diff <= 5:
+            confidence = min(92, similarity)
+        else:
+            return None
+        
+        # ÇOK SIKI: Normalize edilmiş isimler de kontrol et (dosya başına bir kez hesaplandı)
+        # Normalize edilmiş isimler çok farklıysa false positive olabilir
+        if norm1.strip() and norm2.strip():
+            norm_similarity = self._calculate_name_similarity(norm1, norm2)
+            if norm_similarity < 80:  # Normalize edilmiş isimler %80'den düşükse atla
+                print(f"🚫 False positive önlendi: {name1} vs {name2} (norm: {norm_similarity}%)")
+                return None
+        
+        # Kayıtlar çağıran tarafından sıra numarasıyla doldurulur
+        return {
+            'file1': seq1,
+            'file2': seq2,
+            'name_similarity': similarity,
+            'size_difference': size_diff,
+            'dimension_match': dimension_match,
+            'confidence': confidence
+        }
+     
+    def _prepare_organization_structure(self):
+        """Organizasyon yapısını hazırla - hedef analizi ve öğrenme akıştan önce bir kez yapılır"""
+        self.organization_structure = defaultdict(lambda: defaultdict(self._new_file_list))
+        self.existing_folder_files = defaultdict(self._new_file_list)
         
         # Hedef klasör analizi
         target_folder_analysis = self._analyze_target_folders()
@@ -855,124 +1198,118 @@ class ScanEngine:
             print("📚 JSON güncellendi ve yeniden yüklendi")
             self.gui.status_var.set(lang_manager.get_text('messages.categories_learned'))
         
-        # Progress başlat
-        self.gui.root.after(0, lambda: self.gui.progress_var.set(0))
+        self._target_folder_analysis = target_folder_analysis
+    
+    def _categorize_file(self, file_info):
+        """Unique dosyayı organizasyon yapısında kategorisine yerleştir"""
+        # KLASÖR İŞLEMİ: is_folder=True olanlar "Software Packages" kategorisine git
+        if file_info.get('is_folder', False):
+            # Klasörler sadece duplicate tarama için "Software Packages" kategorisine yerleştirilir
+            software_category = lang_manager.get_text('categories.ready_programs')
+            print(f"📁 {lang_manager.get_text('messages.processing_folder').format(category=software_category, name=file_info['name'])}")
+            
+            # Software Packages kategorisi - alt klasör kullanmadan direkt klasör adı ile
+            software_packages_folder = "Software Packages"  # Sabit İngilizce klasör adı
+            if software_packages_folder not in self.organization_structure:
+                self.organization_structure[software_packages_folder] = defaultdict(self._new_file_list)
+            
+            # Klasörü direkt ana kategori altına koy
+            self.organization_structure[software_packages_folder][''].append(file_info)
+            return
         
-        total_files = len(self.unique_files)
-        for i, file_info in enumerate(self.unique_files):
-            if self.stop_scanning:
-                break
-                
-            # Progress güncelle
-            progress = (i + 1) / total_files * 100
-            self.gui.root.after(0, lambda p=progress: self.gui.progress_var.set(p))
+        # DOSYA İŞLEMİ: Normal dosyalar için uzantı bazlı kategori 
+        extension = file_info['extension']
+        print(f"🔧 {lang_manager.get_text('messages.processing_file').format(name=file_info['name'], ext=extension, is_folder=file_info.get('is_folder', False))}")
+        
+        # ÖNCELİK 1: Öğrenilen kategoriyi kontrol et
+        learned_info = self.file_ops._check_learned_category_for_scan(extension)
+        
+        if learned_info and isinstance(learned_info, dict):
+            # Öğrenilen kategori var - bu en yüksek öncelik
+            category_folder = learned_info['folder']  # İngilizce kategori klasörü
+            confidence = learned_info['confidence']
             
-            # KLASÖR İŞLEMİ: is_folder=True olanlar "Software Packages" kategorisine git
-            if file_info.get('is_folder', False):
-                # Klasörler sadece duplicate tarama için "Software Packages" kategorisine yerleştirilir
-                software_category = lang_manager.get_text('categories.ready_programs')
-                print(f"📁 {lang_manager.get_text('messages.processing_folder').format(category=software_category, name=file_info['name'])}")
-                
-                # Software Packages kategorisi - alt klasör kullanmadan direkt klasör adı ile
-                software_packages_folder = "Software Packages"  # Sabit İngilizce klasör adı
-                if software_packages_folder not in self.organization_structure:
-                    self.organization_structure[software_packages_folder] = defaultdict(list)
-                
-                # Klasörü direkt ana kategori altına koy
-                self.organization_structure[software_packages_folder][''].append(file_info)
-                continue
+            # Kategori adını çevir
+            translated_category = self._get_translated_category_name(category_folder)
+            print(f"🎯 {extension} uzantısı TARGET LEARNING ile yerleştirilecek: {translated_category} (confidence: {confidence}%)")
             
-            # DOSYA İŞLEMİ: Normal dosyalar için uzantı bazlı kategori 
-            extension = file_info['extension']
-            print(f"🔧 {lang_manager.get_text('messages.processing_file').format(name=file_info['name'], ext=extension, is_folder=file_info.get('is_folder', False))}")
+            # Organization structure'a ekle
+            if category_folder not in self.organization_structure:
+                self.organization_structure[category_folder] = defaultdict(self._new_file_list)
             
-            # ÖNCELİK 1: Öğrenilen kategoriyi kontrol et
-            learned_info = self.file_ops._check_learned_category_for_scan(extension)
+            # Alt klasör - uzantı adı
+            subfolder = extension.replace('.', '').upper() if extension else 'Uzantisiz'
+            self.organization_structure[category_folder][subfolder].append(file_info)
             
-            if learned_info and isinstance(learned_info, dict):
-                # Öğrenilen kategori var - bu en yüksek öncelik
-                category_folder = learned_info['folder']  # İngilizce kategori klasörü
-                confidence = learned_info['confidence']
-                
-                # Kategori adını çevir
-                translated_category = self._get_translated_category_name(category_folder)
-                print(f"🎯 {extension} uzantısı TARGET LEARNING ile yerleştirilecek: {translated_category} (confidence: {confidence}%)")
-                
-                # Organization structure'a ekle
-                if category_folder not in self.organization_structure:
-                    self.organization_structure[category_folder] = defaultdict(list)
-                
-                # Alt klasör - uzantı adı
-                subfolder = extension.replace('.', '').upper() if extension else 'Uzantisiz'
-                self.organization_structure[category_folder][subfolder].append(file_info)
-                
-                continue
+            return
+        
+        # ÖNCELİK 2: Mevcut klasörleri kontrol et  
+        suggested_folder = self._find_suitable_target_folder(extension, self._target_folder_analysis)
+        
+        if suggested_folder:
+            # Mevcut klasör bulundu
+            print(f"📁 {lang_manager.get_text('messages.placing_in_category').format(ext=extension, path=suggested_folder)}")
             
-            # ÖNCELİK 2: Mevcut klasörleri kontrol et  
-            suggested_folder = self._find_suitable_target_folder(extension, target_folder_analysis)
+            if suggested_folder not in self.existing_folder_files:
+                self.existing_folder_files[suggested_folder] = self._new_file_list()
             
-            if suggested_folder:
-                # Mevcut klasör bulundu
-                print(f"📁 {lang_manager.get_text('messages.placing_in_category').format(ext=extension, path=suggested_folder)}")
-                
-                if suggested_folder not in self.existing_folder_files:
-                    self.existing_folder_files[suggested_folder] = []
-                
-                self.existing_folder_files[suggested_folder].append(file_info)
-                
+            self.existing_folder_files[suggested_folder].append(file_info)
+            
+        else:
+            # ÖNCELİK 3: Standart kategori kullan - yeni klasör oluştur
+            category, category_info = self.file_ops.get_file_category_with_learning(file_info['path'])
+            main_folder = category_info['folder']
+            
+            # Alt klasör - Other Files için özel işlem
+            if main_folder == "Other Files":
+                # Bilinmeyen uzantılar için dinamik alt klasör oluştur
+                if extension:
+                    subfolder = extension.replace('.', '').upper()  # .iss -> ISS
+                else:
+                    subfolder = 'No_Extension'  # Uzantısız dosyalar için
+                print(f"📁 Bilinmeyen uzantı Other Files'a yerleştiriliyor: {extension} -> Other Files/{subfolder}")
             else:
-                # ÖNCELİK 3: Standart kategori kullan - yeni klasör oluştur
-                category, category_info = self.file_ops.get_file_category_with_learning(file_info['path'])
-                main_folder = category_info['folder']
-                
-                # Alt klasör - Other Files için özel işlem
-                if main_folder == "Other Files":
-                    # Bilinmeyen uzantılar için dinamik alt klasör oluştur
-                    if extension:
-                        subfolder = extension.replace('.', '').upper()  # .iss -> ISS
-                    else:
-                        subfolder = 'No_Extension'  # Uzantısız dosyalar için
-                    print(f"📁 Bilinmeyen uzantı Other Files'a yerleştiriliyor: {extension} -> Other Files/{subfolder}")
+                # Diğer kategoriler için normal işlem
+                if extension in category_info['subfolders']:
+                    subfolder = category_info['subfolders'][extension]
                 else:
-                    # Diğer kategoriler için normal işlem
-                    if extension in category_info['subfolders']:
-                        subfolder = category_info['subfolders'][extension]
-                    else:
-                        subfolder = extension.replace('.', '').upper() if extension else 'Uzantisiz'
-                
-                print(f"📁 {lang_manager.get_text('messages.placing_in_category').format(ext=extension, path=f'{main_folder}/{subfolder}')}")
-                self.organization_structure[main_folder][subfolder].append(file_info)
+                    subfolder = extension.replace('.', '').upper() if extension else 'Uzantisiz'
+            
+            print(f"📁 {lang_manager.get_text('messages.placing_in_category').format(ext=extension, path=f'{main_folder}/{subfolder}')}")
+            self.organization_structure[main_folder][subfolder].append(file_info)
+    
+    def _add_duplicate_to_structure(self, file_info):
+        """Duplikat dosyayı "Duplicate Files" kategorisine kaynak klasör yapısıyla ekle"""
+        duplicate_folder = "Duplicate Files"
+        if duplicate_folder not in self.organization_structure:
+            self.organization_structure[duplicate_folder] = defaultdict(self._new_file_list)
         
-        # Duplikat dosyaları da "Duplicate Files" kategorisine ekle
+        try:
+            # Kaynak dosyanın relative path'ini bul
+            source_base = self.file_ops.source_path
+            relative_path = os.path.relpath(file_info['path'], source_base)
+            
+            # Klasör yapısını koruyarak ekle
+            subfolder_path = os.path.dirname(relative_path)
+            if not subfolder_path or subfolder_path == '.':
+                subfolder_path = 'Root'  # Ana klasördeki dosyalar için
+            
+            # Duplikat dosyayı işaretle
+            file_info['is_duplicate'] = True
+            file_info['original_path'] = relative_path
+            
+            self.organization_structure[duplicate_folder][subfolder_path].append(file_info)
+            print(f"📋 Duplikat preview'a eklendi: {relative_path} -> Duplicate Files/{subfolder_path}")
+            
+        except Exception as e:
+            print(f"⚠️ Duplikat preview ekleme hatası: {e}")
+            # Fallback: direkt ana klasöre ekle
+            self.organization_structure[duplicate_folder]['Duplicates'].append(file_info)
+    
+    def _finish_organization_structure(self):
+        """Akış bittikten sonra organizasyon yapısını tamamla (muhtemel duplikatlar)"""
         if self.duplicate_files:
             print(f"🔍 DUPLIKAT DOSYALAR BULUNDU: {len(self.duplicate_files)} adet")
-            duplicate_folder = "Duplicate Files"
-            if duplicate_folder not in self.organization_structure:
-                self.organization_structure[duplicate_folder] = defaultdict(list)
-            
-            # Duplikat dosyaları kaynak klasör yapısına göre organize et
-            for file_info in self.duplicate_files:
-                try:
-                    # Kaynak dosyanın relative path'ini bul
-                    source_base = self.file_ops.source_path
-                    relative_path = os.path.relpath(file_info['path'], source_base)
-                    
-                    # Klasör yapısını koruyarak ekle
-                    subfolder_path = os.path.dirname(relative_path)
-                    if not subfolder_path or subfolder_path == '.':
-                        subfolder_path = 'Root'  # Ana klasördeki dosyalar için
-                    
-                    # Duplikat dosyayı işaretle
-                    file_info['is_duplicate'] = True
-                    file_info['original_path'] = relative_path
-                    
-                    self.organization_structure[duplicate_folder][subfolder_path].append(file_info)
-                    print(f"📋 Duplikat preview'a eklendi: {relative_path} -> Duplicate Files/{subfolder_path}")
-                    
-                except Exception as e:
-                    print(f"⚠️ Duplikat preview ekleme hatası: {e}")
-                    # Fallback: direkt ana klasöre ekle
-                    self.organization_structure[duplicate_folder]['Duplicates'].append(file_info)
         else:
             print(f"ℹ️ HİÇ DUPLIKAT DOSYA BULUNAMADI - Duplicate Files klasörü oluşturulmayacak")
             print(f"📊 Kontrol edilen dosya sayısı: {len(self.all_scanned_files)}")
@@ -999,10 +1336,17 @@ class ScanEngine:
                     print("🔍 Media dosyaları var ama duplikat bulunamadı - boyut+dimensions eşleşmesi yok")
         
         # Muhtemel duplikatları da "Likely Duplicates" kategorisine ekle
+        self._add_likely_duplicates_to_structure()
+        
+        # Progress tamamla
+        self.gui.progress_bus.publish(100)
+    
+    def _add_likely_duplicates_to_structure(self):
+        """Muhtemel duplikat çiftlerini "Likely Duplicates" kategorisine ekle"""
         if hasattr(self, 'likely_duplicates') and self.likely_duplicates:
             likely_folder = "Likely Duplicates"
             if likely_folder not in self.organization_structure:
-                self.organization_structure[likely_folder] = defaultdict(list)
+                self.organization_structure[likely_folder] = defaultdict(self._new_file_list)
             
             # Muhtemel duplikat çiftlerini organize et
             for i, pair in enumerate(self.likely_duplicates):
@@ -1029,9 +1373,6 @@ class ScanEngine:
                     
                 except Exception as e:
                     print(f"⚠️ Muhtemel duplikat ekleme hatası: {e}")
-        
-        # Progress tamamla
-        self.gui.root.after(0, lambda: self.gui.progress_var.set(100))
     
 
     def _analyze_target_folders(self):
@@ -1333,6 +1674,9 @@ class ScanEngine:
     
     def _update_scan_results(self):
         """Tarama sonuçlarını UI'da göster"""
+        # Bekleyen ilerleme durumu sonuç mesajının üzerine yazmasın
+        self.gui.progress_bus.flush()
+        
         # Source tree'yi güncelle
         self._update_source_tree()
         
@@ -1359,12 +1703,18 @@ class ScanEngine:
                 
         except Exception as e:
             print(f"⚠️ Organize butonu aktif edilemedi: {e}")
+        
+        # Canlı izleme seçiliyse değişiklikleri yeniden taramadan uygula
+        self.start_watch()
     
     def _update_source_tree(self):
         """Kaynak dosyalar tree'sini güncelle"""
         self.gui.source_tree.delete(*self.gui.source_tree.get_children())
         
-        for file_info in self.all_scanned_files[:1000]:  # İlk 1000 dosya
+        with self._watch_lock:
+            files = self.all_scanned_files[:1000]  # İlk 1000 dosya
+        
+        for file_info in files:
             size_str = self._format_size(file_info['size'])
             
             if file_info.get('is_folder', False):
@@ -1402,49 +1752,96 @@ class ScanEngine:
     
     def _update_preview_tree(self):
         """Organizasyon önizleme tree'sini güncelle"""
+        self._render_preview_tree(self._snapshot_preview_tree())
+    
+    def _update_duplicate_tree(self):
+        """Duplikat dosyalar tree'sini güncelle"""
+        self._render_duplicate_tree(self._snapshot_duplicate_tree())
+    
+    def _schedule_live_refresh(self):
+        """Tarama sürerken önizleme/duplikat ağaçlarını yenile
+        
+        Anlık görüntü değiştiren thread'de (tarama veya izleyici) _watch_lock altında
+        alınır, çizim ana thread'de yapılır.
+        """
+        preview_snapshot = self._snapshot_preview_tree()
+        duplicate_snapshot = self._snapshot_duplicate_tree()
+        
+        def refresh():
+            try:
+                self._render_preview_tree(preview_snapshot)
+                self._render_duplicate_tree(duplicate_snapshot)
+            except Exception as e:
+                print(f"⚠️ Canlı önizleme güncelleme hatası: {e}")
+        
+        self.gui.root.after(0, refresh)
+    
+    def _snapshot_preview_tree(self):
+        """Önizleme ağacı için organizasyon yapısının anlık görüntüsü"""
+        snapshot = []
+        with self._watch_lock:
+            for main_folder, subfolders in self.organization_structure.items():
+                entries = []
+                for subfolder, files in subfolders.items():
+                    if subfolder:
+                        entries.append((subfolder, len(files)))
+                    else:
+                        # Boş string ise (Software Packages gibi) dosyalar tek tek gösterilir
+                        entries.extend((None, file_info['name']) for file_info in files)
+                snapshot.append((main_folder, sum(len(files) for files in subfolders.values()), entries))
+        return snapshot
+    
+    def _snapshot_duplicate_tree(self):
+        """Duplikat ağacı için grupların anlık görüntüsü"""
+        snapshot = []
+        with self._watch_lock:
+            for duplicate_group in self.source_duplicates:
+                if len(duplicate_group) > 1:
+                    snapshot.append([(f['name'], f['path'], f['size'], f.get('hash')) for f in duplicate_group])
+        return snapshot
+    
+    def _render_preview_tree(self, snapshot):
+        """Önizleme ağacını anlık görüntüden çiz"""
         self.gui.preview_tree.delete(*self.gui.preview_tree.get_children())
         
-        for main_folder, subfolders in self.organization_structure.items():
+        for main_folder, total_files, entries in snapshot:
             # Ana klasör - çeviri ile göster
             display_folder_name = self._get_translated_category_name(main_folder)
-            total_files = sum(len(files) for files in subfolders.values())
             main_item = self.gui.preview_tree.insert('', 'end', 
                                                    text=f"📁 {display_folder_name}",
                                                    values=(total_files,))
             
             # Alt klasörler
-            for subfolder, files in subfolders.items():
+            for subfolder, value in entries:
                 if subfolder:  # Boş değilse
                     self.gui.preview_tree.insert(main_item, 'end',
                                                text=f"📂 {subfolder}",
-                                               values=(len(files),))
-                else:  # Boş string ise (Software Packages gibi)
-                    for file_info in files:
-                        self.gui.preview_tree.insert(main_item, 'end',
-                                                   text=f"📁 {file_info['name']}",
-                                                   values=(1,))
+                                               values=(value,))
+                else:  # Software Packages klasörleri
+                    self.gui.preview_tree.insert(main_item, 'end',
+                                               text=f"📁 {value}",
+                                               values=(1,))
     
-    def _update_duplicate_tree(self):
-        """Duplikat dosyalar tree'sini güncelle"""
+    def _render_duplicate_tree(self, snapshot):
+        """Duplikat ağacını anlık görüntüden çiz"""
+        from lang_manager import t
         self.gui.duplicate_tree.delete(*self.gui.duplicate_tree.get_children())
         
-        for i, duplicate_group in enumerate(self.source_duplicates):
-            if len(duplicate_group) > 1:
-                # Grup başlığı
-                from lang_manager import t
-                group_name = f"{t('messages.duplicate_group')} {i+1} ({len(duplicate_group)} {t('messages.files_lowercase')})"
-                group_item = self.gui.duplicate_tree.insert('', 'end', 
-                                                          text=group_name,
-                                                          values=('', '', ''))
+        for i, duplicate_group in enumerate(snapshot):
+            # Grup başlığı
+            group_name = f"{t('messages.duplicate_group')} {i+1} ({len(duplicate_group)} {t('messages.files_lowercase')})"
+            group_item = self.gui.duplicate_tree.insert('', 'end', 
+                                                      text=group_name,
+                                                      values=('', '', ''))
+            
+            # Grup dosyaları
+            for name, path, size, file_hash in duplicate_group:
+                size_str = self._format_size(size)
+                hash_str = file_hash[:8] + '...' if file_hash else ''
                 
-                # Grup dosyaları
-                for file_info in duplicate_group:
-                    size_str = self._format_size(file_info['size'])
-                    hash_str = file_info.get('hash', '')[:8] + '...' if file_info.get('hash') else ''
-                    
-                    self.gui.duplicate_tree.insert(group_item, 'end',
-                                                 text=file_info['name'],
-                                                 values=(file_info['path'], size_str, hash_str))
+                self.gui.duplicate_tree.insert(group_item, 'end',
+                                             text=name,
+                                             values=(path, size_str, hash_str))
     
     def _show_scan_statistics(self):
         """Tarama istatistiklerini göster"""
@@ -1472,7 +1869,10 @@ class ScanEngine:
                     stats_message += f"\n• {category.title()}: {count} dosya"
         
         from lang_manager import t
-        self.gui.status_var.set(f"✅ {total_files} {t('messages.files_scanned')} - {unique_files} {t('messages.unique')}, {duplicate_files} {t('messages.duplicate')}")
+        status = f"✅ {total_files} {t('messages.files_scanned')} - {unique_files} {t('messages.unique')}, {duplicate_files} {t('messages.duplicate')}"
+        if self.hash_cache_stats:
+            status += " - " + t('messages.hash_cache_summary', **self.hash_cache_stats)
+        self.gui.status_var.set(status)
         
         # İsteğe bağlı detaylı rapor - popup kaldırıldı
         # if total_files > 0:
@@ -1567,28 +1967,282 @@ class ScanEngine:
         if self.scan_thread and self.scan_thread.is_alive():
             self.gui.status_var.set("Tarama durduruluyor...")
     
+    def start_watch(self):
+        """Kaynak ve hedef klasörü izlemeye başla (ana thread, tarama bittikten sonra)"""
+        self.stop_watch()
+        if not self.gui.watch_changes.get() or self.stop_scanning or not self.all_scanned_files:
+            return
+        if self.spill_session:
+            print("⚠️ Bellek bütçeli taramada canlı izleme kullanılamaz (kayıtlar diskte)")
+            return
+        
+        try:
+            # Silme/değişiklik olaylarında kayda ve duplikat grubuna hızlı erişim
+            self._watch_index = {file_info['path']: file_info for file_info in self.all_scanned_files}
+            self._record_keys = {id(member): key for key, group in self._duplicate_groups.items()
+                                 for member in group}
+            
+            self.scan_watcher = ScanWatcher([self.file_ops.source_path, self.file_ops.target_path],
+                                            self._apply_watch_batch,
+                                            dir_filter=self.ignore_rules.dir_filter,
+                                            file_filter=self.ignore_rules.file_filter,
+                                            recursive=self._scan_mode != "files_only")
+            self.scan_watcher.start()
+        except Exception as e:
+            print(f"⚠️ Klasör izleme başlatılamadı: {e}")
+            self.stop_watch()
+    
+    def stop_watch(self):
+        """Canlı izlemeyi durdur (yeni tarama, organizasyon veya çıkış öncesi)"""
+        if self.scan_watcher:
+            self.scan_watcher.stop()
+            self.scan_watcher = None
+            print("👁️ Klasör izleme durduruldu")
+        # Uygulanmakta olan grup bitsin, sonra gelenler boşa düşsün
+        with self._watch_lock:
+            self._watch_index = None
+            self._record_keys = None
+    
+    def _apply_watch_batch(self, batch):
+        """Debounce edilmiş değişiklikleri tarama sonuçlarına uygula (izleyici thread'i)"""
+        with self._watch_lock:
+            if self._watch_index is None:
+                return
+            self._apply_watch_batch_locked(batch)
+    
+    def _apply_watch_batch_locked(self, batch):
+        source_path = os.path.normpath(self.file_ops.source_path)
+        target_path = os.path.normpath(self.file_ops.target_path)
+        
+        def under(path, root):
+            return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+        
+        target_changed = batch.rescan
+        changed, deleted = set(), set()
+        for paths, bucket in ((batch.changed, changed), (batch.deleted, deleted)):
+            for path in paths:
+                if under(path, target_path):
+                    target_changed = True
+                elif under(path, source_path):
+                    bucket.add(path)
+        
+        if batch.rescan:
+            # Olay kuyruğu taştı - tüm kayıtları sil, kaynağın üst seviyesini yeniden ekle
+            deleted.update(self._watch_index)
+            try:
+                with os.scandir(source_path) as entries:
+                    changed.update(entry.path for entry in entries)
+            except OSError:
+                pass
+        
+        if changed or deleted:
+            self._apply_source_changes(changed, deleted)
+        
+        if target_changed:
+            # Hedef analizi ve öğrenme yeniden yapılır, dosyalar yeniden yerleştirilir (disk taraması yok)
+            self._rebuild_organization_structure()
+        elif (changed or deleted) and self._dup_checks['similar']:
+            self._refresh_likely_duplicates()
+        
+        self.stats['unique_files'] = len(self.unique_files)
+        self.stats['duplicate_files'] = len(self.duplicate_files)
+        
+        print(f"👁️ {len(batch)} değişiklik uygulandı (kaynak: {len(changed) + len(deleted)}, hedef: {target_changed})")
+        self._schedule_live_refresh()
+        self.gui.root.after(0, lambda: self._on_watch_batch_applied(len(batch)))
+    
+    def _on_watch_batch_applied(self, count):
+        """İzleme sonrası kaynak ağacı ve durum satırı (ana thread)"""
+        try:
+            self._update_source_tree()
+            backend = self.scan_watcher.backend_name if self.scan_watcher else ""
+            self.gui.status_var.set(lang_manager.get_text('messages.watch_applied').format(count=count, backend=backend))
+        except Exception as e:
+            print(f"⚠️ İzleme sonucu gösterilemedi: {e}")
+    
+    def _apply_source_changes(self, changed, deleted):
+        """Kaynak değişikliklerini kayıt seviyesine indir, eski kayıtları çıkar, yenilerini ekle
+        
+        "all" modunda kayıtlar dosyalardır; "none" ve "files_only" modlarında sadece
+        kaynağın üst seviyesindeki öğeler kayıttır (alt klasördeki değişiklik "none" modunda
+        üst seviye klasör kaydının boyutunu değiştirir).
+        """
+        source_path = os.path.normpath(self.file_ops.source_path)
+        remove_paths = set()
+        add_paths = set()
+        
+        for path in changed | deleted:
+            parts = os.path.relpath(path, source_path).split(os.sep)
+            if self._scan_mode == "all":
+                remove_paths.add(path)
+                if path in changed:
+                    add_paths.add(path)
+                continue
+            
+            if self._scan_mode == "files_only" and len(parts) > 1:
+                continue
+            top_path = os.path.join(source_path, parts[0])
+            remove_paths.add(top_path)
+            if path in changed or len(parts) > 1:
+                add_paths.add(top_path)
+        
+        # Silinecek kayıtlar - klasör yolları tüm alt kayıtları kapsar
+        removed = {}
+        prefixes = []
+        for path in remove_paths:
+            file_info = self._watch_index.get(path)
+            if file_info is not None:
+                removed[path] = file_info
+            else:
+                prefixes.append(path.rstrip(os.sep) + os.sep)
+        if prefixes:
+            prefixes = tuple(prefixes)
+            removed.update((path, file_info) for path, file_info in self._watch_index.items()
+                           if path.startswith(prefixes))
+        if removed:
+            self._remove_records(list(removed.values()))
+        
+        # Yeni / değişen kayıtlar
+        added = {}
+        for path in add_paths:
+            for file_info in self._records_for_watch_path(path):
+                added[file_info['path']] = file_info
+        for path, file_info in added.items():
+            try:
+                self._ingest_file(file_info)
+            except Exception as e:
+                print(f"Dosya işlenirken hata: {path} - {e}")
+                continue
+            self._watch_index[path] = file_info
+            self.all_scanned_files.append(file_info)
+    
+    def _records_for_watch_path(self, path):
+        """İzlenen yol için (tarama moduna uygun) yeni kayıtlar üret"""
+        name = os.path.basename(path)
+        try:
+            if os.path.isdir(path):
+                if self.ignore_rules.is_hidden_folder(name):
+                    return []
+                if self._scan_mode == "all":
+                    walker = DirWalker(dir_filter=self.ignore_rules.dir_filter,
+                                       file_filter=self.ignore_rules.file_filter)
+                    return [self._file_info_from_entry(entry) for entry in walker.walk(path)]
+                if self._scan_mode == "none":
+                    self.folder_aggregates.invalidate(path)
+                    stat = os.stat(path)
+                    return [self.record_store.create(path, self._get_folder_size(path), stat.st_mtime_ns,
+                                                     stat.st_ino, is_folder=True)]
+                return []
+            if os.path.isfile(path) and not self.ignore_rules.is_hidden_file(name):
+                return [self._get_file_info(path)]
+        except OSError as e:
+            print(f"⚠️ İzlenen yol okunamadı: {path} - {e}")
+        return []
+    
+    def _remove_records(self, records):
+        """Kayıtları listelerden, duplikat gruplarından ve organizasyon yapısından çıkar
+        
+        Grubun orijinali silinirse sıradaki duplikat orijinal olur ve normal kategorisine taşınır.
+        """
+        removed_ids = {id(file_info) for file_info in records}
+        promoted = []
+        
+        for file_info in records:
+            self._watch_index.pop(file_info['path'], None)
+            self.stats['total_files'] -= 1
+            self.stats['total_size'] -= file_info['size']
+            self.stats['categories'][self._stat_category(file_info)] -= 1
+            
+            key = self._record_keys.pop(id(file_info), None)
+            group = self._duplicate_groups.get(key)
+            if group is None:
+                continue
+            
+            was_original = group[0] is file_info
+            group[:] = [member for member in group if member is not file_info]
+            if not group:
+                del self._duplicate_groups[key]
+            elif was_original:
+                promoted.append(group[0])
+            if len(group) == 1:
+                self.source_duplicates = [g for g in self.source_duplicates if g is not group]
+        
+        # Orijinal olan duplikatlar "Duplicate Files" kategorisinden çıkar
+        promoted_ids = {id(file_info) for file_info in promoted}
+        moved_ids = removed_ids | promoted_ids
+        
+        self.all_scanned_files = [f for f in self.all_scanned_files if id(f) not in removed_ids]
+        self.unique_files = [f for f in self.unique_files if id(f) not in removed_ids]
+        self.duplicate_files = [f for f in self.duplicate_files if id(f) not in moved_ids]
+        
+        # Yeni yapı yerelde kurulur ve tek atamayla değiştirilir
+        structure = defaultdict(lambda: defaultdict(self._new_file_list))
+        for main_folder, subfolders in self.organization_structure.items():
+            for subfolder, files in subfolders.items():
+                files = [f for f in files if id(f) not in moved_ids]
+                if files:
+                    structure[main_folder][subfolder] = files
+        self.organization_structure = structure
+        
+        existing_folder_files = defaultdict(self._new_file_list)
+        for folder, files in self.existing_folder_files.items():
+            files = [f for f in files if id(f) not in removed_ids]
+            if files:
+                existing_folder_files[folder] = files
+        self.existing_folder_files = existing_folder_files
+        
+        for file_info in promoted:
+            if file_info.extra:
+                file_info.extra.pop('is_duplicate', None)
+                file_info.extra.pop('original_path', None)
+            self.unique_files.append(file_info)
+            self._categorize_file(file_info)
+    
+    def _refresh_likely_duplicates(self):
+        """Muhtemel duplikatları güncel unique dosyalarla yeniden hesapla"""
+        self.organization_structure.pop("Likely Duplicates", None)
+        self._detect_likely_duplicates()
+        self._add_likely_duplicates_to_structure()
+    
+    def _rebuild_organization_structure(self):
+        """Hedef değiştiğinde yerleşimi mevcut kayıtlarla yeniden kur
+        
+        İzleyici thread'inde _watch_lock altında çalışır; okuyucular aynı kilidi
+        aldığından yarım kurulmuş yapıyı görmez.
+        """
+        self._prepare_organization_structure()
+        for file_info in self.unique_files:
+            self._categorize_file(file_info)
+        for file_info in self.duplicate_files:
+            self._add_duplicate_to_structure(file_info)
+        if self._dup_checks['similar']:
+            self._detect_likely_duplicates()
+        self._add_likely_duplicates_to_structure()
+    
     def get_organization_preview(self):
         """Organizasyon önizlemesi al"""
         preview = {}
         
-        for main_folder, subfolders in self.organization_structure.items():
-            preview[main_folder] = {}
-            for subfolder, files in subfolders.items():
-                preview[main_folder][subfolder] = {
-                    'count': len(files),
-                    'size': sum(f['size'] for f in files),
-                    'files': [f['name'] for f in files[:10]]  # İlk 10 dosya
-                }
+        with self._watch_lock:
+            for main_folder, subfolders in self.organization_structure.items():
+                preview[main_folder] = {}
+                for subfolder, files in subfolders.items():
+                    preview[main_folder][subfolder] = {
+                        'count': len(files),
+                        'size': sum(f['size'] for f in files),
+                        'files': [f['name'] for f in files[:10]]  # İlk 10 dosya
+                    }
         
         return preview
     
     def get_scan_summary(self):
         """Tarama özetini al"""
-        return {
-            'total_files': self.stats['total_files'],
-            'unique_files': self.stats['unique_files'],
-            'duplicate_files': self.stats['duplicate_files'],
-            'total_size': self.stats['total_size'],
-            'categories': dict(self.stats['categories']),
-            'duplicate_groups': len(self.source_duplicates)
-        } 
\ No newline at end of file
+        with self._watch_lock:
+            return {
+                'total_files': self.stats['total_files'],
+                'unique_files': self.stats['unique_files'],
+                'duplicate_files': self.stats['duplicate_files'],
+                'total_size': self.stats['total_size'],
+                'categories': dict(self.stats['categories']),
+                'duplicate_groups': len(self.source_duplicates)
+            } 
\ No newline at end of file
@@ -0,0 +1,354 @@
+"""
+Scan Index Module
+Kaynak klasör taraması için kalıcı, artımlı (incremental) dosya indeksi
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from file_records import FileRecordStore
+
+
+class ScanIndex:
+    """SQLite tabanlı kalıcı tarama indeksi
+
+    Her dizin için son görülen mtime_ns, her dosya için boyut, mtime_ns,
+    inode ve önbelleğe alınmış hash/media boyutları saklanır. Yeniden
+    taramada mtime'ı değişmemiş dizinler listelenmez, kayıtları indeksten
+    okunur.
+    """
+
+    INDEX_FILENAME = '.scan_index.db'
+    SCHEMA_VERSION = 3  # 2: video boyutları artık başlıktan okunuyor, 3: position sütunu (listeleme sırası)
+
+    def __init__(self, index_dir, record_store=None):
+        self.index_dir = index_dir
+        self.record_store = record_store or FileRecordStore()
+        self.db_path = os.path.join(index_dir, self.INDEX_FILENAME)
+        self.conn = None
+        self.lock = threading.Lock()
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self):
+        return {
+            'dirs_listed': 0,
+            'dirs_reused': 0,
+            'files_reused': 0,
+            'files_updated': 0,
+            'files_removed': 0
+        }
+
+    def open(self):
+        """İndeks veritabanını aç (yoksa oluştur)"""
+        if self.conn:
+            return
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+        if row is not None and int(row[0]) != self.SCHEMA_VERSION:
+            # Uyumsuz şema - tablolar yeni sütunlarla yeniden oluşturulur
+            self.conn.executescript("""
+                DROP TABLE IF EXISTS directories;
+                DROP TABLE IF EXISTS files;
+            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER,
+                position INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories(parent);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                dir TEXT,
+                name TEXT,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER,
+                hash TEXT,
+                dimensions TEXT,
+                position INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+        """)
+        self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema_version', ?)",
+                          (str(self.SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        """İndeksi kaydet ve kapat"""
+        if self.conn:
+            try:
+                self.conn.commit()
+                self.conn.close()
+            finally:
+                self.conn = None
+
+    def clear(self):
+        """Tüm indeks kayıtlarını sil"""
+        with self.lock:
+            self.conn.execute("DELETE FROM directories")
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema_version', ?)",
+                              (str(self.SCHEMA_VERSION),))
+            self.conn.commit()
+
+    def scan(self, root_path, is_hidden_folder, is_hidden_file, should_stop=None, verify_files=True,
+             rules_fingerprint=None):
+        """Kaynak ağacını indeks yardımıyla tara, dosya kayıtlarını üret (generator)
+
+        verify_files=True: mtime'ı değişmemiş dizinlerde listeleme atlanır ama
+        dosyalar tek tek stat edilir (touch edilen dosyalar yakalanır).
+        verify_files=False: sadece hash/boyut önbelleği olan dosyalar doğrulanır.
+        rules_fingerprint: yok sayma kurallarının özeti - indeksi oluşturan kurallardan
+        farklıysa indeks sıfırlanır (kayıtlar listeleme anındaki kurallarla süzülmüştür).
+        """
+        self.stats = self._empty_stats()
+        if rules_fingerprint is not None:
+            self._check_rules(rules_fingerprint)
+        root_path = os.path.normpath(root_path)
+        stack = [root_path]
+        pending = 0
+
+        while stack:
+            if should_stop and should_stop():
+                break
+
+            dir_path = stack.pop()
+            try:
+                dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                # Dizin silinmiş veya taşınmış - tüm alt ağacı indeksten çıkar
+                self._remove_subtree(dir_path)
+                continue
+
+            with self.lock:
+                row = self.conn.execute("SELECT mtime_ns FROM directories WHERE path=?",
+                                        (dir_path,)).fetchone()
+
+            if row is not None and row[0] == dir_mtime_ns:
+                self.stats['dirs_reused'] += 1
+                for record in self._reuse_directory(dir_path, verify_files):
+                    yield record
+                with self.lock:
+                    children = self.conn.execute("SELECT path FROM directories WHERE parent=? ORDER BY position",
+                                                 (dir_path,)).fetchall()
+                # os.walk ile aynı sıra (duplikat grubunun orijinali taramadan taramaya değişmesin)
+                stack.extend(child[0] for child in reversed(children))
+            else:
+                self.stats['dirs_listed'] += 1
+                records, subdirs = self._list_directory(dir_path, dir_mtime_ns, is_hidden_folder, is_hidden_file)
+                for record in records:
+                    yield record
+                stack.extend(reversed(subdirs))
+
+            pending += 1
+            if pending >= 200:
+                with self.lock:
+                    self.conn.commit()
+                pending = 0
+
+        with self.lock:
+            self.conn.commit()
+
+    def _check_rules(self, rules_fingerprint):
+        """Yok sayma kuralları değiştiyse dizin/dosya kayıtlarını sil"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key='ignore_rules'").fetchone()
+        if row is not None and row[0] == rules_fingerprint:
+            return
+        if row is not None:
+            print("🙈 Yok sayma kuralları değişti - tarama indeksi sıfırlanıyor")
+            self.clear()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('ignore_rules', ?)",
+                              (rules_fingerprint,))
+            self.conn.commit()
+
+    def _list_directory(self, dir_path, dir_mtime_ns, is_hidden_folder, is_hidden_file):
+        """Değişmiş dizini os.scandir ile listele ve indeksi güncelle"""
+        with self.lock:
+            stored = {
+                row[0]: row for row in self.conn.execute(
+                    "SELECT name, size, mtime_ns, inode, hash, dimensions, position FROM files WHERE dir=?",
+                    (dir_path,))
+            }
+            stored_by_inode = {row[3]: row for row in stored.values()}
+            stored_subdirs = {
+                row[0] for row in self.conn.execute(
+                    "SELECT path FROM directories WHERE parent=?", (dir_path,))
+            }
+
+        records = []
+        subdirs = []
+        seen_names = set()
+        upserts = []
+        moved = []
+
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_hidden_folder(entry.name):
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file() or is_hidden_file(entry.name):
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+
+                    seen_names.add(entry.name)
+                    old = stored.get(entry.name)
+                    if old is None and st.st_ino:
+                        # Aynı dizinde yeniden adlandırılmış dosya: inode eşleşirse önbellek korunur
+                        old = stored_by_inode.get(st.st_ino)
+                    position = len(records)
+                    if old and self._same_file(old[1], old[2], old[3], st):
+                        file_hash, dimensions = old[4], old[5]
+                        self.stats['files_reused'] += 1
+                        if old[0] != entry.name:
+                            upserts.append((entry.path, dir_path, entry.name, st.st_size,
+                                            st.st_mtime_ns, st.st_ino, file_hash, dimensions, position))
+                        elif old[6] != position:
+                            moved.append((position, entry.path))
+                    else:
+                        # Yeni, değişmiş veya yeniden adlandırılmış dosya - önbelleği geçersiz kıl
+                        file_hash, dimensions = None, None
+                        self.stats['files_updated'] += 1
+                        upserts.append((entry.path, dir_path, entry.name, st.st_size,
+                                        st.st_mtime_ns, st.st_ino, None, None, position))
+
+                    records.append(self._make_record(entry.path, entry.name, st.st_size, st.st_mtime_ns,
+                                                     st.st_ino, file_hash, dimensions))
+        except OSError:
+            return records, subdirs
+
+        removed = [name for name in stored if name not in seen_names]
+        removed_dirs = stored_subdirs.difference(subdirs)
+
+        with self.lock:
+            if upserts:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO files(path, dir, name, size, mtime_ns, inode, hash, dimensions, position) "
+                    "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts)
+            if moved:
+                self.conn.executemany("UPDATE files SET position=? WHERE path=?", moved)
+            if removed:
+                self.conn.executemany("DELETE FROM files WHERE path=?",
+                                      [(os.path.join(dir_path, name),) for name in removed])
+                self.stats['files_removed'] += len(removed)
+            # Sıra (position) listeleme anında yazılır: INSERT OR REPLACE rowid'i değiştirdiği için
+            # rowid sırası güvenilmez. Alt dizinlerin mtime'ı ilk ziyarette yazılır (NULL = listelenmemiş).
+            self.conn.execute(
+                "INSERT INTO directories(path, parent, mtime_ns) VALUES(?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET parent=excluded.parent, mtime_ns=excluded.mtime_ns",
+                (dir_path, os.path.dirname(dir_path), dir_mtime_ns))
+            self.conn.executemany(
+                "INSERT INTO directories(path, parent, position) VALUES(?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET parent=excluded.parent, position=excluded.position",
+                [(subdir, dir_path, position) for position, subdir in enumerate(subdirs)])
+
+        for removed_dir in removed_dirs:
+            self._remove_subtree(removed_dir)
+
+        return records, subdirs
+
+    def _reuse_directory(self, dir_path, verify_files):
+        """mtime'ı değişmemiş dizinin kayıtlarını indeksten üret"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT path, name, size, mtime_ns, inode, hash, dimensions FROM files WHERE dir=? ORDER BY position",
+                (dir_path,)).fetchall()
+
+        stale = []
+        records = []
+        for path, name, size, mtime_ns, inode, file_hash, dimensions in rows:
+            if verify_files or file_hash or dimensions:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    # Dizin mtime'ı güncellenmeden kaybolan dosya
+                    stale.append((path,))
+                    continue
+                if not self._same_file(size, mtime_ns, inode, st):
+                    # Dosya yerinde değiştirilmiş (touch) - önbelleği sıfırla
+                    size, mtime_ns, inode = st.st_size, st.st_mtime_ns, st.st_ino
+                    file_hash, dimensions = None, None
+                    self.stats['files_updated'] += 1
+                    with self.lock:
+                        self.conn.execute(
+                            "UPDATE files SET size=?, mtime_ns=?, inode=?, hash=NULL, dimensions=NULL WHERE path=?",
+                            (size, mtime_ns, inode, path))
+                    records.append(self._make_record(path, name, size, mtime_ns, inode, None, None))
+                    continue
+            self.stats['files_reused'] += 1
+            records.append(self._make_record(path, name, size, mtime_ns, inode, file_hash, dimensions))
+
+        if stale:
+            with self.lock:
+                self.conn.executemany("DELETE FROM files WHERE path=?", stale)
+            self.stats['files_removed'] += len(stale)
+
+        return records
+
+    def _same_file(self, size, mtime_ns, inode, st):
+        """Kayıt ile stat sonucu aynı dosya içeriğini mi gösteriyor?"""
+        if size != st.st_size or mtime_ns != st.st_mtime_ns:
+            return False
+        # Windows'ta DirEntry.stat() inode döndürmez (0) - sadece ikisi de varsa karşılaştır
+        if inode and st.st_ino and inode != st.st_ino:
+            return False
+        return True
+
+    def _remove_subtree(self, dir_path):
+        """Dizini ve altındaki tüm kayıtları indeksten sil"""
+        prefix = dir_path.rstrip(os.sep) + os.sep
+        with self.lock:
+            cursor = self.conn.execute(
+                "DELETE FROM files WHERE dir=? OR substr(dir, 1, ?)=?",
+                (dir_path, len(prefix), prefix))
+            self.stats['files_removed'] += max(cursor.rowcount, 0)
+            self.conn.execute(
+                "DELETE FROM directories WHERE path=? OR substr(path, 1, ?)=?",
+                (dir_path, len(prefix), prefix))
+
+    def _make_record(self, path, name, size, mtime_ns, inode, file_hash, dimensions):
+        """ScanEngine ile uyumlu kompakt dosya kaydı oluştur"""
+        return self.record_store.create(path, size, mtime_ns, inode, file_hash, dimensions or None)
+
+    def store_media_info(self, records):
+        """Hesaplanan hash ve media boyutlarını indekse yaz"""
+        updates = []
+        for record in records:
+            if record.get('is_folder') or 'mtime_ns' not in record:
+                continue
+            file_hash = record.get('hash')
+            dimensions = record.get('dimensions')
+            if file_hash or dimensions:
+                updates.append((file_hash, dimensions, record['path'], record['size'], record['mtime_ns']))
+
+        if not updates:
+            return 0
+
+        with self.lock:
+            # Sadece kayıt hâlâ aynı dosyayı temsil ediyorsa güncelle
+            self.conn.executemany(
+                "UPDATE files SET hash=COALESCE(?, hash), dimensions=COALESCE(?, dimensions) "
+                "WHERE path=? AND size=? AND mtime_ns=?", updates)
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('last_update', ?)",
+                              (str(time.time()),))
+            self.conn.commit()
+        return len(updates)
+
+    def get_stats_text(self):
+        """İndeks istatistiklerini kısa metin olarak döndür"""
+        s = self.stats
+        return (f"📇 İndeks: {s['dirs_listed']} dizin listelendi, {s['dirs_reused']} dizin yeniden kullanıldı, "
+                f"{s['files_reused']} dosya önbellekten, {s['files_updated']} güncellendi, "
+                f"{s['files_removed']} silindi")
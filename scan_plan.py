@@ -0,0 +1,419 @@
+"""
+Scan Plan Module
+Tarama sonuçlarını (kayıtlar, duplikat grupları, organizasyon yapısı) JSON Lines planı olarak
+kaydeder / yükler ve organizasyondan önce stat ile doğrular
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox, filedialog
+from lang_manager import lang_manager
+
+PLAN_VERSION = 1
+
+# Uzun id listeleri satırlara bölünür (okuma/yazma akış halinde kalsın)
+IDS_PER_LINE = 10000
+
+
+def _open_plan(path, mode, compressed=None):
+    """.gz uzantılı planlar sıkıştırılmış yazılır/okunur"""
+    if compressed is None:
+        compressed = path.endswith('.gz')
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _tuple_or_value(value):
+    # JSON tuple'ları listeye çevirir - media boyutları karşılaştırmalarda tuple olarak kalmalı
+    return tuple(value) if isinstance(value, list) else value
+
+
+class ScanPlanManager:
+    """Tarama planı kaydetme / yükleme / doğrulama
+
+    Plan dosyası her satırı bir JSON dizisi olan JSON Lines dosyasıdır:
+      ["plan", {...}]                    başlık (yollar, tarama modu, kontroller, istatistikler)
+      ["dir", id, yol]                   paylaşılan klasör yolu
+      ["rec", id, dir_id, isim, boyut, mtime_ns, inode, hash, boyutlar, klasör_mü, extra]
+      ["list", ad, [id...]]              all / unique / duplicate listeleri
+      ["group", [id...]]                 duplikat grubu (ilk id orijinal)
+      ["likely", id1, id2, {...}]        muhtemel duplikat çifti
+      ["org", ana, alt, [id...]]         organization_structure
+      ["existing", klasör, [id...]]      existing_folder_files
+      ["end", kayıt_sayısı]              tam yazıldığının işareti
+    """
+
+    def __init__(self, gui_manager, file_operations, scan_engine):
+        self.gui = gui_manager
+        self.file_ops = file_operations
+        self.scan_engine = scan_engine
+
+    # ------------------------------------------------------------------ UI
+    def save_plan(self):
+        """Mevcut tarama sonucunu plan dosyasına kaydet"""
+        if not self.scan_engine.all_scanned_files:
+            messagebox.showwarning(lang_manager.get_text('warnings.warning'),
+                                   lang_manager.get_text('scan_plan.nothing_to_save'))
+            return
+        if self.scan_engine.spill_session:
+            # Diske taşan kayıtlar okunurken yeni nesne olur - kimlik eşlemesi kurulamaz
+            messagebox.showwarning(lang_manager.get_text('warnings.warning'),
+                                   lang_manager.get_text('scan_plan.spill_unsupported'))
+            return
+
+        filename = filedialog.asksaveasfilename(
+            title=lang_manager.get_text('scan_plan.save_title'),
+            defaultextension=".jsonl.gz",
+            filetypes=[("Scan plan", "*.jsonl.gz"), ("JSON Lines", "*.jsonl"), ("*", "*.*")],
+            initialfile=f"scan_plan_{time.strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+        )
+        if not filename:
+            return
+
+        def worker():
+            try:
+                # Canlı izleme yazma sırasında listeleri/yapıyı değiştirmesin
+                with self.scan_engine._watch_lock:
+                    count = self.write_plan(filename)
+                message = lang_manager.get_text('scan_plan.saved').format(count=count, path=filename)
+                self.gui.root.after(0, lambda: self.gui.status_var.set(message))
+            except Exception as e:
+                error = f"{lang_manager.get_text('scan_plan.save_error')}: {e}"
+                self.gui.root.after(0, lambda: messagebox.showerror(lang_manager.get_text('dialogs.error.title'), error))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def load_plan(self):
+        """Plan dosyasını yükle ve önizlemeleri göster"""
+        filename = filedialog.askopenfilename(
+            title=lang_manager.get_text('scan_plan.load_title'),
+            filetypes=[("Scan plan", "*.jsonl.gz *.jsonl"), ("*", "*.*")]
+        )
+        if not filename:
+            return
+
+        # Eski taramanın izlemesi yüklenen plana karışmasın
+        self.scan_engine.stop_watch()
+
+        def worker():
+            try:
+                header = self.read_plan(filename)
+                self.gui.root.after(0, lambda: self._show_loaded_plan(header, filename))
+            except Exception as e:
+                error = f"{lang_manager.get_text('scan_plan.load_error')}: {e}"
+                self.gui.root.after(0, lambda: messagebox.showerror(lang_manager.get_text('dialogs.error.title'), error))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_loaded_plan(self, header, filename):
+        """Yüklenen planı ağaçlarda göster ve organizasyonu etkinleştir (ana thread)"""
+        engine = self.scan_engine
+        self.gui.source_var.set(self.file_ops.source_path)
+        self.gui.target_var.set(self.file_ops.target_path)
+
+        engine._update_source_tree()
+        engine._update_preview_tree()
+        engine._update_duplicate_tree()
+        engine._show_scan_statistics()
+
+        if 'organize_btn' in self.gui.ui_widgets:
+            self.gui.ui_widgets['organize_btn'].configure(state='normal')
+
+        created = time.strftime('%Y-%m-%d %H:%M', time.localtime(header.get('created', 0)))
+        self.gui.status_var.set(lang_manager.get_text('scan_plan.loaded').format(
+            count=len(engine.all_scanned_files), created=created))
+        print(f"📂 Tarama planı yüklendi: {filename}")
+
+    # ------------------------------------------------------------ Yazma
+    def write_plan(self, path):
+        """Tarama durumunu plana yaz - yazılan kayıt sayısını döndür"""
+        engine = self.scan_engine
+        record_ids = {}
+        dir_ids = {}
+
+        def dump(f, item):
+            f.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+
+        def ids_of(records):
+            return [record_ids[id(record)] for record in records]
+
+        def dump_chunked(f, prefix, records):
+            ids = ids_of(records)
+            for start in range(0, max(len(ids), 1), IDS_PER_LINE):
+                dump(f, prefix + [ids[start:start + IDS_PER_LINE]])
+
+        def dump_record(f, record):
+            if id(record) in record_ids:
+                return
+            directory = record.directory
+            dir_id = dir_ids.get(directory)
+            if dir_id is None:
+                dir_id = dir_ids[directory] = len(dir_ids)
+                dump(f, ["dir", dir_id, directory])
+            record_id = record_ids[id(record)] = len(record_ids)
+            dump(f, ["rec", record_id, dir_id, record.name, record.size, record.mtime_ns, record.inode,
+                     record.hash, record.dimensions, record.is_folder, record.extra])
+
+        stats = dict(engine.stats)
+        stats['categories'] = dict(stats['categories'])
+        temp_path = path + '.tmp'
+
+        with _open_plan(temp_path, 'w', compressed=path.endswith('.gz')) as f:
+            dump(f, ["plan", {
+                'version': PLAN_VERSION,
+                'created': time.time(),
+                'source_path': self.file_ops.source_path,
+                'target_path': self.file_ops.target_path,
+                'scan_mode': engine._scan_mode,
+                'dup_checks': getattr(engine, '_dup_checks', {}),
+                'stats': stats,
+            }])
+
+            for record in engine.all_scanned_files:
+                dump_record(f, record)
+            # Muhtemel duplikat kopyaları gibi sadece yapıda bulunan kayıtlar
+            for subfolders in engine.organization_structure.values():
+                for files in subfolders.values():
+                    for record in files:
+                        dump_record(f, record)
+
+            dump_chunked(f, ["list", "all"], engine.all_scanned_files)
+            dump_chunked(f, ["list", "unique"], engine.unique_files)
+            dump_chunked(f, ["list", "duplicate"], engine.duplicate_files)
+
+            for group in engine.source_duplicates:
+                dump(f, ["group", ids_of(group)])
+
+            for pair in getattr(engine, 'likely_duplicates', []):
+                details = {key: value for key, value in pair.items() if key not in ('file1', 'file2')}
+                dump(f, ["likely", record_ids[id(pair['file1'])], record_ids[id(pair['file2'])], details])
+
+            for main_folder, subfolders in engine.organization_structure.items():
+                for subfolder, files in subfolders.items():
+                    dump_chunked(f, ["org", main_folder, subfolder], files)
+
+            for folder, files in getattr(engine, 'existing_folder_files', {}).items():
+                dump_chunked(f, ["existing", folder], files)
+
+            dump(f, ["end", len(record_ids)])
+
+        # Yarım kalan yazma eski planın üzerine yazılmasın
+        os.replace(temp_path, path)
+        print(f"💾 Tarama planı kaydedildi: {path} ({len(record_ids)} kayıt, {len(dir_ids)} klasör)")
+        return len(record_ids)
+
+    # ------------------------------------------------------------ Okuma
+    def read_plan(self, path):
+        """Planı oku ve ScanEngine durumunu ondan kur - başlığı döndür"""
+        engine = self.scan_engine
+        store = engine.record_store
+        store.clear()
+
+        header = None
+        finished = False
+        directories = {}
+        records = []
+        lists = defaultdict(list)
+        groups = []
+        likely = []
+        structure = defaultdict(lambda: defaultdict(list))
+        existing = defaultdict(list)
+
+        with _open_plan(path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                item = json.loads(line)
+                kind = item[0]
+                if kind == "rec":
+                    _, record_id, dir_id, name, size, mtime_ns, inode, file_hash, dimensions, is_folder, extra = item
+                    record = store.create(os.path.join(directories[dir_id], name), size, mtime_ns, inode,
+                                          file_hash, _tuple_or_value(dimensions), is_folder)
+                    if extra:
+                        record.extra = extra
+                    records.append(record)
+                elif kind == "dir":
+                    directories[item[1]] = item[2]
+                elif kind == "list":
+                    lists[item[1]].extend(records[i] for i in item[2])
+                elif kind == "group":
+                    groups.append([records[i] for i in item[1]])
+                elif kind == "likely":
+                    pair = dict(item[3])
+                    pair['file1'], pair['file2'] = records[item[1]], records[item[2]]
+                    likely.append(pair)
+                elif kind == "org":
+                    structure[item[1]][item[2]].extend(records[i] for i in item[3])
+                elif kind == "existing":
+                    existing[item[1]].extend(records[i] for i in item[2])
+                elif kind == "plan":
+                    header = item[1]
+                    if header.get('version') != PLAN_VERSION:
+                        raise ValueError(f"Desteklenmeyen plan sürümü: {header.get('version')}")
+                elif kind == "end":
+                    finished = item[1] == len(records)
+                else:
+                    raise ValueError(f"Bilinmeyen satır ({line_number}): {kind}")
+
+        if header is None or not finished:
+            raise ValueError("Plan dosyası eksik veya yarım yazılmış")
+
+        stats = header['stats']
+        stats['categories'] = defaultdict(int, stats.get('categories', {}))
+
+        # Önceki bellek bütçeli taramanın geçici dosyaları artık gerekmiyor
+        engine._close_spill_session()
+        engine.all_scanned_files = lists['all']
+        engine.unique_files = lists['unique']
+        engine.duplicate_files = lists['duplicate']
+        engine.source_duplicates = groups
+        engine.likely_duplicates = likely
+        engine.organization_structure = structure
+        engine.existing_folder_files = existing
+        engine.stats = stats
+        engine._scan_mode = header.get('scan_mode')
+        engine._dup_checks = header.get('dup_checks') or {}
+        engine._duplicate_groups = {}
+        engine.loaded_plan = path
+
+        self.file_ops.source_path = header['source_path']
+        self.file_ops.target_path = header['target_path']
+        print(f"📂 Plan okundu: {len(records)} kayıt, {len(groups)} duplikat grubu, {len(structure)} ana klasör")
+        return header
+
+    # -------------------------------------------------------- Doğrulama
+    def revalidate(self, workers=16):
+        """Yüklenen planın dosyalarını sadece stat ile doğrula, değişenleri plandan çıkar
+
+        Dosya: hâlâ var, boyutu ve mtime_ns'i aynı olmalı. Klasör: hâlâ klasör olmalı.
+        (doğru, değişen, kayıp) sayılarını döndürür.
+        """
+        engine = self.scan_engine
+        records = {}
+        for subfolders in engine.organization_structure.values():
+            for files in subfolders.values():
+                for record in files:
+                    records[id(record)] = record
+        for files in getattr(engine, 'existing_folder_files', {}).values():
+            for record in files:
+                records[id(record)] = record
+
+        def check(record):
+            try:
+                st = os.stat(record.path)
+            except OSError:
+                return 'missing'
+            if record.is_folder:
+                return 'ok' if os.path.isdir(record.path) else 'changed'
+            if st.st_size != record.size or st.st_mtime_ns != record.mtime_ns:
+                return 'changed'
+            return 'ok'
+
+        # Ağ sürücülerinde stat gecikmesi baskın - paralel
+        start = time.perf_counter()
+        items = list(records.values())
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(check, items, chunksize=256))
+        stale_ids = {id(record) for record, result in zip(items, results) if result != 'ok'}
+        changed = results.count('changed')
+        missing = results.count('missing')
+
+        if stale_ids:
+            self._drop_stale_records(stale_ids)
+
+        engine.loaded_plan = None
+        print(f"🔎 Plan doğrulandı: {len(items) - len(stale_ids)} geçerli, {changed} değişmiş, {missing} kayıp "
+              f"({time.perf_counter() - start:.2f} sn)")
+        return len(items) - len(stale_ids), changed, missing
+
+    def _drop_stale_records(self, stale_ids):
+        """Geçersiz kayıtları plandan çıkar, duplikat gruplarını ve istatistikleri güncelle
+
+        Orijinali düşen grupta aynı uzantılı sıradaki geçerli kopya orijinal olur ve onun
+        yerini alır; böyle bir kopya yoksa grubun duplikatları plandan çıkar (kaynakta kalır).
+        Aksi halde organizasyon, tek kopyası kalmış dosyaları "Duplicate Files"a taşırdı.
+        """
+        engine = self.scan_engine
+        dropped_ids = set(stale_ids)
+        replacements = {}  # id(eski orijinal) -> yeni orijinal
+        groups = []
+        for group in engine.source_duplicates:
+            members = [f for f in group if id(f) not in stale_ids]
+            if members and id(group[0]) in stale_ids:
+                successor = next((f for f in members if f['extension'] == group[0]['extension']), None)
+                if successor is None:
+                    dropped_ids.update(id(f) for f in members)
+                    continue
+                replacements[id(group[0])] = successor
+                members = [successor] + [f for f in members if f is not successor]
+            if len(members) > 1:
+                groups.append(members)
+
+        promoted = list(replacements.values())
+        promoted_ids = {id(record) for record in promoted}
+        for record in promoted:
+            if record.extra:
+                record.extra.pop('is_duplicate', None)
+                record.extra.pop('original_path', None)
+
+        def filtered(files):
+            kept = []
+            for record in files:
+                replacement = replacements.get(id(record))
+                if replacement is not None:
+                    kept.append(replacement)
+                elif id(record) not in dropped_ids and id(record) not in promoted_ids:
+                    kept.append(record)
+            return kept
+
+        structure = defaultdict(lambda: defaultdict(list))
+        for main_folder, subfolders in engine.organization_structure.items():
+            for subfolder, files in subfolders.items():
+                files = filtered(files)
+                if files:
+                    structure[main_folder][subfolder] = files
+        existing = defaultdict(list)
+        for folder, files in getattr(engine, 'existing_folder_files', {}).items():
+            files = filtered(files)
+            if files:
+                existing[folder] = files
+
+        for record in engine.all_scanned_files:
+            if id(record) in stale_ids:
+                engine.stats['categories'][engine._stat_category(record)] -= 1
+
+        engine.organization_structure = structure
+        engine.existing_folder_files = existing
+        engine.source_duplicates = groups
+        engine.likely_duplicates = [pair for pair in getattr(engine, 'likely_duplicates', [])
+                                    if id(pair['file1']) not in stale_ids and id(pair['file2']) not in stale_ids]
+        engine.all_scanned_files = [f for f in engine.all_scanned_files if id(f) not in stale_ids]
+        engine.unique_files = [f for f in engine.unique_files if id(f) not in stale_ids] + promoted
+        engine.duplicate_files = [f for f in engine.duplicate_files
+                                  if id(f) not in dropped_ids and id(f) not in promoted_ids]
+
+        engine.stats['total_files'] = len(engine.all_scanned_files)
+        engine.stats['total_size'] = sum(f['size'] for f in engine.all_scanned_files)
+        engine.stats['unique_files'] = len(engine.unique_files)
+        engine.stats['duplicate_files'] = len(engine.duplicate_files)
+        if promoted or len(dropped_ids) > len(stale_ids):
+            print(f"🔁 Plan: {len(promoted)} duplikat orijinal oldu, "
+                  f"{len(dropped_ids) - len(stale_ids)} duplikat orijinali kalmadığı için çıkarıldı")
+
+
+if __name__ == "__main__":
+    # Kullanım: python scan_plan.py plan.jsonl[.gz] - plan özetini yazdır
+    counts = defaultdict(int)
+    with _open_plan(sys.argv[1], 'r') as plan_file:
+        for plan_line in plan_file:
+            plan_item = json.loads(plan_line)
+            counts[plan_item[0]] += 1
+            if plan_item[0] == "plan":
+                print(json.dumps(plan_item[1], ensure_ascii=False, indent=2))
+    print(dict(counts))
@@ -0,0 +1,290 @@
+"""
+Scan Watcher Module
+Tarama sonrası kaynak/hedef klasör değişikliklerini izler (Linux'ta inotify, diğer sistemlerde polling)
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+
+from dir_walker import DirWalker
+
+# inotify olay maskeleri (<sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class ChangeBatch:
+    """Debounce sonrası tek seferde uygulanacak değişiklikler
+
+    changed: oluşturulan / değiştirilen / taşınıp gelen yollar (dosya veya klasör)
+    deleted: silinen / taşınıp giden yollar (klasörse tüm alt ağacı)
+    rescan: olay kuyruğu taştı - izlenen ağaçların tamamı yeniden karşılaştırılmalı
+    """
+
+    __slots__ = ('changed', 'deleted', 'rescan')
+
+    def __init__(self, changed=(), deleted=(), rescan=False):
+        self.changed = set(changed)
+        self.deleted = set(deleted)
+        self.rescan = rescan
+
+    def __len__(self):
+        return len(self.changed) + len(self.deleted)
+
+
+class _InotifyBackend:
+    """ctypes üzerinden inotify - her klasör için bir watch"""
+
+    name = "inotify"
+
+    def __init__(self, roots, dir_filter=None, recursive=True):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+
+        self.ctypes = ctypes
+        self.dir_filter = dir_filter
+        self.recursive = recursive
+        self.watches = {}  # wd -> klasör yolu
+        self.cookies = {}  # taşıma cookie -> kaynak yol (eşleşmeyen MOVED_FROM = silme)
+
+        try:
+            for root in roots:
+                self._add_tree(root)
+        except Exception:
+            self.close()
+            raise
+
+    def _add_watch(self, dir_path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            error = self.ctypes.get_errno()
+            if error == errno.ENOSPC:
+                # max_user_watches sınırı - polling'e düşülsün
+                raise OSError(error, "inotify watch sınırına ulaşıldı")
+            return
+        self.watches[wd] = dir_path
+
+    def _add_tree(self, root_path):
+        """Klasörü ve (budanmayan) alt klasörlerini izlemeye al"""
+        self._add_watch(root_path)
+        if not self.recursive:
+            return
+        walker = DirWalker(dir_filter=self.dir_filter, file_filter=lambda name: False)
+        stack = [root_path]
+        while stack:
+            _, subdirs = walker.list_directory(stack.pop())
+            for subdir in subdirs:
+                self._add_watch(subdir)
+            stack.extend(subdirs)
+
+    def _remove_tree(self, root_path):
+        """Taşınan/silinen klasörün watch'larını bırak"""
+        prefix = root_path + os.sep
+        for wd, path in list(self.watches.items()):
+            if path == root_path or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                self.watches.pop(wd, None)
+
+    def read(self, timeout):
+        """Olayları (yol, değişti_mi, klasör_mü) listesi olarak döndür; taşmada None"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            dir_path = self.watches.get(wd)
+            if dir_path is None or not name:
+                # Klasörün kendisi silindi/taşındı - ebeveyn klasörün olayı yeterli
+                continue
+
+            path = os.path.join(dir_path, name)
+            is_dir = bool(mask & IN_ISDIR)
+            if is_dir and self.dir_filter and not self.dir_filter(name):
+                continue
+
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                if is_dir:
+                    self._remove_tree(path)
+                events.append((path, False, is_dir))
+            else:
+                if is_dir and mask & (IN_CREATE | IN_MOVED_TO) and self.recursive:
+                    self._add_tree(path)
+                events.append((path, True, is_dir))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _PollingBackend:
+    """inotify olmayan sistemler için periyodik stat karşılaştırması"""
+
+    name = "polling"
+
+    def __init__(self, roots, dir_filter=None, recursive=True, interval=2.0):
+        self.roots = list(roots)
+        self.walker = DirWalker(dir_filter=dir_filter)
+        self.recursive = recursive
+        self.interval = interval
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for root in self.roots:
+            for entry in self.walker.walk(root, recursive=self.recursive, include_dirs=True):
+                # Klasörler sadece varlık için izlenir (mtime değişimi alt olaylarla gelir)
+                snapshot[entry.path] = (True, 0, 0) if entry.is_dir else (False, entry.size, entry.mtime_ns)
+        return snapshot
+
+    def read(self, timeout):
+        time.sleep(max(timeout, self.interval))
+        current = self._take_snapshot()
+        previous, self.snapshot = self.snapshot, current
+
+        events = [(path, False, state[0]) for path, state in previous.items() if path not in current]
+        events.extend((path, True, state[0]) for path, state in current.items()
+                      if previous.get(path) != state)
+        return events
+
+    def close(self):
+        self.snapshot = {}
+
+
+class ScanWatcher:
+    """Klasör değişikliklerini toplayıp debounce edilmiş gruplar halinde bildiren izleyici
+
+    Olaylar 'debounce' saniye sessizlik olana kadar (en fazla 'max_delay' saniye) biriktirilir,
+    aynı yola ait olaylar birleştirilir ve on_batch(ChangeBatch) izleyici thread'inde çağrılır.
+    Linux'ta inotify kullanılır; kurulamazsa (başka sistem, watch sınırı) polling'e düşülür.
+    """
+
+    def __init__(self, roots, on_batch, dir_filter=None, file_filter=None, recursive=True,
+                 debounce=0.5, max_delay=3.0, poll_interval=2.0):
+        self.roots = [os.path.normpath(root) for root in roots if root and os.path.isdir(root)]
+        self.on_batch = on_batch
+        self.dir_filter = dir_filter
+        self.file_filter = file_filter
+        self.recursive = recursive
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+
+        self.backend = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    @property
+    def backend_name(self):
+        return self.backend.name if self.backend else ""
+
+    def start(self):
+        """İzlemeyi başlat (backend kurulumu çağıran thread'de yapılır)"""
+        if sys.platform.startswith('linux'):
+            try:
+                self.backend = _InotifyBackend(self.roots, self.dir_filter, self.recursive)
+            except Exception as e:
+                print(f"⚠️ inotify kullanılamıyor, polling'e geçiliyor: {e}")
+        if self.backend is None:
+            self.backend = _PollingBackend(self.roots, self.dir_filter, self.recursive, self.poll_interval)
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"👁️ Klasör izleme başladı ({self.backend_name}): {', '.join(self.roots)}")
+
+    def stop(self):
+        """İzlemeyi durdur"""
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=self.poll_interval + 1)
+        if self.backend:
+            self.backend.close()
+        self.thread = None
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self):
+        pending = {}  # yol -> değişti_mi (son olay geçerli)
+        rescan = False
+        first_event = last_event = 0.0
+
+        while not self.stop_event.is_set():
+            try:
+                events = self.backend.read(0.2)
+            except Exception as e:
+                print(f"⚠️ Klasör izleme okuma hatası: {e}")
+                events = []
+            if self.stop_event.is_set():
+                break
+
+            now = time.time()
+            if events is None:
+                rescan = True
+                events = []
+            for path, exists, is_dir in events:
+                if not is_dir and self.file_filter and not self.file_filter(os.path.basename(path)):
+                    continue
+                pending[path] = exists
+            if events or rescan:
+                last_event = now
+                if not first_event:
+                    first_event = now
+
+            if (pending or rescan) and (now - last_event >= self.debounce or now - first_event >= self.max_delay):
+                batch = ChangeBatch((path for path, exists in pending.items() if exists),
+                                    (path for path, exists in pending.items() if not exists),
+                                    rescan)
+                pending = {}
+                rescan = False
+                first_event = last_event = 0.0
+                try:
+                    self.on_batch(batch)
+                except Exception as e:
+                    print(f"⚠️ Değişiklikler uygulanırken hata: {e}")
@@ -0,0 +1,195 @@
+"""
+Space Reclaimer Module
+Doğrulanmış duplikatları yerinde bağlantıyla değiştirerek disk alanı kazanma:
+copy-on-write reflink (btrfs/XFS, FICLONE ioctl) veya hardlink
+"""
+
+import os
+import sys
+import shutil
+import stat
+import time
+import uuid
+
+from content_hasher import lockstep_compare
+
+try:
+    import fcntl
+except ImportError:
+    # Windows - reflink yok, sadece hardlink
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+TEMP_SUFFIX = '.reclaim.tmp'
+
+METHODS = ('auto', 'reflink', 'hardlink')
+
+
+def reflink(source_path, target_path):
+    """target_path'i source_path'in copy-on-write klonu olarak oluştur (desteklenmezse OSError)"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        raise OSError("reflink bu platformda desteklenmiyor")
+    with open(source_path, 'rb') as source, open(target_path, 'xb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.unlink(target_path)
+            raise
+
+
+def supports_reflink(folder):
+    """Klasörün dosya sistemi reflink destekliyor mu (küçük geçici dosyayla denenir)"""
+    probe = os.path.join(folder, f".{uuid.uuid4().hex}{TEMP_SUFFIX}")
+    clone = probe + '.clone'
+    try:
+        with open(probe, 'wb') as f:
+            f.write(b'reflink')
+        reflink(probe, clone)
+        os.unlink(clone)
+        return True
+    except OSError:
+        return False
+    finally:
+        try:
+            os.unlink(probe)
+        except OSError:
+            pass
+
+
+class SpaceReclaimer:
+    """Duplikat gruplarında orijinal dışındaki dosyaları orijinale bağlantıyla değiştirir
+
+    Her dosya değiştirilmeden hemen önce orijinalle bayt bayt yeniden karşılaştırılır
+    (tarama sonrası değişmiş veya sadece benzer dosyalara dokunulmaz). Değiştirme dosya
+    başına atomiktir: bağlantı aynı klasörde geçici isimle oluşturulur, sonra os.replace ile
+    duplikatın üzerine taşınır - yarıda kalan işlem duplikatı bozmaz.
+    method: 'reflink' (içerik paylaşılır, dosyalar bağımsız kalır), 'hardlink' (aynı dosya -
+    birini düzenlemek hepsini değiştirir) veya 'auto' (reflink, desteklenmezse hardlink).
+    """
+
+    def __init__(self, method='auto', should_stop=None, on_progress=None):
+        if method not in METHODS:
+            raise ValueError(f"Bilinmeyen yöntem: {method}")
+        self.method = method
+        self.should_stop = should_stop
+        self.on_progress = on_progress
+        self._no_reflink = set()  # Reflink denemesi başarısız olan aygıtlar (st_dev)
+        self.stats = {'reflinked': 0, 'hardlinked': 0, 'already_linked': 0, 'skipped': 0, 'errors': 0,
+                      'reclaimed_bytes': 0, 'seconds': 0.0}
+
+    def reclaim_groups(self, groups):
+        """[[orijinal, duplikat, ...], ...] yol grupları için alan kazan - stats döner"""
+        start = time.perf_counter()
+        total = sum(max(0, len(paths) - 1) for paths in groups)
+        done = 0
+        for paths in groups:
+            for duplicate in paths[1:]:
+                if self.should_stop and self.should_stop():
+                    self.stats['seconds'] += time.perf_counter() - start
+                    return self.stats
+                self.replace(paths[0], duplicate)
+                done += 1
+                if self.on_progress:
+                    self.on_progress(done, total)
+        self.stats['seconds'] += time.perf_counter() - start
+        return self.stats
+
+    def replace(self, original, duplicate):
+        """Tek duplikatı doğrula ve orijinale bağlantıyla değiştir - kullanılan yöntem veya None"""
+        try:
+            st_original = os.stat(original)
+            st_duplicate = os.lstat(duplicate)
+        except OSError as e:
+            print(f"⚠️ Dosya okunamadı: {e}")
+            self.stats['errors'] += 1
+            return None
+
+        if not (stat.S_ISREG(st_original.st_mode) and stat.S_ISREG(st_duplicate.st_mode)):
+            self.stats['skipped'] += 1
+            return None
+        if (st_original.st_dev, st_original.st_ino) == (st_duplicate.st_dev, st_duplicate.st_ino):
+            # Zaten aynı dosya (önceki bir işlemde bağlanmış)
+            self.stats['already_linked'] += 1
+            return None
+        if (st_original.st_size != st_duplicate.st_size or st_original.st_dev != st_duplicate.st_dev
+                or st_original.st_size == 0):
+            # Farklı boyut (tarama sonrası değişmiş) veya farklı disk - bağlantı kurulamaz
+            self.stats['skipped'] += 1
+            return None
+
+        # Yeniden doğrulama: hash değil, doğrudan bayt karşılaştırma
+        labels = lockstep_compare([original, duplicate], st_original.st_size, self.should_stop)
+        if labels[0] is None or labels[0] != labels[1]:
+            print(f"⏭️ İçerik aynı değil, atlandı: {duplicate}")
+            self.stats['skipped'] += 1
+            return None
+
+        folder, name = os.path.split(duplicate)
+        temp_path = os.path.join(folder, f".{name}.{uuid.uuid4().hex[:8]}{TEMP_SUFFIX}")
+        try:
+            method = self._link(original, duplicate, temp_path, st_original.st_dev)
+        except OSError as e:
+            print(f"⚠️ Bağlantı oluşturulamadı: {duplicate} - {e}")
+            self.stats['errors'] += 1
+            return None
+
+        try:
+            # Karşılaştırmadan sonra iki dosyadan biri değiştiyse duplikata dokunma
+            if not (self._unchanged(original, st_original) and self._unchanged(duplicate, st_duplicate, lstat=True)):
+                os.unlink(temp_path)
+                print(f"⏭️ Dosya doğrulama sırasında değişti, atlandı: {duplicate}")
+                self.stats['skipped'] += 1
+                return None
+            os.replace(temp_path, duplicate)
+        except OSError as e:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            print(f"⚠️ Duplikat değiştirilemedi: {duplicate} - {e}")
+            self.stats['errors'] += 1
+            return None
+
+        self.stats[method] += 1
+        if st_duplicate.st_nlink == 1:
+            # Duplikatın başka bağlantısı yoksa blokları serbest kaldı
+            self.stats['reclaimed_bytes'] += st_duplicate.st_size
+        print(f"♻️ {'Reflink' if method == 'reflinked' else 'Hardlink'}: {duplicate} -> {original}")
+        return method
+
+    def _link(self, original, duplicate, temp_path, device):
+        """Geçici isimde bağlantı oluştur - stats anahtarı döner"""
+        if self.method != 'hardlink' and device not in self._no_reflink:
+            try:
+                reflink(original, temp_path)
+            except OSError:
+                if self.method == 'reflink':
+                    raise
+                self._no_reflink.add(device)
+            else:
+                try:
+                    # Klon yeni bir dosya - duplikatın izin ve zamanları korunur
+                    shutil.copystat(duplicate, temp_path)
+                except OSError:
+                    pass
+                return 'reflinked'
+        os.link(original, temp_path)
+        return 'hardlinked'
+
+    @staticmethod
+    def _unchanged(path, before, lstat=False):
+        try:
+            after = os.lstat(path) if lstat else os.stat(path)
+        except OSError:
+            return False
+        return ((after.st_ino, after.st_size, after.st_mtime_ns)
+                == (before.st_ino, before.st_size, before.st_mtime_ns))
+
+    def get_stats_text(self):
+        stats = self.stats
+        return (f"♻️ Alan kazanımı: {stats['reflinked']} reflink, {stats['hardlinked']} hardlink, "
+                f"{stats['already_linked']} zaten bağlı, {stats['skipped']} atlandı, {stats['errors']} hata, "
+                f"{stats['reclaimed_bytes'] / (1024 * 1024):.1f} MB kazanıldı ({stats['seconds']:.2f} sn)")
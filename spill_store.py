@@ -0,0 +1,356 @@
+"""
+Spill Store Module
+Bellek bütçesi aşıldığında dosya kayıtlarını ve duplikat gruplama anahtarlarını geçici
+diske yazan liste / gruplayıcı (sıralı parçalar + dış birleştirme)
+"""
+
+import os
+import sys
+import time
+import heapq
+import pickle
+import shutil
+import atexit
+import tempfile
+import threading
+from itertools import islice
+
+# Tahmini bellek maliyetleri (bayt) - FileRecord + liste yuvası + okunurken paylaşılmayan string'ler
+RECORD_BYTES = 400
+KEY_ENTRY_BYTES = 120
+
+# Diske yazılan her pickle parçasındaki öğe sayısı (okurken bellekte tek parça tutulur)
+CHUNK_SIZE = 1000
+
+_open_sessions = set()
+
+
+class MemoryBudget:
+    """Paylaşılan bellek bütçesi - aşılınca en büyük tamponlar diske boşaltılır
+
+    Tamponlar bütçenin yarısını kullanabilir; maliyetler tahmini olduğundan kalan pay
+    tahmin hatası, birleştirme sırasında okunan parçalar ve klasör/uzantı havuzu içindir.
+    """
+
+    def __init__(self, limit_bytes):
+        self.limit = limit_bytes
+        self.buffer_limit = limit_bytes // 2
+        self.used = 0
+        self.spilled_bytes = 0
+        self.spill_count = 0
+        self.containers = []
+        self.lock = threading.Lock()
+
+    def register(self, container):
+        with self.lock:
+            self.containers.append(container)
+
+    def charge(self, nbytes):
+        """Tampona eklenen öğenin maliyetini yaz; bütçe aşıldıysa yarısına inene kadar boşalt"""
+        self.used += nbytes
+        if self.used > self.buffer_limit:
+            self._spill_until(self.buffer_limit // 2)
+
+    def _spill_until(self, target):
+        with self.lock:
+            containers = sorted(self.containers, key=lambda c: c.buffered_bytes, reverse=True)
+        for container in containers:
+            if self.used <= target:
+                break
+            if container.buffered_bytes:
+                freed = container.spill()
+                self.used -= freed
+                self.spilled_bytes += freed
+                self.spill_count += 1
+
+
+class SpillList:
+    """Sadece sona ekleme yapılan, bütçe aşılınca diske taşan kayıt listesi
+
+    Liste gibi kullanılır: append, len, iterasyon, indeks ve dilim ([:1000]).
+    Diskten okunan kayıtlar yeni nesnelerdir (kimlik korunmaz).
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.spilled = 0
+        self.path = None
+        session.budget.register(self)
+
+    def append(self, item, cost=RECORD_BYTES):
+        self.buffer.append(item)
+        self.buffered_bytes += cost
+        self.session.budget.charge(cost)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def spill(self):
+        """Tamponu dosyanın sonuna ekle - serbest kalan tahmini baytı döndür"""
+        if self.path is None:
+            self.path = self.session.new_path('list')
+        with open(self.path, 'ab') as f:
+            for start in range(0, len(self.buffer), CHUNK_SIZE):
+                pickle.dump(self.buffer[start:start + CHUNK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+        self.spilled += len(self.buffer)
+        freed = self.buffered_bytes
+        self.buffer = []
+        self.buffered_bytes = 0
+        return freed
+
+    def __len__(self):
+        return self.spilled + len(self.buffer)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        # Tampon kopyalanır ki okuma sırasında yapılan spill sırayı bozmasın
+        spilled, buffer = self.spilled, list(self.buffer)
+        if spilled:
+            yield from islice(_read_chunks(self.path), spilled)
+        yield from buffer
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return list(islice(self, start, stop, step))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return next(islice(self, index, None))
+
+    def __repr__(self):
+        return f"SpillList({len(self)} öğe, {self.spilled} diskte)"
+
+
+class ExternalSorter:
+    """Dış sıralama - bütçe aşılınca tampon sıralanıp diske bir 'run' olarak yazılır
+
+    Öğeler karşılaştırılabilir tuple'lardır; sorted_items() tüm run'ları heapq.merge ile
+    birleştirip sıralı üretir (bellekte run başına tek parça tutulur).
+    """
+
+    def __init__(self, session, item_bytes=KEY_ENTRY_BYTES):
+        self.session = session
+        self.item_bytes = item_bytes
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.runs = []
+        self.count = 0
+        session.budget.register(self)
+
+    def add(self, item, extra_bytes=0):
+        self.buffer.append(item)
+        self.count += 1
+        cost = self.item_bytes + extra_bytes
+        self.buffered_bytes += cost
+        self.session.budget.charge(cost)
+
+    def spill(self):
+        self.buffer.sort()
+        path = self.session.new_path('run')
+        with open(path, 'wb') as f:
+            for start in range(0, len(self.buffer), CHUNK_SIZE):
+                pickle.dump(self.buffer[start:start + CHUNK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+        self.runs.append(path)
+        freed = self.buffered_bytes
+        self.buffer = []
+        self.buffered_bytes = 0
+        return freed
+
+    def sorted_items(self):
+        self.buffer.sort()
+        streams = [_read_chunks(path) for path in self.runs]
+        streams.append(iter(list(self.buffer)))
+        return heapq.merge(*streams)
+
+
+def duplicate_memberships(session, key_sorter):
+    """(anahtar, sıra) sıralamasından grup üyeliklerini sıra numarasına göre sıralı üret
+
+    Sadece birden fazla üyeli gruplar: (sıra, grup_no, grup_içi_sıra). Grup numarası grubun
+    ikinci üyesinin sıra numarasıdır - bellek içi akışta grubun source_duplicates'e eklendiği an.
+    Grup içi sıra 0 olan üye orijinaldir.
+    """
+    memberships = ExternalSorter(session)
+    current_key = None
+    members = []
+
+    def flush():
+        if len(members) > 1:
+            group_id = members[1]
+            for rank, seq in enumerate(members):
+                memberships.add((seq, group_id, rank))
+
+    for key, seq in key_sorter.sorted_items():
+        if key != current_key:
+            flush()
+            current_key, members = key, []
+        members.append(seq)
+    flush()
+    return memberships.sorted_items()
+
+
+class SpillSession:
+    """Bir taramanın geçici spill klasörü ve bütçesi
+
+    Organizasyon diskteki listeleri okuduğu için oturum bir sonraki taramaya kadar
+    (veya program kapanana kadar) yaşar.
+    """
+
+    def __init__(self, limit_bytes, base_dir=None):
+        self.budget = MemoryBudget(limit_bytes)
+        self.directory = tempfile.mkdtemp(prefix='fm_spill_', dir=base_dir)
+        self._counter = 0
+        self._lock = threading.Lock()
+        _open_sessions.add(self)
+
+    def new_path(self, kind):
+        with self._lock:
+            self._counter += 1
+            return os.path.join(self.directory, f"{kind}_{self._counter:06d}.pkl")
+
+    def new_list(self):
+        return SpillList(self)
+
+    def new_sorter(self, item_bytes=KEY_ENTRY_BYTES):
+        return ExternalSorter(self, item_bytes)
+
+    def disk_usage(self):
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.directory))
+        except OSError:
+            return 0
+
+    def get_stats_text(self):
+        return (f"🧠 Bellek bütçesi {self.budget.limit // (1024 * 1024)} MB: {self.budget.spill_count} kez diske "
+                f"yazıldı, {self.disk_usage() / (1024 * 1024):.1f} MB geçici dosya")
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        _open_sessions.discard(self)
+
+
+def _read_chunks(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            yield from chunk
+
+
+@atexit.register
+def _cleanup_sessions():
+    for session in list(_open_sessions):
+        session.close()
+
+
+def group_in_memory(keys):
+    """Karşılaştırma için bellek içi gruplama - duplicate_memberships ile aynı biçim"""
+    groups = {}
+    for seq, key in enumerate(keys):
+        groups.setdefault(key, []).append(seq)
+    memberships = []
+    for members in groups.values():
+        if len(members) > 1:
+            memberships.extend((seq, members[1], rank) for rank, seq in enumerate(members))
+    memberships.sort()
+    return memberships
+
+
+def stress_test(root_path, budget_mb=64, workers=1):
+    """Sentetik ağaçta bellek bütçeli gruplamayı bellek içi yolla karşılaştır
+
+    Tarama ile aynı üç aşama: kayıtlar SpillList'e ve isim+boyut anahtarları dış sıralamaya,
+    ardından grup üyelikleri sıra numarasıyla kayıtlarla birlikte okunur. tracemalloc tepe
+    değeri bütçenin altında kalmalı, üyelikler bellek içi sonuçla aynı olmalı.
+    """
+    import hashlib
+    import tracemalloc
+    from dir_walker import DirWalker
+    from file_records import FileRecordStore
+
+    def key_of(record):
+        return f"name:{record.name.lower()}|size:{record.size}"
+
+    def entries():
+        # Paralel gezintide sıra belirsiz - karşılaştırma için sıralı gezinti
+        return DirWalker().walk(root_path) if workers <= 1 else DirWalker().walk_parallel(root_path, workers)
+
+    budget = budget_mb * 1024 * 1024
+    store = FileRecordStore()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    session = SpillSession(budget)
+    records = session.new_list()
+    keys = session.new_sorter()
+    for entry in entries():
+        record = store.from_entry(entry)
+        key = key_of(record)
+        keys.add((key, len(records)), len(key))
+        records.append(record)
+
+    digest = hashlib.sha1()
+    memberships = duplicate_memberships(session, keys)
+    membership = next(memberships, None)
+    duplicates = 0
+    for seq, record in enumerate(records):
+        if membership is not None and membership[0] == seq:
+            digest.update(repr(membership).encode())
+            duplicates += membership[2] > 0
+            membership = next(memberships, None)
+    total = len(records)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(session.get_stats_text())
+    session.close()
+
+    # Bellek içi yol (karşılaştırma için, bütçe dışı)
+    if workers <= 1:
+        expected = hashlib.sha1()
+        for membership in group_in_memory(key_of(store.from_entry(entry)) for entry in entries()):
+            expected.update(repr(membership).encode())
+        same = expected.digest() == digest.digest()
+    else:
+        same = True
+
+    print(f"📂 {total} dosya, {duplicates} duplikat, {elapsed:.2f} sn")
+    print(f"🧠 Tepe bellek: {peak / (1024 * 1024):.1f} MB / bütçe {budget_mb} MB -> "
+          f"{'✅ bütçe içinde' if peak <= budget else '❌ bütçe aşıldı'}")
+    if workers <= 1:
+        print(f"{'✅' if same else '❌'} Gruplar bellek içi sonuçla {'aynı' if same else 'FARKLI'}")
+    return peak <= budget and same
+
+
+if __name__ == "__main__":
+    # Kullanım: python spill_store.py [klasör] [--files 1000000] [--budget 64] [--workers 4]
+    import argparse
+    from dir_walker import _create_benchmark_tree
+
+    parser = argparse.ArgumentParser(description="Bellek bütçeli tarama stres testi")
+    parser.add_argument('path', nargs='?', help="Var olan klasör (verilmezse sentetik ağaç oluşturulur)")
+    parser.add_argument('--files', type=int, default=1000000, help="Sentetik ağaçtaki dosya sayısı")
+    parser.add_argument('--budget', type=int, default=64, help="Bellek bütçesi (MB)")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel gezinti worker sayısı")
+    args = parser.parse_args()
+
+    if args.path:
+        ok = stress_test(args.path, args.budget, args.workers)
+    else:
+        temp_root = tempfile.mkdtemp(prefix="spill_stress_")
+        try:
+            print(f"🔧 {args.files} dosyalık sentetik ağaç oluşturuluyor...")
+            _create_benchmark_tree(temp_root, args.files)
+            ok = stress_test(temp_root, args.budget, args.workers)
+        finally:
+            shutil.rmtree(temp_root, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,244 @@
+"""
+Target Index Module
+Hedef klasör için kalıcı içerik indeksi: boyut -> (örnek parmak izi -> tam hash)
+Kaynak dosyanın içeriği hedefte (başka isimle bile) varsa kopyalanmadan atlanabilir
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from dir_walker import DirWalker
+from content_hasher import (SAMPLE_SIZE, get_hashing_service, get_hash_algorithm, is_current_hash,
+                            sample_fingerprint)
+
+
+class TargetIndex:
+    """SQLite tabanlı, hedef klasörün kökünde saklanan artımlı içerik indeksi
+
+    Her dosya için boyut, mtime_ns, inode, örnek parmak izi ve tam hash saklanır.
+    Yenilemede boyutu/mtime'ı değişmemiş dosyaların parmak izleri korunur; parmak izleri
+    sadece aynı boyutta bir kaynak dosya sorulduğunda (tembel) hesaplanıp kaydedilir.
+    """
+
+    INDEX_FILENAME = '.target_index.db'
+    SCHEMA_VERSION = 1
+
+    def __init__(self, target_path, service=None, sample_size=SAMPLE_SIZE, should_stop=None):
+        self.target_path = target_path
+        self.service = service or get_hashing_service()
+        self.sample_size = sample_size
+        self.should_stop = should_stop
+        self.algorithm = get_hash_algorithm()
+        self.db_path = os.path.join(target_path, self.INDEX_FILENAME)
+        self.conn = None
+        self.lock = threading.Lock()
+        # göreli yol -> [boyut, mtime_ns, inode, örnek, hash]
+        self.files = {}
+        self.by_size = defaultdict(list)
+        self.stats = {'indexed': 0, 'reused': 0, 'updated': 0, 'removed': 0, 'sampled': 0, 'hashed': 0,
+                      'matched': 0, 'matched_bytes': 0, 'seconds': 0.0}
+
+    def open(self):
+        """İndeks veritabanını aç (yoksa oluştur), kayıtları belleğe al"""
+        if self.conn:
+            return
+        os.makedirs(self.target_path, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER,
+                sample TEXT,
+                hash TEXT
+            );
+        """)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+        if meta.get('schema_version') != str(self.SCHEMA_VERSION):
+            # Uyumsuz şema - indeksi sıfırla
+            self.conn.execute("DELETE FROM files")
+        elif meta.get('algorithm') != self.algorithm:
+            # Farklı algoritmanın parmak izleri karşılaştırılamaz - dosya listesi korunur
+            self.conn.execute("UPDATE files SET sample = NULL, hash = NULL")
+        self.conn.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?)",
+                              [('schema_version', str(self.SCHEMA_VERSION)), ('algorithm', self.algorithm)])
+        self.conn.commit()
+        for path, size, mtime_ns, inode, sample, file_hash in self.conn.execute("SELECT * FROM files"):
+            self.files[path] = [size, mtime_ns, inode, sample, file_hash]
+
+    def close(self):
+        """İndeksi kaydet ve kapat"""
+        if self.conn:
+            try:
+                self.conn.commit()
+                self.conn.close()
+            finally:
+                self.conn = None
+
+    def refresh(self, dir_filter=None, file_filter=None):
+        """Hedef ağacını gez, indeksi diskle eşitle (değişmeyen dosyaların parmak izleri korunur)"""
+        self.open()
+        start = time.perf_counter()
+        walker = DirWalker(dir_filter=dir_filter, file_filter=file_filter, should_stop=self.should_stop)
+        seen = set()
+        updates = []
+        for entry in walker.walk(self.target_path):
+            if entry.name.startswith(self.INDEX_FILENAME):
+                continue
+            rel_path = os.path.relpath(entry.path, self.target_path)
+            seen.add(rel_path)
+            row = self.files.get(rel_path)
+            if row is not None and row[0] == entry.size and row[1] == entry.mtime_ns:
+                self.stats['reused'] += 1
+                continue
+            self.files[rel_path] = [entry.size, entry.mtime_ns, entry.inode, None, None]
+            updates.append((rel_path, entry.size, entry.mtime_ns, entry.inode))
+            self.stats['updated'] += 1
+
+        if self.should_stop and self.should_stop():
+            # Yarım gezinti silinmiş dosya sayılmamalı
+            removed = []
+        else:
+            removed = [rel_path for rel_path in self.files if rel_path not in seen]
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES(?, ?, ?, ?, NULL, NULL)", updates)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(rel_path,) for rel_path in removed])
+            self.conn.commit()
+        for rel_path in removed:
+            del self.files[rel_path]
+        self.stats['removed'] += len(removed)
+
+        self.by_size.clear()
+        for rel_path, row in self.files.items():
+            if row[0] > 0:
+                self.by_size[row[0]].append(rel_path)
+        self.stats['indexed'] = len(self.files)
+        self.stats['seconds'] += time.perf_counter() - start
+        return self
+
+    def find_many(self, file_infos, on_progress=None):
+        """İçeriği hedefte bulunan kaynak dosyalar - {kaynak yolu: hedef göreli yolu}
+
+        Aşama 1: boyutu hedefte olmayan dosya hiç okunmaz
+        Aşama 2: büyük dosyalarda kaynak ve aynı boyuttaki hedeflerin örnekleri karşılaştırılır
+        Aşama 3: örneği eşleşenlerin (veya örnek kadar küçüklerin) tam hash'i karşılaştırılır
+        Hedef parmak izleri indekse yazılır, sonraki karşılaştırmalarda tekrar okunmaz.
+        """
+        start = time.perf_counter()
+        candidates = [info for info in file_infos
+                      if not info.get('is_folder') and info.get('size') and info['size'] in self.by_size]
+
+        # Aşama 2: örnekler - kaynaklar ve aynı boyuttaki hedefler tek havuz turunda
+        sampled = [info for info in candidates if info['size'] > 3 * self.sample_size]
+        target_jobs = {rel_path for info in sampled for rel_path in self.by_size[info['size']]
+                       if self.files[rel_path][3] is None}
+        sizes = {info['path']: info['size'] for info in sampled}
+        sizes.update((self.target_path_of(rel_path), self.files[rel_path][0]) for rel_path in target_jobs)
+        samples = self._map(lambda path, should_stop: sample_fingerprint(path, sizes[path], self.sample_size,
+                                                                        self.algorithm),
+                            [info['path'] for info in sampled], target_jobs, on_progress)
+        self._store(samples, 3)
+        self.stats['sampled'] += len(sampled) + len(target_jobs)
+
+        full = [info for info in candidates if info['size'] <= 3 * self.sample_size]
+        full_targets = {}
+        for info in full:
+            full_targets[info['path']] = self.by_size[info['size']]
+        for info in sampled:
+            sample = samples.get(info['path'])
+            matches = [rel_path for rel_path in self.by_size[info['size']]
+                       if sample is not None and self.files[rel_path][3] == sample]
+            if matches:
+                full.append(info)
+                full_targets[info['path']] = matches
+
+        # Aşama 3: tam hash - kaynakta geçerli hash varsa tekrar okunmaz
+        source_hashes = {info['path']: info['hash'] for info in full
+                         if is_current_hash(info.get('hash'), self.algorithm)}
+        target_jobs = {rel_path for targets in full_targets.values() for rel_path in targets
+                       if self.files[rel_path][4] is None}
+        hashes = self._map(lambda path, should_stop: self.service.hash_file(path, should_stop, self.algorithm),
+                           [info['path'] for info in full if info['path'] not in source_hashes],
+                           target_jobs, on_progress)
+        self._store(hashes, 4)
+        self.stats['hashed'] += len(hashes)
+        hashes.update(source_hashes)
+
+        found = {}
+        for info in full:
+            file_hash = hashes.get(info['path'])
+            for rel_path in full_targets[info['path']]:
+                if file_hash is not None and self.files[rel_path][4] == file_hash:
+                    found[info['path']] = rel_path
+                    self.stats['matched'] += 1
+                    self.stats['matched_bytes'] += info['size']
+                    break
+        self.stats['seconds'] += time.perf_counter() - start
+        return found
+
+    def find(self, file_info):
+        """Tek kaynak dosyanın hedefteki eşi (göreli yol) veya None"""
+        return self.find_many([file_info]).get(file_info['path'])
+
+    def add(self, target_file, file_info=None):
+        """Hedefe yeni yazılan dosyayı indekse ekle (kaynağın geçerli hash'i varsa o da kaydedilir)"""
+        try:
+            st = os.stat(target_file)
+        except OSError:
+            return
+        rel_path = os.path.relpath(target_file, self.target_path)
+        file_hash = file_info.get('hash') if file_info else None
+        if not is_current_hash(file_hash, self.algorithm):
+            file_hash = None
+        row = [st.st_size, st.st_mtime_ns, st.st_ino, None, file_hash]
+        if rel_path not in self.files and st.st_size > 0:
+            self.by_size[st.st_size].append(rel_path)
+        self.files[rel_path] = row
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES(?, ?, ?, ?, ?, ?)", [rel_path] + row)
+
+    def target_path_of(self, rel_path):
+        return os.path.join(self.target_path, rel_path)
+
+    def _map(self, func, source_paths, target_paths, on_progress):
+        """Kaynak ve hedef yollarını havuzda işle - {kaynak yolu / hedef göreli yolu: sonuç}"""
+        targets = {self.target_path_of(rel_path): rel_path for rel_path in target_paths}
+        paths = list(source_paths) + list(targets)
+        if not paths:
+            return {}
+        results = {}
+        for path, value in self.service.map(func, paths, should_stop=self.should_stop, on_progress=on_progress):
+            if value is not None:
+                results[targets.get(path, path)] = value
+        return results
+
+    def _store(self, results, column):
+        """Hedef dosyaların hesaplanan parmak izlerini belleğe ve indekse yaz"""
+        name = 'sample' if column == 3 else 'hash'
+        updates = []
+        for rel_path, value in results.items():
+            row = self.files.get(rel_path)
+            if row is not None:
+                row[column] = value
+                updates.append((value, rel_path))
+        if updates:
+            with self.lock:
+                self.conn.executemany(f"UPDATE files SET {name} = ? WHERE path = ?", updates)
+                self.conn.commit()
+
+    def get_stats_text(self):
+        stats = self.stats
+        return (f"🎯 Hedef indeksi: {stats['indexed']} dosya ({stats['reused']} yeniden kullanıldı, "
+                f"{stats['updated']} güncellendi, {stats['removed']} silindi), {stats['sampled']} örneklendi, "
+                f"{stats['hashed']} tam hash, {stats['matched']} dosya hedefte mevcut "
+                f"({stats['matched_bytes'] / (1024 * 1024):.1f} MB kopyalanmayacak), {stats['seconds']:.2f} sn")
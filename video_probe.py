@@ -0,0 +1,341 @@
+"""
+Video Probe Module
+Video kapsayıcı başlıklarından çözünürlük ve süre: MP4/MOV (moov/trak/tkhd), Matroska/WebM
+(EBML PixelWidth/PixelHeight) ve AVI (avih). Hiçbir şey çözülmez (decode yok); kutular/elemanlar
+seek ile atlanır, dosya başına en fazla MAX_READ_BYTES okunur.
+"""
+
+import os
+import sys
+import time
+import struct
+
+# Dosya başına okunacak en fazla bayt - başlık bu sınırda bulunamazsa sonuç None
+MAX_READ_BYTES = 512 * 1024
+
+# ISO BMFF (MP4/MOV/M4V/3GP) dosyasının ilk kutusu olabilecek türler
+MP4_FIRST_BOXES = {b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot'}
+
+# Matroska eleman kimlikleri
+EBML_HEADER = 0x1A45DFA3
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_TYPE = 0x83
+MKV_VIDEO = 0xE0
+MKV_PIXEL_WIDTH = 0xB0
+MKV_PIXEL_HEIGHT = 0xBA
+MKV_CLUSTER = 0x1F43B675
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class _BoundedReader:
+    """Okunan baytı sayan, bütçe aşılınca duran dosya sarmalayıcı (seek bütçeden düşmez)"""
+
+    def __init__(self, f, size, limit=MAX_READ_BYTES):
+        self.f = f
+        self.size = size
+        self.remaining = limit
+        self.bytes_read = 0
+
+    def read_at(self, offset, count):
+        if count > self.remaining:
+            raise _BudgetExceeded()
+        self.f.seek(offset)
+        data = self.f.read(count)
+        self.remaining -= len(data)
+        self.bytes_read += len(data)
+        return data
+
+
+def probe_video(file_path, max_read=MAX_READ_BYTES):
+    """Video bilgisi: {'width', 'height', 'duration' (sn veya None), 'format', 'bytes_read'}
+
+    Biçim uzantıdan değil sihirli baytlardan anlaşılır. Tanınmayan, bozuk veya başlığı
+    max_read içinde bulunamayan dosyada None.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            reader = _BoundedReader(f, os.fstat(f.fileno()).st_size, max_read)
+            head = reader.read_at(0, 16)
+            if len(head) < 12:
+                return None
+            if head[:4] == b'\x1a\x45\xdf\xa3':
+                info = _probe_matroska(reader)
+            elif head[:4] == b'RIFF' and head[8:11] == b'AVI':
+                info = _probe_avi(reader)
+            elif head[4:8] in MP4_FIRST_BOXES:
+                info = _probe_mp4(reader)
+            else:
+                return None
+    except (OSError, ValueError, IndexError, struct.error, _BudgetExceeded):
+        return None
+    if not info or not info.get('width') or not info.get('height'):
+        return None
+    info['bytes_read'] = reader.bytes_read
+    return info
+
+
+def video_dimensions(file_path):
+    """Media anahtarı için "GxY" (süre biliniyorsa "GxY 123s") veya None"""
+    info = probe_video(file_path)
+    if info is None:
+        return None
+    dimensions = f"{info['width']}x{info['height']}"
+    if info['duration']:
+        # Saniyeye yuvarlanır - aynı çözünürlükte farklı klipler ayrışır
+        dimensions += f" {info['duration']:.0f}s"
+    return dimensions
+
+
+# --- MP4 / MOV ---
+
+def _mp4_boxes(reader, start, end):
+    """[start, end) aralığındaki kutular: (tür, gövde başı, kutu sonu) - sadece başlıklar okunur"""
+    offset = start
+    while offset + 8 <= end:
+        header = reader.read_at(offset, 8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', reader.read_at(offset + 8, 8))[0]
+            header_size = 16
+        elif size == 0:
+            # Dosya sonuna kadar
+            size = end - offset
+        if size < header_size:
+            return
+        yield kind, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+def _probe_mp4(reader):
+    for kind, body, end in _mp4_boxes(reader, 0, reader.size):
+        if kind == b'moov':
+            return _parse_moov(reader, body, end)
+    return None
+
+
+def _parse_moov(reader, start, end):
+    info = {'width': 0, 'height': 0, 'duration': None, 'format': 'mp4'}
+    for kind, body, box_end in _mp4_boxes(reader, start, end):
+        if kind == b'mvhd':
+            data = reader.read_at(body, min(32, box_end - body))
+            if data[0] == 1:
+                timescale, duration = struct.unpack('>IQ', data[20:32])
+                unknown = 0xFFFFFFFFFFFFFFFF
+            else:
+                timescale, duration = struct.unpack('>II', data[12:20])
+                unknown = 0xFFFFFFFF
+            if timescale and duration != unknown:
+                info['duration'] = duration / timescale
+        elif kind == b'trak' and not info['width']:
+            size = _parse_trak(reader, body, box_end)
+            if size:
+                info['width'], info['height'] = size
+    return info
+
+
+def _parse_trak(reader, start, end):
+    """Video izinin gösterim boyutu (genişlik, yükseklik) veya None"""
+    dimensions = None
+    handler = None
+    for kind, body, box_end in _mp4_boxes(reader, start, end):
+        if kind == b'tkhd':
+            data = reader.read_at(body, min(96, box_end - body))
+            # v0: 32 bit zamanlar, v1: 64 bit - matris ve boyutlar sonda
+            matrix_at = 52 if data[0] == 1 else 40
+            a, b, _, c, d = struct.unpack('>5i', data[matrix_at:matrix_at + 20])
+            width, height = struct.unpack('>II', data[matrix_at + 36:matrix_at + 44])
+            width, height = width >> 16, height >> 16
+            if a == 0 and d == 0 and b and c:
+                # 90/270 derece döndürülmüş (telefon videoları) - görünen boyut
+                width, height = height, width
+            dimensions = (width, height) if width and height else None
+        elif kind == b'mdia':
+            for child, child_body, child_end in _mp4_boxes(reader, body, box_end):
+                if child == b'hdlr':
+                    handler = reader.read_at(child_body + 8, 4)
+                    break
+    if handler is not None and handler != b'vide':
+        # Ses / altyazı izi
+        return None
+    return dimensions
+
+
+# --- Matroska / WebM ---
+
+def _read_vint(data, offset, keep_marker=False):
+    """EBML değişken uzunluklu tamsayı: (değer, yeni offset) - bilinmeyen boyutta değer None"""
+    first = data[offset]
+    if not first:
+        raise ValueError("Geçersiz EBML vint")
+    length = 9 - first.bit_length()
+    if len(data) < offset + length:
+        raise ValueError("Eksik EBML vint")
+    value = int.from_bytes(data[offset:offset + length], 'big')
+    if keep_marker:
+        return value, offset + length
+    value &= (1 << (7 * length)) - 1
+    if value == (1 << (7 * length)) - 1:
+        return None, offset + length
+    return value, offset + length
+
+
+def _ebml_header(reader, offset):
+    """Dosyadaki eleman başlığı: (kimlik, gövde başı, gövde boyutu veya None)"""
+    data = reader.read_at(offset, 12)
+    element_id, position = _read_vint(data, 0, keep_marker=True)
+    size, position = _read_vint(data, position)
+    return element_id, offset + position, size
+
+
+def _ebml_children(data):
+    """Bellekteki eleman gövdesinin çocukları: (kimlik, gövde)"""
+    offset = 0
+    while offset < len(data):
+        element_id, offset = _read_vint(data, offset, keep_marker=True)
+        size, offset = _read_vint(data, offset)
+        if size is None:
+            return
+        yield element_id, data[offset:offset + size]
+        offset += size
+
+
+def _probe_matroska(reader):
+    element_id, body, size = _ebml_header(reader, 0)
+    if element_id != EBML_HEADER or size is None:
+        return None
+    element_id, offset, size = _ebml_header(reader, body + size)
+    if element_id != MKV_SEGMENT:
+        return None
+    end = reader.size if size is None else min(reader.size, offset + size)
+
+    info = {'width': 0, 'height': 0, 'duration': None, 'format': 'matroska'}
+    timecode_scale = 1000000
+    duration = None
+    found_info = found_tracks = False
+    while offset < end and not (found_info and found_tracks):
+        element_id, body, size = _ebml_header(reader, offset)
+        if element_id == MKV_CLUSTER or size is None:
+            # Medya verisi başladı (veya boyutu bilinmeyen eleman) - başlıklar bitti
+            break
+        if element_id == MKV_INFO:
+            found_info = True
+            for child_id, child in _ebml_children(reader.read_at(body, size)):
+                if child_id == MKV_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(child, 'big')
+                elif child_id == MKV_DURATION and len(child) in (4, 8):
+                    duration = struct.unpack('>f' if len(child) == 4 else '>d', child)[0]
+        elif element_id == MKV_TRACKS:
+            found_tracks = True
+            for entry_id, entry in _ebml_children(reader.read_at(body, size)):
+                if entry_id == MKV_TRACK_ENTRY and not info['width']:
+                    info['width'], info['height'] = _matroska_track_size(entry)
+        offset = body + size
+
+    if duration:
+        info['duration'] = duration * timecode_scale / 1e9
+    return info
+
+
+def _matroska_track_size(entry):
+    track_type = None
+    width = height = 0
+    for child_id, child in _ebml_children(entry):
+        if child_id == MKV_TRACK_TYPE:
+            track_type = int.from_bytes(child, 'big')
+        elif child_id == MKV_VIDEO:
+            for video_id, value in _ebml_children(child):
+                if video_id == MKV_PIXEL_WIDTH:
+                    width = int.from_bytes(value, 'big')
+                elif video_id == MKV_PIXEL_HEIGHT:
+                    height = int.from_bytes(value, 'big')
+    if track_type not in (None, 1):
+        # 1 = video
+        return 0, 0
+    return width, height
+
+
+# --- AVI ---
+
+def _probe_avi(reader):
+    """RIFF/AVI: hdrl listesindeki avih (ana başlık) - kare sayısı x kare süresi = süre"""
+    offset, end = 12, min(reader.size, 8 + struct.unpack('<I', reader.read_at(4, 4))[0])
+    while offset + 8 <= end:
+        chunk_id, size = struct.unpack('<4sI', reader.read_at(offset, 8))
+        if chunk_id == b'LIST':
+            if reader.read_at(offset + 8, 4) == b'hdrl':
+                # Listenin içine gir
+                offset, end = offset + 12, min(end, offset + 8 + size)
+                continue
+        elif chunk_id == b'avih':
+            (micro_sec_per_frame, _, _, _, total_frames,
+             _, _, _, width, height) = struct.unpack('<10I', reader.read_at(offset + 8, 40))
+            duration = total_frames * micro_sec_per_frame / 1e6 if total_frames and micro_sec_per_frame else None
+            return {'width': width, 'height': height, 'duration': duration, 'format': 'avi'}
+        # RIFF parçaları çift bayta hizalanır
+        offset += 8 + size + (size & 1)
+    return None
+
+
+def _legacy_guess(file_size):
+    """Eski ScanEngine tahmini (dosya boyutundan) - karşılaştırma için"""
+    if file_size < 50 * 1024 * 1024:
+        return "720x480"
+    elif file_size < 200 * 1024 * 1024:
+        return "1280x720"
+    elif file_size < 500 * 1024 * 1024:
+        return "1920x1080"
+    return "3840x2160"
+
+
+def benchmark(root_path):
+    """Klasördeki videolar: başlıktan okunan çözünürlük/süre, okunan bayt ve eski tahminle fark"""
+    from dir_walker import DirWalker
+
+    extensions = ('.mp4', '.mov', '.m4v', '.3gp', '.mkv', '.webm', '.avi')
+    entries = [entry for entry in DirWalker().walk(root_path) if entry.name.lower().endswith(extensions)]
+    if not entries:
+        print("⚠️ Klasörde video bulunamadı")
+        return None
+
+    start = time.perf_counter()
+    results = [(entry, probe_video(entry.path)) for entry in entries]
+    elapsed = time.perf_counter() - start
+
+    parsed = [(entry, info) for entry, info in results if info]
+    differs = 0
+    for entry, info in parsed:
+        dimensions = f"{info['width']}x{info['height']}"
+        guess = _legacy_guess(entry.size)
+        differs += dimensions != guess
+        duration = f"{info['duration']:.1f} sn" if info['duration'] else "süre yok"
+        print(f"🎬 {entry.name}: {dimensions}, {duration} ({info['format']}, {info['bytes_read'] / 1024:.1f} KB okundu, "
+              f"eski tahmin {guess})")
+    for entry, info in results:
+        if info is None:
+            print(f"❌ {entry.name}: başlık okunamadı")
+
+    total_size = sum(entry.size for entry in entries)
+    total_read = sum(info['bytes_read'] for _, info in parsed)
+    print(f"📂 {len(entries)} video ({total_size / (1024 * 1024):.1f} MB), {len(parsed)} başlık okundu, "
+          f"{total_read / 1024:.1f} KB okundu, {elapsed:.3f} sn")
+    print(f"📐 Eski boyut tahmini {differs}/{len(parsed)} videoda yanlıştı")
+    return elapsed
+
+
+if __name__ == "__main__":
+    # Kullanım: python video_probe.py <klasör>
+    if len(sys.argv) < 2 or not os.path.isdir(sys.argv[1]):
+        print("Kullanım: python video_probe.py <klasör>")
+        sys.exit(1)
+    benchmark(sys.argv[1])